@@ -1,5 +1,5 @@
-from bridgeia.main import run
+from bridgeia.cli import main
 
 
 if __name__ == "__main__":
-    run()
+    main()
@@ -0,0 +1,193 @@
+"""Command-line entry point: `python -m bridgeia COMMAND ...` (or `bridgeia COMMAND ...`).
+
+    bridgeia play --design best_design.json
+    bridgeia eval levels/level_01.json design_a.json design_b.json --json
+    bridgeia screenshot frame.png --design best_design.json
+    bridgeia replay session.npz --repeat 3
+    bridgeia bench --sizes 10,100 --groups sim,startup
+    bridgeia serve --port 8765
+
+Only the standard library is imported up front: each command imports what it
+needs when it runs, so `eval` and `serve` never load pygame and `--help`
+loads nothing heavy. Scripts may call the tool thousands of times, and a
+process pays its imports on every call (see the benchmark's startup group).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Sequence
+
+LEVELS_DIR = Path(__file__).resolve().parents[1] / "levels"
+
+
+def _play(argv: Sequence[str]) -> None:
+    from bridgeia.main import run
+
+    run(argv)
+
+
+def _eval(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="bridgeia eval",
+        description="Evaluate designs headlessly, without pygame. Exit status 1 when a design fails.",
+    )
+    parser.add_argument("level", type=str, help="Level JSON file, or the name of one under levels/ (e.g. level_01).")
+    parser.add_argument("designs", type=str, nargs="+", help="Design JSON files.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Simulated seconds per design, at most.")
+    parser.add_argument("--no-prescreen", action="store_true", help="Simulate even designs the static checks reject.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0: all cores).")
+    parser.add_argument("--cache", type=str, help="SQLite file memoising evaluations across calls.")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per design instead of a table.")
+    args = parser.parse_args(argv)
+
+    import json
+    import math
+    from dataclasses import asdict
+
+    from bridgeia.core.bridge import BridgeDesign
+    from bridgeia.core.level import Level
+    from bridgeia.sim.batch import BatchEvaluator, EvaluationSettings
+
+    try:
+        level = Level.from_json(_level_path(args.level))
+        anchors = {a.anchor_id: (a.x, a.y) for a in level.anchors}
+        designs = []
+        for path in args.designs:
+            design = BridgeDesign.from_json(Path(path))
+            design.set_fixed_points(anchors)
+            designs.append(design)
+    except (OSError, KeyError, TypeError, ValueError) as exc:
+        parser.error(f"cannot load input: {exc}")
+    settings = EvaluationSettings(duration=args.duration, prescreen=not args.no_prescreen)
+
+    cache = None
+    if args.cache:
+        from bridgeia.sim.cache import EvaluationCache
+
+        cache = EvaluationCache(Path(args.cache))
+    try:
+        with BatchEvaluator(level, settings, args.workers or None, cache) as evaluator:
+            report = evaluator.evaluate(designs)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    for path, result in zip(args.designs, report.results):
+        if args.json:
+            # JSON has no Infinity/NaN: report them as null
+            row = {
+                key: None if isinstance(value, float) and not math.isfinite(value) else value
+                for key, value in asdict(result).items()
+            }
+            print(json.dumps({"design": path, **row}))
+        else:
+            verdict = "survived" if result.survived else f"failed ({result.failure})"
+            print(
+                f"{path}: {verdict}  stress {result.max_stress:.2f}  sag {result.max_sag:.1f}px"
+                f"  {result.time_simulated:.2f}s simulated"
+            )
+    if report.survivors < len(report.results):
+        sys.exit(1)
+
+
+def _screenshot(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser(prog="bridgeia screenshot", description="Render one build-mode frame to an image file.")
+    parser.add_argument("out", type=str, help="Image file to write (PNG, BMP, TGA or JPEG).")
+    parser.add_argument("--level", type=str, default="level_01", help="Level JSON file or name under levels/.")
+    parser.add_argument("--design", type=str, help="Design JSON file to draw.")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    from bridgeia.main import render_screenshot
+
+    render_screenshot(Path(args.out), Path(args.design) if args.design else None, _level_path(args.level))
+
+
+def _replay(argv: Sequence[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="bridgeia replay",
+        description="Replay recorded editor sessions headlessly, as fast as possible. Exit status 1 when one "
+        "no longer ends as it was recorded.",
+    )
+    parser.add_argument("sessions", type=str, nargs="+", help="Session files from `bridgeia play --record-session`.")
+    parser.add_argument("--no-draw", action="store_true", help="Skip rendering: input handling and physics only.")
+    parser.add_argument("--repeat", type=int, default=1, help="Replays per session; the fastest is reported.")
+    parser.add_argument("--trace", type=str, help="Chrome trace-event JSON of the last replay's frames.")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    from bridgeia.main import replay_session
+
+    failed = False
+    for path in args.sessions:
+        runs = [
+            replay_session(Path(path), draw=not args.no_draw, trace_path=Path(args.trace) if args.trace else None)
+            for _ in range(max(1, args.repeat))
+        ]
+        best = min(runs, key=lambda replay: replay.replay_seconds)
+        verdict = {True: "same outcome", False: "OUTCOME CHANGED", None: "no recorded outcome"}[best.matches]
+        print(
+            f"{path}: {best.frames} frames, {best.events} events, {best.recorded_seconds:.1f}s recorded"
+            f" in {best.replay_seconds:.2f}s ({best.speedup:.0f}x), {verdict}"
+        )
+        failed |= any(replay.matches is False for replay in runs)
+    if failed:
+        sys.exit(1)
+
+
+def _bench(argv: Sequence[str]) -> None:
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    from bridgeia.tools.benchmark import main as bench
+
+    bench(argv)
+
+
+def _serve(argv: Sequence[str]) -> None:
+    from bridgeia.service import main as serve
+
+    serve(argv)
+
+
+COMMANDS: dict[str, tuple[Callable[[Sequence[str]], None], str]] = {
+    "play": (_play, "Open the editor (the default: `bridgeia --design x.json` still works)."),
+    "eval": (_eval, "Evaluate design files on a level, headless."),
+    "screenshot": (_screenshot, "Render a frame to an image file, headless."),
+    "replay": (_replay, "Fast-forward recorded editor sessions, headless."),
+    "bench": (_bench, "Run the benchmark suite."),
+    "serve": (_serve, "Serve design evaluation over HTTP."),
+}
+
+
+def _level_path(level: str) -> Path:
+    path = Path(level)
+    if path.suffix != ".json" and not path.exists():
+        path = LEVELS_DIR / f"{level}.json"
+    return path
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or (argv[0].startswith("-") and argv[0] not in ("-h", "--help")):
+        argv.insert(0, "play")  # Options without a command predate the subcommands
+    command = COMMANDS.get(argv[0])
+    if command is not None:
+        command[0](argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(
+        prog="bridgeia",
+        description="BridgeIA bridge builder. Run `bridgeia COMMAND --help` for a command's options.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + "\n".join(f"  {name:<12}{text}" for name, (_, text) in COMMANDS.items()),
+    )
+    parser.add_argument("command", choices=list(COMMANDS), metavar="COMMAND")
+    parser.parse_args(argv[:1])
+
+
+if __name__ == "__main__":
+    main()
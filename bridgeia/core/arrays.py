@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+
+from bridgeia.core.bridge import BridgeDesign, Edge
+from bridgeia.core.materials import get_material
+
+
+@dataclass
+class ArrayBridge:
+    """
+    Struct-of-arrays view of a BridgeDesign for solvers and bulk processing.
+
+    Points are addressed by integer index: fixed points (level anchors) come
+    first, then bridge joints, so `index >= fixed_count` means a free joint.
+    Edges are rows of int32 endpoint indices with material and cost columns;
+    string IDs are only kept to convert back to the editable BridgeDesign.
+    """
+
+    point_ids: list[str]
+    positions: np.ndarray  # float64, (points, 2)
+    fixed_count: int
+    edge_ids: np.ndarray  # int32, (edges,)
+    endpoints: np.ndarray  # int32, (edges, 2) point indices
+    materials: np.ndarray  # uint8, (edges,) index into material_names
+    material_names: list[str]
+    costs: np.ndarray  # int32, (edges,)
+    next_edge_id: int = 1
+    next_joint_id: int = 1
+
+    @property
+    def point_count(self) -> int:
+        return len(self.point_ids)
+
+    @property
+    def joint_count(self) -> int:
+        return self.point_count - self.fixed_count
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.edge_ids.shape[0])
+
+    @property
+    def joint_positions(self) -> np.ndarray:
+        return self.positions[self.fixed_count:]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays (string IDs excluded)."""
+        return sum(a.nbytes for a in (self.positions, self.edge_ids, self.endpoints, self.materials, self.costs))
+
+    @classmethod
+    def from_design(
+        cls, design: BridgeDesign, fixed_points: Mapping[str, tuple[float, float]] | None = None
+    ) -> "ArrayBridge":
+        """
+        Pack a design; fixed_points defaults to the anchors registered on it.
+        Edges to points that are neither joints nor fixed points are dropped,
+        as the simulation and solvers have nothing to attach them to.
+        """
+        fixed = dict(design.fixed_points if fixed_points is None else fixed_points)
+        point_ids = [*fixed, *design.joints]
+        index = {p_id: i for i, p_id in enumerate(point_ids)}
+        positions = np.array([*fixed.values(), *design.joints.values()], dtype=np.float64).reshape(-1, 2)
+
+        edges = [edge for edge in design.edges if edge.a in index and edge.b in index]
+        material_names = sorted({edge.material for edge in edges})
+        material_index = {name: i for i, name in enumerate(material_names)}
+        return cls(
+            point_ids=point_ids,
+            positions=positions,
+            fixed_count=len(fixed),
+            edge_ids=np.fromiter((edge.edge_id for edge in edges), dtype=np.int32, count=len(edges)),
+            endpoints=np.array([(index[edge.a], index[edge.b]) for edge in edges], dtype=np.int32).reshape(-1, 2),
+            materials=np.fromiter((material_index[edge.material] for edge in edges), dtype=np.uint8, count=len(edges)),
+            material_names=material_names,
+            costs=np.fromiter((edge.cost for edge in edges), dtype=np.int32, count=len(edges)),
+            next_edge_id=design.next_edge_id,
+            next_joint_id=design.next_joint_id,
+        )
+
+    def to_design(self) -> BridgeDesign:
+        ids = self.point_ids
+        coords = self.positions.tolist()
+        joints = {ids[i]: (x, y) for i, (x, y) in enumerate(coords[self.fixed_count:], start=self.fixed_count)}
+        names = self.material_names
+        edges = [
+            Edge(edge_id=e_id, a=ids[a], b=ids[b], material=names[m], cost=cost)
+            for e_id, (a, b), m, cost in zip(
+                self.edge_ids.tolist(), self.endpoints.tolist(), self.materials.tolist(), self.costs.tolist()
+            )
+        ]
+        design = BridgeDesign(
+            edges=edges, joints=joints, next_edge_id=self.next_edge_id, next_joint_id=self.next_joint_id
+        )
+        # Fixed points stored without a position (NaN) only name edge endpoints
+        placed = {ids[i]: (x, y) for i, (x, y) in enumerate(coords[: self.fixed_count]) if x == x and y == y}
+        if placed:
+            design.set_fixed_points(placed)
+        return design
+
+    def total_cost(self) -> int:
+        return int(self.costs.sum(dtype=np.int64))
+
+    def vectors(self) -> np.ndarray:
+        """Per-edge (dx, dy) from endpoint a to endpoint b."""
+        return self.positions[self.endpoints[:, 1]] - self.positions[self.endpoints[:, 0]]
+
+    def lengths(self) -> np.ndarray:
+        delta = self.vectors()
+        return np.hypot(delta[:, 0], delta[:, 1])
+
+    def degrees(self) -> np.ndarray:
+        return np.bincount(self.endpoints.ravel(), minlength=self.point_count)
+
+    def material_column(self, attribute: str) -> np.ndarray:
+        """Per-edge float64 column of a Material attribute, e.g. "stiffness" or "max_force"."""
+        table = np.array([getattr(get_material(name), attribute) for name in self.material_names], dtype=np.float64)
+        return table[self.materials] if len(table) else np.zeros(self.edge_count)
@@ -1,8 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
 from math import hypot
-from typing import Iterable
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from bridgeia.core.spatial import PointIndex, SegmentIndex
+
+# Build rules shared by the editor and automated designers
+COST_PER_UNIT = 3.0
+MAX_EDGE_LENGTH = 220.0
+
+# Joints closer than this are considered the same point
+DUPLICATE_JOINT_TOLERANCE = 0.1
+
+# Journal record kinds (see core.history): (ADD_EDGE, edge), (ADD_JOINT, joint_id, pos), ...
+ADD_JOINT = 0
+ADD_EDGE = 1
+REMOVE_EDGE = 2
+REMOVE_JOINT = 3
 
 
 @dataclass(frozen=True)
@@ -20,30 +39,244 @@ class BridgeDesign:
     joints: dict[str, tuple[float, float]]  # ID -> (x, y)
     next_edge_id: int = 1
     next_joint_id: int = 1
+    # Bumped on every edit so caches (rendering, physics) can tell the design changed
+    revision: int = field(default=0, init=False, repr=False, compare=False)
+    # Lookup indexes and running totals, kept in sync by the mutating methods below.
+    # Edit edges/joints through these methods rather than mutating the containers.
+    _edge_map: dict[int, Edge] = field(init=False, repr=False, compare=False)
+    _adjacency: dict[str, set[int]] = field(init=False, repr=False, compare=False)
+    _total_cost: int = field(init=False, repr=False, compare=False)
+    _joint_index: PointIndex[str] = field(init=False, repr=False, compare=False)
+    _fixed_index: PointIndex[str] = field(init=False, repr=False, compare=False)
+    _edge_index: SegmentIndex[int] = field(init=False, repr=False, compare=False)
+    _fixed_points: dict[str, tuple[float, float]] = field(init=False, repr=False, compare=False)
+    # Receives a record of every structural edit while an EditHistory is attached
+    _journal: list[tuple[Any, ...]] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._edge_map = {}
+        self._adjacency = {}
+        self._total_cost = 0
+        self._joint_index = PointIndex()
+        self._fixed_index = PointIndex()
+        self._edge_index = SegmentIndex()
+        self._fixed_points = {}
+        for j_id, pos in self.joints.items():
+            self._joint_index.insert(j_id, pos)
+        for edge in self.edges:
+            self._link_edge(edge)
+            self._index_edge(edge)
+
+    @property
+    def fixed_points(self) -> Mapping[str, tuple[float, float]]:
+        return self._fixed_points
+
+    def set_fixed_points(self, points: Mapping[str, tuple[float, float]]) -> None:
+        """Register level anchor positions so edges attached to them can be indexed."""
+        self._fixed_points = dict(points)
+        self.revision += 1
+        self._fixed_index.clear()
+        for p_id, pos in self._fixed_points.items():
+            self._fixed_index.insert(p_id, pos)
+        for edge in self.edges:
+            if edge.edge_id not in self._edge_index:
+                self._index_edge(edge)
+
+    def point_position(self, point_id: str) -> tuple[float, float] | None:
+        pos = self.joints.get(point_id)
+        if pos is None:
+            pos = self._fixed_points.get(point_id)
+        return pos
+
+    def _index_edge(self, edge: Edge) -> None:
+        start = self.point_position(edge.a)
+        end = self.point_position(edge.b)
+        if start is not None and end is not None:
+            self._edge_index.insert(edge.edge_id, start, end)
+
+    def _link_edge(self, edge: Edge) -> None:
+        self._edge_map[edge.edge_id] = edge
+        self._adjacency.setdefault(edge.a, set()).add(edge.edge_id)
+        self._adjacency.setdefault(edge.b, set()).add(edge.edge_id)
+        self._total_cost += edge.cost
+
+    def _unlink_edge(self, edge: Edge) -> None:
+        del self._edge_map[edge.edge_id]
+        for point_id in (edge.a, edge.b):
+            incident = self._adjacency.get(point_id)
+            if incident is not None:
+                incident.discard(edge.edge_id)
+                if not incident:
+                    del self._adjacency[point_id]
+        self._total_cost -= edge.cost
+
+    def get_edge(self, edge_id: int) -> Edge | None:
+        return self._edge_map.get(edge_id)
+
+    def edges_of(self, point_id: str) -> list[Edge]:
+        return [self._edge_map[e_id] for e_id in self._adjacency.get(point_id, ())]
+
+    def degree(self, point_id: str) -> int:
+        return len(self._adjacency.get(point_id, ()))
+
+    def find_edge(self, a: str, b: str) -> Edge | None:
+        incident_a = self._adjacency.get(a)
+        incident_b = self._adjacency.get(b)
+        if not incident_a or not incident_b:
+            return None
+        # Walk the smaller adjacency set: O(min degree)
+        for e_id in incident_a if len(incident_a) <= len(incident_b) else incident_b:
+            edge = self._edge_map[e_id]
+            if (edge.a == a and edge.b == b) or (edge.a == b and edge.b == a):
+                return edge
+        return None
+
+    def has_edge(self, a: str, b: str) -> bool:
+        return self.find_edge(a, b) is not None
 
     def add_edge(self, a: str, b: str, material: str, cost: int) -> Edge:
         edge = Edge(edge_id=self.next_edge_id, a=a, b=b, material=material, cost=cost)
         self.edges.append(edge)
         self.next_edge_id += 1
+        self._link_edge(edge)
+        self._index_edge(edge)
+        self.revision += 1
+        if self._journal is not None:
+            self._journal.append((ADD_EDGE, edge))
         return edge
 
     def add_joint(self, x: float, y: float) -> str:
-        # Check for existing joint at this position to prevent duplicates
-        for j_id, pos in self.joints.items():
-            if abs(pos[0] - x) < 0.1 and abs(pos[1] - y) < 0.1:
-                return j_id
-        
+        # Check for existing joint at this position to prevent duplicates (per-axis box;
+        # the oldest joint wins when several match)
+        matches = {
+            j_id
+            for j_id in self._joint_index.candidates(x, y, DUPLICATE_JOINT_TOLERANCE)
+            if abs(self.joints[j_id][0] - x) < DUPLICATE_JOINT_TOLERANCE
+            and abs(self.joints[j_id][1] - y) < DUPLICATE_JOINT_TOLERANCE
+        }
+        if len(matches) == 1:
+            return matches.pop()
+        if matches:
+            return next(j_id for j_id in self.joints if j_id in matches)
+
         joint_id = f"j_{self.next_joint_id}"
         self.joints[joint_id] = (x, y)
+        self._joint_index.insert(joint_id, (x, y))
         self.next_joint_id += 1
+        self.revision += 1
+        if self._journal is not None:
+            self._journal.append((ADD_JOINT, joint_id, (x, y)))
         return joint_id
 
     def remove_edge(self, edge_id: int) -> None:
-        self.edges = [edge for edge in self.edges if edge.edge_id != edge_id]
+        edge = self._edge_map.get(edge_id)
+        if edge is None:
+            return
+        self._unlink_edge(edge)
+        self._edge_index.remove(edge_id)
+        self.revision += 1
+        # add_edge hands out increasing IDs, so the list is normally sorted by ID
+        index = bisect_left(self.edges, edge_id, key=_edge_id_key)
+        if index < len(self.edges) and self.edges[index] is edge:
+            del self.edges[index]
+        else:
+            self.edges.remove(edge)
+        if self._journal is not None:
+            self._journal.append((REMOVE_EDGE, edge))
         # Clean up orphan joints? Maybe later.
 
+    def remove_joint(self, joint_id: str) -> None:
+        """Remove a bridge joint together with every edge attached to it."""
+        for edge_id in sorted(self._adjacency.get(joint_id, ())):
+            self.remove_edge(edge_id)
+        pos = self.joints.pop(joint_id)
+        self._joint_index.remove(joint_id)
+        self.revision += 1
+        if self._journal is not None:
+            self._journal.append((REMOVE_JOINT, joint_id, pos))
+
+    def restore_edge(self, edge: Edge) -> None:
+        """Put back a removed edge under its own ID (undo/redo); not journaled."""
+        insort(self.edges, edge, key=_edge_id_key)  # Keeps the ID order remove_edge relies on
+        self.next_edge_id = max(self.next_edge_id, edge.edge_id + 1)
+        self._link_edge(edge)
+        self._index_edge(edge)
+        self.revision += 1
+
+    def restore_joint(self, joint_id: str, pos: tuple[float, float]) -> None:
+        """Put back a removed joint under its own ID (undo/redo); not journaled."""
+        self.joints[joint_id] = pos
+        self._joint_index.insert(joint_id, pos)
+        self.revision += 1
+
+    def find_point_at(self, pos: tuple[float, float], radius: float) -> str | None:
+        """Nearest joint or fixed point within radius of pos."""
+        joint = self._joint_index.nearest(pos, radius)
+        fixed = self._fixed_index.nearest(pos, radius)
+        if joint is None or (fixed is not None and fixed[1] <= joint[1]):
+            return fixed[0] if fixed is not None else None
+        return joint[0]
+
+    def find_edge_at(self, pos: tuple[float, float], tolerance: float) -> int | None:
+        """Nearest edge whose segment passes within tolerance of pos."""
+        found = self._edge_index.nearest(pos, tolerance)
+        return found[0] if found is not None else None
+
     def total_cost(self) -> int:
-        return sum(edge.cost for edge in self.edges)
+        return self._total_cost
+
+    def copy(self) -> "BridgeDesign":
+        # Edges are frozen and positions are tuples: shallow containers are enough
+        clone = BridgeDesign(
+            edges=list(self.edges),
+            joints=dict(self.joints),
+            next_edge_id=self.next_edge_id,
+            next_joint_id=self.next_joint_id,
+        )
+        if self._fixed_points:
+            clone.set_fixed_points(self._fixed_points)
+        return clone
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "joints": [{"id": j_id, "x": x, "y": y} for j_id, (x, y) in self.joints.items()],
+            "edges": [
+                {"id": e.edge_id, "a": e.a, "b": e.b, "material": e.material, "cost": e.cost}
+                for e in self.edges
+            ],
+            "next_joint_id": self.next_joint_id,
+            "next_edge_id": self.next_edge_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "BridgeDesign":
+        joints = {joint["id"]: (float(joint["x"]), float(joint["y"])) for joint in data.get("joints", [])}
+        edges = [
+            Edge(edge_id=edge["id"], a=edge["a"], b=edge["b"], material=edge["material"], cost=edge["cost"])
+            for edge in data.get("edges", [])
+        ]
+        return cls(
+            edges=edges,
+            joints=joints,
+            next_edge_id=data.get("next_edge_id", max((e.edge_id for e in edges), default=0) + 1),
+            next_joint_id=data.get("next_joint_id", _next_joint_number(joints)),
+        )
+
+    def to_json(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    @classmethod
+    def from_json(cls, path: Path) -> "BridgeDesign":
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+_edge_id_key = attrgetter("edge_id")
+
+
+def _next_joint_number(joints: Iterable[str]) -> int:
+    numbers = [int(j_id[2:]) for j_id in joints if j_id.startswith("j_") and j_id[2:].isdigit()]
+    return max(numbers, default=0) + 1
 
 
 def edge_length(a: tuple[float, float], b: tuple[float, float]) -> float:
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Iterator, Sequence
+
+from bridgeia.core.bridge import ADD_EDGE, ADD_JOINT, REMOVE_EDGE, REMOVE_JOINT, BridgeDesign
+
+# One undo step: the journal records of a user action, in the order they happened
+Changeset = tuple[tuple[Any, ...], ...]
+
+
+class EditHistory:
+    """
+    Undo/redo for a BridgeDesign built from compact diff records.
+
+    While attached, the design journals every structural edit (joint or edge
+    added or removed) as a small tuple that shares the frozen Edge objects
+    with the design, so recording an edit costs O(1) whatever the design
+    size. commit() closes the pending records into one undo step; at most
+    `limit` steps are kept.
+
+    Optimizers can branch and revert without copying the design:
+
+        mark = history.mark()
+        mutate(history.design)
+        branch = history.changes_since(mark)
+        history.revert(mark)        # back to the parent
+        history.apply(branch)       # and forward to the child again
+    """
+
+    def __init__(self, design: BridgeDesign, limit: int = 1000) -> None:
+        if design._journal is not None:
+            raise ValueError("design already has an EditHistory attached")
+        self.design = design
+        self.limit = limit
+        self._pending: list[tuple[Any, ...]] = []
+        self._undo: deque[Changeset] = deque(maxlen=limit)
+        self._redo: list[Changeset] = []
+        # Steps dropped off the bounded undo stack, so marks stay comparable
+        self._dropped = 0
+        design._journal = self._pending
+
+    def detach(self) -> None:
+        """Stop recording; the design is left as it is."""
+        self.commit()
+        self.design._journal = None
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._pending or self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo) and not self._pending
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    def commit(self) -> bool:
+        """Close the pending edits into one undo step; False if there were none."""
+        if not self._pending:
+            return False
+        if len(self._undo) == self._undo.maxlen:
+            self._dropped += 1
+        self._undo.append(tuple(self._pending))
+        self._pending.clear()
+        self._redo.clear()  # A new edit ends the redo branch
+        return True
+
+    @contextmanager
+    def action(self) -> Iterator[None]:
+        """Group every edit made inside the block into one undo step."""
+        self.commit()
+        try:
+            yield
+        finally:
+            self.commit()
+
+    def undo(self) -> bool:
+        self.commit()
+        if not self._undo:
+            return False
+        changes = self._undo.pop()
+        self._replay(changes, forward=False)
+        self._redo.append(changes)
+        return True
+
+    def redo(self) -> bool:
+        if self._pending or not self._redo:
+            return False
+        changes = self._redo.pop()
+        self._replay(changes, forward=True)
+        self._undo.append(changes)
+        return True
+
+    def mark(self) -> int:
+        """Position of the current state, for revert() and changes_since()."""
+        self.commit()
+        return self._dropped + len(self._undo)
+
+    def revert(self, mark: int) -> None:
+        """Undo back to a mark; the undone steps stay available to redo()."""
+        self.commit()
+        if mark < self._dropped:
+            raise ValueError("mark is older than the history limit")
+        while self._dropped + len(self._undo) > mark:
+            self.undo()
+
+    def changes_since(self, mark: int) -> Changeset:
+        """Every edit made after a mark, flattened into one changeset for apply()."""
+        self.commit()
+        if mark < self._dropped:
+            raise ValueError("mark is older than the history limit")
+        steps = list(self._undo)[mark - self._dropped:]
+        return tuple(record for step in steps for record in step)
+
+    def apply(self, changes: Changeset) -> None:
+        """Replay a changeset (e.g. from changes_since) as one new undo step."""
+        self.commit()
+        self._replay(changes, forward=True)
+        if changes:
+            self._pending.extend(changes)
+            self.commit()
+
+    def _replay(self, changes: Sequence[tuple[Any, ...]], forward: bool) -> None:
+        design = self.design
+        design._journal = None  # Replaying must not record new edits
+        try:
+            for record in changes if forward else reversed(changes):
+                kind = record[0]
+                if kind not in (ADD_EDGE, ADD_JOINT, REMOVE_EDGE, REMOVE_JOINT):
+                    raise ValueError(f"unknown journal record kind {kind!r}")
+                is_edge = kind in (ADD_EDGE, REMOVE_EDGE)
+                # Redoing an addition or undoing a removal puts the element back
+                if (kind in (ADD_EDGE, ADD_JOINT)) == forward:
+                    if is_edge:
+                        design.restore_edge(record[1])
+                    else:
+                        design.restore_joint(record[1], record[2])
+                elif is_edge:
+                    design.remove_edge(record[1].edge_id)
+                else:
+                    # Its edges were removed by the records before it (forward) or after it (backward)
+                    design.remove_joint(record[1])
+        finally:
+            design._journal = self._pending
@@ -39,6 +39,10 @@ class Level:
     @classmethod
     def from_json(cls, path: Path) -> "Level":
         data = json.loads(path.read_text(encoding="utf-8"))
+        return cls.from_dict(data, default_name=path.stem)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], default_name: str = "") -> "Level":
         anchors = tuple(
             AnchorPoint(
                 anchor_id=anchor["id"],
@@ -60,9 +64,23 @@ class Level:
         goal_data: dict[str, Any] = data.get("goal", {})
         goal = Goal(goal_type=goal_data.get("type", "reach_x"), x=goal_data.get("x", 0))
         return cls(
-            name=data.get("name", path.stem),
+            name=data.get("name", default_name),
             budget=data.get("budget", 0),
             anchors=anchors,
             banks=banks,
             goal=goal,
         )
+
+    def to_dict(self) -> dict[str, Any]:
+        # Same layout as the files in levels/
+        return {
+            "name": self.name,
+            "budget": self.budget,
+            "goal": {"type": self.goal.goal_type, "x": self.goal.x},
+            "banks": [{"x1": b.x1, "y1": b.y1, "x2": b.x2, "y2": b.y2} for b in self.banks],
+            "anchors": [{"id": a.anchor_id, "x": a.x, "y": a.y, "fixed": a.fixed} for a in self.anchors],
+        }
+
+    def to_json(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Material:
+    name: str
+    stiffness: float  # Axial stiffness EA, force per unit strain
+    max_force: float  # Axial force (tension or compression) at which a member fails
+
+
+MATERIALS: dict[str, Material] = {
+    "wood": Material(name="wood", stiffness=2.0e6, max_force=25000.0),
+}
+
+
+def get_material(name: str) -> Material:
+    try:
+        return MATERIALS[name]
+    except KeyError:
+        raise ValueError(f"Unknown material: {name!r}") from None
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+
+# Rolling window used for the overlay percentiles (about 4 s at 60 fps)
+PROFILE_WINDOW = 240
+# Trace events kept in memory before new ones are dropped (~100 MB of JSON)
+MAX_TRACE_EVENTS = 1_000_000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: FrameProfiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.profiler.add(self.name, self.start, time.perf_counter() - self.start)
+
+
+class FrameProfiler:
+    """
+    Named timing spans grouped into frames. Spans of the same name within a
+    frame are summed (e.g. every physics substep), and the per-frame totals feed
+    rolling p50/p99 figures. With tracing on, every span is also kept as a
+    Chrome trace event (chrome://tracing, Perfetto).
+
+    While neither the overlay (`enabled`) nor tracing is on, span() returns a
+    shared no-op context manager, so instrumentation costs one method call.
+    """
+
+    def __init__(self, window: int = PROFILE_WINDOW, trace: bool = False) -> None:
+        self.enabled = False
+        self.tracing = trace
+        self.window = window
+        self.frames = 0
+        self._history: dict[str, deque[float]] = {}
+        self._frame: dict[str, float] = {}
+        self._frame_start = 0.0
+        self._origin = time.perf_counter()
+        self._events: list[tuple[str, float, float]] = []  # (name, start, duration) in seconds
+
+    @property
+    def active(self) -> bool:
+        return self.enabled or self.tracing
+
+    def span(self, name: str) -> _Span | _NullSpan:
+        if not (self.enabled or self.tracing):
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def add(self, name: str, start: float, duration: float) -> None:
+        self._frame[name] = self._frame.get(name, 0.0) + duration
+        if self.tracing and len(self._events) < MAX_TRACE_EVENTS:
+            self._events.append((name, start, duration))
+
+    def begin_frame(self) -> None:
+        if not (self.enabled or self.tracing):
+            return
+        self._frame.clear()
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        if not (self.enabled or self.tracing):
+            return
+        self.add("frame", self._frame_start, time.perf_counter() - self._frame_start)
+        for name, total in self._frame.items():
+            history = self._history.get(name)
+            if history is None:
+                history = self._history[name] = deque(maxlen=self.window)
+            history.append(total)
+        self._frame.clear()
+        self.frames += 1
+
+    def stats(self) -> list[tuple[str, float, float]]:
+        """(phase, p50 ms, p99 ms) over the rolling window, in first-seen order."""
+        rows = []
+        for name, history in self._history.items():
+            samples = sorted(history)
+            if not samples:
+                continue
+            p50 = samples[(len(samples) - 1) // 2]
+            p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+            rows.append((name, p50 * 1000.0, p99 * 1000.0))
+        return rows
+
+    def reset(self) -> None:
+        self._history.clear()
+        self._frame.clear()
+
+    def write_trace(self, path: Path) -> None:
+        """Chrome trace-event JSON: one complete ("X") event per span, in microseconds."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": 0,
+            }
+            for name, start, duration in self._events
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
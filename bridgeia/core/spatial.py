@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from math import floor
+from typing import Generic, Hashable, Iterator, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+Cell = tuple[int, int]
+Point = tuple[float, float]
+
+DEFAULT_CELL_SIZE = 64.0
+
+
+class SpatialHash(Generic[K]):
+    """
+    Uniform grid over the plane: each key is stored in every cell its bounding
+    box touches, so a query only looks at the few cells around the query point.
+    Points occupy one cell; segments occupy the cells covered by their bbox.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE) -> None:
+        self.cell_size = cell_size
+        self._cells: dict[Cell, set[K]] = {}
+        self._item_cells: dict[K, list[Cell]] = {}
+
+    def __len__(self) -> int:
+        return len(self._item_cells)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._item_cells
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def _cells_in_box(self, x1: float, y1: float, x2: float, y2: float) -> Iterator[Cell]:
+        cx1, cy1 = self._cell(min(x1, x2), min(y1, y2))
+        cx2, cy2 = self._cell(max(x1, x2), max(y1, y2))
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                yield cx, cy
+
+    def insert_box(self, key: K, x1: float, y1: float, x2: float, y2: float) -> None:
+        if key in self._item_cells:
+            self.remove(key)
+        cells = list(self._cells_in_box(x1, y1, x2, y2))
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(key)
+        self._item_cells[key] = cells
+
+    def remove(self, key: K) -> None:
+        for cell in self._item_cells.pop(key, ()):
+            bucket = self._cells[cell]
+            bucket.discard(key)
+            if not bucket:
+                del self._cells[cell]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._item_cells.clear()
+
+    def candidates(self, x: float, y: float, radius: float) -> set[K]:
+        found: set[K] = set()
+        for cell in self._cells_in_box(x - radius, y - radius, x + radius, y + radius):
+            bucket = self._cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return found
+
+
+class PointIndex(SpatialHash[K]):
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE) -> None:
+        super().__init__(cell_size)
+        self._points: dict[K, Point] = {}
+
+    def insert(self, key: K, pos: Point) -> None:
+        self.insert_box(key, pos[0], pos[1], pos[0], pos[1])
+        self._points[key] = pos
+
+    def remove(self, key: K) -> None:
+        super().remove(key)
+        self._points.pop(key, None)
+
+    def clear(self) -> None:
+        super().clear()
+        self._points.clear()
+
+    def nearest(self, pos: Point, radius: float) -> tuple[K, float] | None:
+        x, y = pos
+        best: tuple[K, float] | None = None
+        for key in self.candidates(x, y, radius):
+            px, py = self._points[key]
+            dist = ((px - x) ** 2 + (py - y) ** 2) ** 0.5
+            if dist <= radius and (best is None or dist < best[1]):
+                best = (key, dist)
+        return best
+
+
+class SegmentIndex(SpatialHash[K]):
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE) -> None:
+        super().__init__(cell_size)
+        self._segments: dict[K, tuple[Point, Point]] = {}
+
+    def insert(self, key: K, start: Point, end: Point) -> None:
+        self.insert_box(key, start[0], start[1], end[0], end[1])
+        self._segments[key] = (start, end)
+
+    def remove(self, key: K) -> None:
+        super().remove(key)
+        self._segments.pop(key, None)
+
+    def clear(self) -> None:
+        super().clear()
+        self._segments.clear()
+
+    def nearest(self, pos: Point, radius: float) -> tuple[K, float] | None:
+        best: tuple[K, float] | None = None
+        for key in self.candidates(pos[0], pos[1], radius):
+            start, end = self._segments[key]
+            dist = point_to_segment_distance(pos, start, end)
+            if dist <= radius and (best is None or dist < best[1]):
+                best = (key, dist)
+        return best
+
+
+def point_to_segment_distance(point: tuple[float, float], start: tuple[float, float], end: tuple[float, float]) -> float:
+    px, py = point
+    x1, y1 = start
+    x2, y2 = end
+    dx = x2 - x1
+    dy = y2 - y1
+    if dx == 0 and dy == 0:
+        return ((px - x1) ** 2 + (py - y1) ** 2) ** 0.5
+    t = ((px - x1) * dx + (py - y1) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    closest_x = x1 + t * dx
+    closest_y = y1 + t * dy
+    return ((px - closest_x) ** 2 + (py - closest_y) ** 2) ** 0.5
@@ -0,0 +1,325 @@
+"""Binary archives of levels and designs.
+
+An archive is one file holding any number of Level and BridgeDesign records:
+
+    header   magic, format version, entry count, index offset (32 bytes)
+    records  per record: u32 metadata length, JSON metadata, then the packed
+             NumPy arrays it describes, each 8-byte aligned
+    index    names blob followed by one fixed-size entry per record
+             (offset, size, name, kind)
+
+Readers memory-map the file and only touch the header, the index and the
+pages of the records actually requested, so opening one design in a
+multi-gigabyte archive reads a few kilobytes. Arrays come back as read-only
+views of the mapping.
+"""
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+import numpy as np
+
+from bridgeia.core.arrays import ArrayBridge
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import AnchorPoint, BankSegment, Goal, Level
+
+ARCHIVE_MAGIC = b"BRIDGEIA"
+# Bumped whenever the on-disk layout changes
+ARCHIVE_FORMAT_VERSION = 1
+
+KIND_LEVEL = 1
+KIND_DESIGN = 2
+
+_HEADER = struct.Struct("<8sIIQQ")  # magic, version, flags, entry count, index offset
+_META_LENGTH = struct.Struct("<I")
+_ENTRY_DTYPE = np.dtype(
+    [("offset", "<u8"), ("size", "<u8"), ("name_start", "<u8"), ("name_length", "<u4"), ("kind", "u1"), ("_pad", "u1", 3)]
+)
+_ALIGN = 8
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % _ALIGN)
+
+
+def _encode_record(meta: dict[str, Any], arrays: Mapping[str, np.ndarray]) -> bytes:
+    """Metadata JSON (with array descriptors) followed by the aligned array bytes."""
+    blobs: list[bytes] = []
+    descriptors = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        descriptors.append([name, array.dtype.str, list(array.shape), offset])
+        data = array.tobytes()
+        blobs.append(data + _padding(len(data)))
+        offset += len(blobs[-1])
+    meta_bytes = json.dumps({**meta, "arrays": descriptors}, separators=(",", ":")).encode("utf-8")
+    head = _META_LENGTH.pack(len(meta_bytes)) + meta_bytes
+    return head + _padding(len(head)) + b"".join(blobs)
+
+
+def _level_record(level: Level) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    meta = {
+        "name": level.name,
+        "budget": level.budget,
+        "goal": {"type": level.goal.goal_type, "x": level.goal.x},
+        "anchor_ids": [a.anchor_id for a in level.anchors],
+    }
+    arrays = {
+        "anchors": np.array([(a.x, a.y, float(a.fixed)) for a in level.anchors], dtype=np.float64).reshape(-1, 3),
+        "banks": np.array([(b.x1, b.y1, b.x2, b.y2) for b in level.banks], dtype=np.float64).reshape(-1, 4),
+    }
+    return meta, arrays
+
+
+def _design_record(design: BridgeDesign) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    # Edges may reference anchors the design was never told about: keep them as
+    # fixed points without a position so nothing is lost on the round trip
+    fixed = dict(design.fixed_points)
+    for edge in design.edges:
+        for point_id in (edge.a, edge.b):
+            if point_id not in design.joints and point_id not in fixed:
+                fixed[point_id] = (float("nan"), float("nan"))
+    packed = ArrayBridge.from_design(design, fixed)
+    meta = {
+        "point_ids": packed.point_ids,
+        "fixed_count": packed.fixed_count,
+        "material_names": packed.material_names,
+        "next_edge_id": packed.next_edge_id,
+        "next_joint_id": packed.next_joint_id,
+    }
+    arrays = {
+        "positions": packed.positions,
+        "edge_ids": packed.edge_ids,
+        "endpoints": packed.endpoints,
+        "materials": packed.materials,
+        "costs": packed.costs,
+    }
+    return meta, arrays
+
+
+class ArchiveWriter:
+    """
+    Appends records to an archive; the index and header are written on close().
+    With append=True an existing archive is extended in place.
+    """
+
+    def __init__(self, path: Path, append: bool = False) -> None:
+        self.path = path
+        self._names = bytearray()
+        self._entries: list[tuple[int, int, int, int, int]] = []
+        if append and path.exists():
+            with Archive(path) as existing:
+                names, entries, index_offset = existing.raw_index()
+            self._names.extend(names)
+            self._entries.extend(
+                (int(e["offset"]), int(e["size"]), int(e["name_start"]), int(e["name_length"]), int(e["kind"]))
+                for e in entries
+            )
+            self._file = path.open("r+b")
+            # New records overwrite the old index, which is rewritten at the end;
+            # until then the header marks the archive as incomplete
+            self._file.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_FORMAT_VERSION, 0, 0, 0))
+            self._file.truncate(index_offset)
+            self._file.seek(index_offset)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = path.open("wb")
+            # Placeholder: an index offset of 0 marks the archive as incomplete
+            self._file.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_FORMAT_VERSION, 0, 0, 0))
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _append(self, kind: int, name: str, meta: dict[str, Any], arrays: Mapping[str, np.ndarray]) -> int:
+        record = _encode_record(meta, arrays)
+        offset = self._file.tell()
+        self._file.write(record)
+        name_bytes = name.encode("utf-8")
+        self._entries.append((offset, len(record), len(self._names), len(name_bytes), kind))
+        self._names.extend(name_bytes)
+        return len(self._entries) - 1
+
+    def add_level(self, level: Level, name: str | None = None) -> int:
+        meta, arrays = _level_record(level)
+        return self._append(KIND_LEVEL, level.name if name is None else name, meta, arrays)
+
+    def add_design(self, design: BridgeDesign, name: str = "", info: Mapping[str, Any] | None = None) -> int:
+        """Returns the record index; info is free-form JSON stored alongside (scores, level name...)."""
+        meta, arrays = _design_record(design)
+        if info:
+            meta["info"] = dict(info)
+        return self._append(KIND_DESIGN, name, meta, arrays)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        entries = np.zeros(len(self._entries), dtype=_ENTRY_DTYPE)
+        if self._entries:
+            columns = np.array(self._entries, dtype=np.uint64)
+            for i, field in enumerate(("offset", "size", "name_start", "name_length", "kind")):
+                entries[field] = columns[:, i]
+        head = struct.pack("<Q", len(self._names)) + bytes(self._names)
+        self._file.write(head + _padding(len(head)) + entries.tobytes())
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_FORMAT_VERSION, 0, len(self._entries), index_offset))
+        self._file.close()
+
+
+class Archive:
+    """Read-only, memory-mapped view of an archive; records are decoded on request."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = path.open("rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ArchiveError(f"{path} is empty") from None
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ArchiveError(f"{path} is not a BridgeIA archive")
+        magic, version, _, count, index_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != ARCHIVE_MAGIC:
+            self.close()
+            raise ArchiveError(f"{path} is not a BridgeIA archive")
+        if version != ARCHIVE_FORMAT_VERSION:
+            self.close()
+            raise ArchiveError(f"Unsupported archive format version {version} in {path}")
+        if index_offset == 0:
+            self.close()
+            raise ArchiveError(f"{path} was not closed properly (missing index)")
+        (names_size,) = struct.unpack_from("<Q", self._map, index_offset)
+        self._names_offset = index_offset + 8
+        entries_offset = self._names_offset + names_size
+        entries_offset += -entries_offset % _ALIGN
+        self._index_offset = index_offset
+        self._entries = np.frombuffer(self._map, dtype=_ENTRY_DTYPE, count=count, offset=entries_offset)
+        self._by_name: dict[str, int] | None = None
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Views into the mapping must go before it can be closed
+        self._entries = np.zeros(0, dtype=_ENTRY_DTYPE)
+        if hasattr(self, "_map") and not self._map.closed:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Arrays handed out still view the mapping; it closes with them
+        self._file.close()
+
+    def __len__(self) -> int:
+        return int(self._entries.shape[0])
+
+    def raw_index(self) -> tuple[bytes, np.ndarray, int]:
+        """Names blob, entry table copy and index offset (used to append)."""
+        names_size = int(struct.unpack_from("<Q", self._map, self._index_offset)[0])
+        names = self._map[self._names_offset:self._names_offset + names_size]
+        return names, self._entries.copy(), self._index_offset
+
+    def kind(self, index: int) -> int:
+        return int(self._entries[index]["kind"])
+
+    def name(self, index: int) -> str:
+        entry = self._entries[index]
+        start = self._names_offset + int(entry["name_start"])
+        return self._map[start:start + int(entry["name_length"])].decode("utf-8")
+
+    def indices(self, kind: int | None = None) -> np.ndarray:
+        if kind is None:
+            return np.arange(len(self))
+        return np.flatnonzero(self._entries["kind"] == kind)
+
+    def find(self, name: str, kind: int | None = None) -> int:
+        """Index of the first record with this name (the name table is decoded once)."""
+        if self._by_name is None:
+            self._by_name = {}
+            for i in range(len(self)):
+                self._by_name.setdefault(f"{self.kind(i)}:{self.name(i)}", i)
+        kinds = (kind,) if kind is not None else (KIND_LEVEL, KIND_DESIGN)
+        for k in kinds:
+            index = self._by_name.get(f"{k}:{name}")
+            if index is not None:
+                return index
+        raise KeyError(name)
+
+    def _resolve(self, key: int | str, kind: int) -> int:
+        index = self.find(key, kind) if isinstance(key, str) else int(key)
+        if self.kind(index) != kind:
+            raise ArchiveError(f"Record {key!r} is not a {'level' if kind == KIND_LEVEL else 'design'}")
+        return index
+
+    def _record(self, index: int) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+        entry = self._entries[index]
+        offset = int(entry["offset"])
+        (meta_length,) = _META_LENGTH.unpack_from(self._map, offset)
+        start = offset + _META_LENGTH.size
+        meta = json.loads(self._map[start:start + meta_length])
+        data_offset = start + meta_length
+        data_offset += -(data_offset - offset) % _ALIGN
+        arrays = {}
+        for name, dtype, shape, rel in meta.pop("arrays"):
+            dtype = np.dtype(dtype)
+            count = math.prod(shape)  # Plain ints: np.prod costs more than the read itself here
+            array = np.frombuffer(self._map, dtype=dtype, count=count, offset=data_offset + rel)
+            arrays[name] = array.reshape(shape)
+        return meta, arrays
+
+    def level(self, key: int | str) -> Level:
+        meta, arrays = self._record(self._resolve(key, KIND_LEVEL))
+        anchors = tuple(
+            AnchorPoint(anchor_id=a_id, x=x, y=y, fixed=bool(fixed))
+            for a_id, (x, y, fixed) in zip(meta["anchor_ids"], arrays["anchors"].tolist())
+        )
+        banks = tuple(BankSegment(x1=x1, y1=y1, x2=x2, y2=y2) for x1, y1, x2, y2 in arrays["banks"].tolist())
+        goal = Goal(goal_type=meta["goal"]["type"], x=meta["goal"]["x"])
+        return Level(name=meta["name"], budget=meta["budget"], anchors=anchors, banks=banks, goal=goal)
+
+    def design_arrays(self, key: int | str) -> ArrayBridge:
+        """The design as read-only arrays over the mapping, without building a BridgeDesign."""
+        meta, arrays = self._record(self._resolve(key, KIND_DESIGN))
+        return ArrayBridge(
+            point_ids=meta["point_ids"],
+            positions=arrays["positions"],
+            fixed_count=meta["fixed_count"],
+            edge_ids=arrays["edge_ids"],
+            endpoints=arrays["endpoints"],
+            materials=arrays["materials"],
+            material_names=meta["material_names"],
+            costs=arrays["costs"],
+            next_edge_id=meta["next_edge_id"],
+            next_joint_id=meta["next_joint_id"],
+        )
+
+    def design(self, key: int | str) -> BridgeDesign:
+        return self.design_arrays(key).to_design()
+
+    def info(self, key: int | str) -> dict[str, Any]:
+        meta, _ = self._record(self._resolve(key, KIND_DESIGN))
+        return meta.get("info", {})
+
+    def levels(self) -> Iterator[Level]:
+        for index in self.indices(KIND_LEVEL):
+            yield self.level(int(index))
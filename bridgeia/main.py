@@ -1,29 +1,54 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 import pygame
 
-from bridgeia.core.bridge import BridgeDesign, calculate_cost, edge_exists, edge_length
+from bridgeia.core.bridge import (
+    COST_PER_UNIT,
+    MAX_EDGE_LENGTH,
+    BridgeDesign,
+    calculate_cost,
+    edge_length,
+)
+from bridgeia.core.history import EditHistory
 from bridgeia.core.level import AnchorPoint, Level
+from bridgeia.core.profiler import FrameProfiler
 from bridgeia.ui.renderer import LevelRenderer
+from bridgeia.ui.session import InputSession, SessionRecorder
+from bridgeia.sim.recording import Trajectory, TrajectoryPlayer
+from bridgeia.sim.rigidity import RigidityReport, analyse_rigidity
 from bridgeia.sim.simulation import PhysicsSimulation
 
 WINDOW_SIZE = (1000, 600)
 LEVEL_PATH = Path(__file__).resolve().parents[1] / "levels" / "level_01.json"
-COST_PER_UNIT = 3.0
-MAX_EDGE_LENGTH = 220.0
 ANCHOR_SNAP_RADIUS = 18
+EDGE_PICK_TOLERANCE = 8
+# Build mode blocks on input for at most this long instead of spinning at 60 fps
+IDLE_WAIT_MS = 250
+# --record keeps this many seconds of the latest run in a ring buffer
+RECORD_SECONDS = 60
+# Profiler overlay figures are refreshed this often while frames run at 60 fps
+PROFILE_REFRESH_FRAMES = 15
 
 
-def run() -> None:
-    args = parse_args()
+def run(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
     if args.screenshot:
-        render_screenshot(Path(args.screenshot))
+        render_screenshot(Path(args.screenshot), Path(args.design) if args.design else None)
         return
+    if args.replay:
+        run_replay(Path(args.replay))
+        return
+    record_path = Path(args.record) if args.record else None
+    trace_path = Path(args.trace) if args.trace else None
+    session_path = Path(args.record_session) if args.record_session else None
 
     pygame.init()
     screen = pygame.display.set_mode(WINDOW_SIZE)
@@ -31,105 +56,319 @@ def run() -> None:
     clock = pygame.time.Clock()
 
     level = Level.from_json(LEVEL_PATH)
+    bridge = create_bridge(level)
+    if args.design:
+        bridge = BridgeDesign.from_json(Path(args.design))
+        ensure_fixed_points(level, bridge)
+    mouse = pygame.mouse.get_pos()
+    recorder = SessionRecorder(level.to_dict(), bridge.to_dict(), mouse) if session_path is not None else None
+    editor = Editor(screen, level, bridge, FrameProfiler(trace=trace_path is not None), record_path, mouse)
+
+    while editor.running:
+        frame_ms = clock.tick(60)
+        if editor.simulation:
+            events = pygame.event.get()
+        else:
+            # Nothing animates in build mode: sleep until there is input
+            first = pygame.event.wait(IDLE_WAIT_MS)
+            events = [first, *pygame.event.get()] if first.type != pygame.NOEVENT else []
+        if recorder is not None:
+            recorder.record(frame_ms, events)
+        editor.frame(events, frame_ms / 1000.0)
+
+    editor.close()
+    if recorder is not None:
+        recorder.session(editor.outcome()).save(session_path)
+    if trace_path is not None:
+        editor.profiler.write_trace(trace_path)
+    pygame.quit()
+
+
+class Editor:
+    """
+    Build and test state of the editor window. It only changes through
+    frame(events, dt), so live input and a recorded InputSession drive the
+    same code and a replay ends in the same state.
+    """
+
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        level: Level,
+        bridge: BridgeDesign,
+        profiler: FrameProfiler,
+        record_path: Path | None = None,
+        mouse: tuple[int, int] = (0, 0),
+    ) -> None:
+        self.level = level
+        self.bridge = bridge
+        self.profiler = profiler
+        self.renderer = LevelRenderer(screen)
+        # Each click is one undo step
+        self.history = EditHistory(bridge)
+        self.record_path = record_path
+        self.running = True
+        # Pointer as the events reported it: replays have no real pointer to ask
+        self.mouse = mouse
+
+        self.selected_anchor: str | None = None
+        self.simulation: PhysicsSimulation | None = None
+        self.world: PhysicsSimulation | None = None
+        # (fixed steps, broken edge ids) of every stopped run, for InputSession.outcome
+        self.runs: list[tuple[int, list[int]]] = []
+        # Mechanism check of the design being edited, redone when it changes
+        self.rigidity: RigidityReport | None = None
+        self.rigidity_key: tuple[int, int] | None = None
+        self.profile_rows: list[tuple[str, float, float]] = []
+
+        self.grid_enabled = True
+        self.grid_size = 40
+
+    def frame(self, events: Sequence[pygame.event.Event], dt: float, draw: bool = True) -> None:
+        profiler = self.profiler
+        profiler.begin_frame()
+        with profiler.span("events"):
+            for event in events:
+                self.handle_event(event)
+
+        if self.simulation:
+            # Fixed-timestep physics: same steps, same result, whatever the frame rate
+            with profiler.span("physics"):
+                self.simulation.advance(dt)
+
+        with profiler.span("preview"):
+            if not self.simulation and self.selected_anchor:
+                snapped_pos = get_snapped_position(self.mouse, self.grid_size, self.grid_enabled)
+                preview_line = build_preview_line(self.level, self.bridge, self.selected_anchor, snapped_pos)
+            else:
+                preview_line = None
+
+        bridge = self.bridge
+        if not self.simulation and self.rigidity_key != (id(bridge), bridge.revision):
+            with profiler.span("rigidity"):
+                self.rigidity = analyse_rigidity(self.level, bridge)
+                self.rigidity_key = (id(bridge), bridge.revision)
+
+        if draw:
+            with profiler.span("draw"):
+                dirty_rects = self.renderer.draw(
+                    self.level, bridge, preview_line, self.selected_anchor, self.simulation,
+                    self.grid_enabled, self.grid_size,
+                    profile=self.profile_rows if profiler.enabled else None,
+                    rigidity=None if self.simulation else self.rigidity,
+                )
+            if dirty_rects:
+                with profiler.span("present"):
+                    pygame.display.update(dirty_rects)
+        profiler.end_frame()
+        # Build mode only runs frames on input, so refresh on every one of them
+        if profiler.enabled and (self.simulation is None or profiler.frames % PROFILE_REFRESH_FRAMES == 0):
+            self.profile_rows = profiler.stats()
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.QUIT:
+            self.running = False
+
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.renderer.invalidate()
+
+        if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+            self.mouse = event.pos
+
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                if self.simulation:
+                    self.stop_simulation()
+                else:
+                    self.selected_anchor = None # Cancel selection
+            elif event.key == pygame.K_SPACE:
+                if self.simulation:
+                    self.stop_simulation()
+                else:
+                    self.start_simulation()
+            elif event.key == pygame.K_F3:
+                self.profiler.enabled = not self.profiler.enabled
+                self.profiler.reset()
+                self.profile_rows = []
+            elif event.key in (pygame.K_z, pygame.K_y) and event.mod & pygame.KMOD_CTRL:
+                if not self.simulation:
+                    redo = event.key == pygame.K_y or bool(event.mod & pygame.KMOD_SHIFT)
+                    if self.history.redo() if redo else self.history.undo():
+                        self.selected_anchor = None  # May have been undone
+            elif event.key == pygame.K_g:
+                self.grid_enabled = not self.grid_enabled
+            elif event.key == pygame.K_LEFTBRACKET: # [
+                self.grid_size = max(10, self.grid_size - 10)
+            elif event.key == pygame.K_RIGHTBRACKET: # ]
+                self.grid_size = min(100, self.grid_size + 10)
+
+        # Mouse interaction only in BUILD mode
+        if not self.simulation and event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1: # Left Click
+                self.click(event.pos)
+            elif event.button == 3: # Right Click
+                remove_element_at(self.level, self.bridge, event.pos)
+                self.selected_anchor = None
+            self.history.commit()
+
+    def click(self, mouse_pos: tuple[int, int]) -> None:
+        level, bridge, selected_anchor = self.level, self.bridge, self.selected_anchor
+        # Use SNAPPED position for actions
+        snapped_pos = get_snapped_position(mouse_pos, self.grid_size, self.grid_enabled)
+
+        # Logic:
+        # 1. Check entity at Mouse (Raw)
+        target_id = find_point_at(level, bridge, mouse_pos)
+
+        if target_id:
+            # Clicked on existing point
+            if selected_anchor and selected_anchor != target_id:
+                try_add_edge(level, bridge, selected_anchor, target_id)
+            self.selected_anchor = target_id
+        elif selected_anchor:
+            # Clicked on empty space -> Create joint at Snapped Pos
+            # Ensure we don't accidentally create a joint ON TOP of an existing one (duplicate)
+            existing_at_snap = find_point_at(level, bridge, snapped_pos)
+            if existing_at_snap:
+                # We snapped to an existing point! Connect to it.
+                try_add_edge(level, bridge, selected_anchor, existing_at_snap)
+                self.selected_anchor = existing_at_snap
+            else:
+                # Real new point, selected so the next click continues from it
+                new_id = create_new_joint_and_return_id(level, bridge, selected_anchor, snapped_pos)
+                if new_id:
+                    self.selected_anchor = new_id
+
+    def start_simulation(self) -> None:
+        # One world per level: later runs only apply the design changes
+        if self.world is None:
+            self.world = PhysicsSimulation(self.level, self.bridge, interpolate=True)
+            self.world.profiler = self.profiler
+        else:
+            self.world.reset(self.bridge)
+        self.simulation = self.world
+        if self.record_path is not None:
+            capacity = int(RECORD_SECONDS / self.simulation.clock.step)
+            self.simulation.start_recording(capacity, ring=True)
+        self.selected_anchor = None
+
+    def stop_simulation(self) -> None:
+        simulation = self.simulation
+        if simulation is None:
+            return
+        self.runs.append((simulation.step_count, [failure.edge_id for failure in simulation.failures]))
+        if self.record_path is not None and simulation.recorder is not None:
+            simulation.recorder.trajectory().save(self.record_path)
+        self.simulation = None
+
+    def close(self) -> None:
+        self.stop_simulation()
+
+    def outcome(self) -> dict[str, Any]:
+        """What the session produced, compared by replays: final design and every run."""
+        return {"design": self.bridge.to_dict(), "runs": [[steps, broken] for steps, broken in self.runs]}
+
+
+def run_replay(path: Path) -> None:
+    """Play back a recorded trajectory: Space pauses, arrows scrub, Home/End seek."""
+    trajectory = Trajectory.load(path)
+    player = TrajectoryPlayer(trajectory)
+
+    pygame.init()
+    screen = pygame.display.set_mode(WINDOW_SIZE)
+    pygame.display.set_caption(f"BridgeIA - {path.name}")
+    clock = pygame.time.Clock()
+
+    level = Level.from_dict(trajectory.level)
     renderer = LevelRenderer(screen)
-    bridge = BridgeDesign(edges=[], joints={})
-    
-    # State
-    selected_anchor: str | None = None
-    simulation: PhysicsSimulation | None = None
-    
-    # Grid State
-    grid_enabled: bool = True
-    grid_size: int = 40
-    
+    bridge = trajectory.design()
+    ensure_fixed_points(level, bridge)
+
     running = True
     while running:
         dt = clock.tick(60) / 1000.0
-        
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-                
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
             if event.type == pygame.KEYDOWN:
+                step = 10 if event.mod & pygame.KMOD_SHIFT else 1
                 if event.key == pygame.K_ESCAPE:
-                    if simulation:
-                        simulation = None # Stop simulation
-                    else:
-                        selected_anchor = None # Cancel selection
+                    running = False
                 elif event.key == pygame.K_SPACE:
-                    if simulation:
-                        simulation = None
-                    else:
-                        simulation = PhysicsSimulation(level, bridge)
-                        selected_anchor = None
-                elif event.key == pygame.K_g:
-                    grid_enabled = not grid_enabled
-                elif event.key == pygame.K_LEFTBRACKET: # [
-                    grid_size = max(10, grid_size - 10)
-                elif event.key == pygame.K_RIGHTBRACKET: # ]
-                    grid_size = min(100, grid_size + 10)
-
-            # Mouse interaction only in BUILD mode
-            if not simulation:
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1: # Left Click
-                        # Use SNAPPED position for actions
-                        mouse_pos = event.pos
-                        snapped_pos = get_snapped_position(mouse_pos, grid_size, grid_enabled)
-                        
-                        # Logic:
-                        # 1. Check entity at Mouse (Raw)
-                        target_id = find_point_at(level, bridge, mouse_pos)
-                        
-                        if target_id:
-                            # Clicked on existing point
-                            if selected_anchor:
-                                if selected_anchor != target_id:
-                                    try_add_edge(level, bridge, selected_anchor, target_id)
-                                    selected_anchor = target_id
-                                else:
-                                    selected_anchor = target_id 
-                            else:
-                                selected_anchor = target_id
-                        else:
-                            # Clicked on empty space -> Create joint at Snapped Pos
-                            if selected_anchor:
-                                # Create new joint at snapped position
-                                # Ensure we don't accidentally create a joint ON TOP of an existing one (duplicate)
-                                # Check if snapped pos is on top of an existing point
-                                existing_at_snap = find_point_at(level, bridge, snapped_pos)
-                                if existing_at_snap:
-                                    # We snapped to an existing point! Connect to it.
-                                    try_add_edge(level, bridge, selected_anchor, existing_at_snap)
-                                    selected_anchor = existing_at_snap
-                                else:
-                                    # Real new point
-                                    create_new_joint(level, bridge, selected_anchor, snapped_pos)
-                                    # Auto-select the new joint? usually yes.
-                                    # create_new_joint needs to return the id, but we can assume it works for now?
-                                    # Use a helper that returns ID
-                                    new_id = create_new_joint_and_return_id(level, bridge, selected_anchor, snapped_pos)
-                                    if new_id:
-                                        selected_anchor = new_id
-                                    
-                    elif event.button == 3: # Right Click
-                        remove_element_at(level, bridge, event.pos)
-                        selected_anchor = None
-
-        if simulation:
-            simulation.step(dt)
-
-        if not simulation and selected_anchor:
-            mouse_pos = pygame.mouse.get_pos()
-            snapped_pos = get_snapped_position(mouse_pos, grid_size, grid_enabled)
-            preview_line = build_preview_line(level, bridge, selected_anchor, snapped_pos)
-        else:
-            preview_line = None
+                    player.playing = not player.playing
+                elif event.key == pygame.K_LEFT:
+                    player.playing = False
+                    player.scrub(-step)
+                elif event.key == pygame.K_RIGHT:
+                    player.playing = False
+                    player.scrub(step)
+                elif event.key == pygame.K_HOME:
+                    player.seek(0)
+                elif event.key == pygame.K_END:
+                    player.seek(player.frame_count - 1)
+
+        player.advance(dt)
+        dirty_rects = renderer.draw(level, bridge, None, None, player)
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+
+    pygame.quit()
 
-        renderer.draw(level, bridge, preview_line, selected_anchor, simulation, grid_enabled, grid_size)
-        pygame.display.flip()
 
+@dataclass(frozen=True)
+class SessionReplay:
+    frames: int
+    events: int
+    recorded_seconds: float  # Wall-clock length of the recorded session
+    replay_seconds: float
+    matches: bool | None  # Outcome equal to the recorded one; None if the session has none
+    outcome: dict[str, Any]
+
+    @property
+    def speedup(self) -> float:
+        return self.recorded_seconds / self.replay_seconds if self.replay_seconds > 0 else float("inf")
+
+
+def replay_session(path: Path, draw: bool = True, trace_path: Path | None = None) -> SessionReplay:
+    """
+    Feed a recorded InputSession through the editor as fast as possible:
+    dummy video driver, no frame limiter, recorded frame times.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    session = InputSession.load(path)
+    pygame.init()
+    screen = pygame.display.set_mode(WINDOW_SIZE)
+
+    level = Level.from_dict(session.level)
+    bridge = BridgeDesign.from_dict(session.design)
+    ensure_fixed_points(level, bridge)
+    editor = Editor(screen, level, bridge, FrameProfiler(trace=trace_path is not None), mouse=session.mouse)
+
+    frames = 0
+    start = time.perf_counter()
+    for dt, events in session.frames():
+        editor.frame(events, dt, draw)
+        frames += 1
+        if not editor.running:
+            break
+    editor.close()
+    elapsed = time.perf_counter() - start
+
+    if trace_path is not None:
+        editor.profiler.write_trace(trace_path)
     pygame.quit()
+    # Through JSON, as it was saved: tuples become lists
+    outcome = json.loads(json.dumps(editor.outcome()))
+    return SessionReplay(
+        frames=frames,
+        events=session.event_count,
+        recorded_seconds=session.duration,
+        replay_seconds=elapsed,
+        matches=outcome == session.outcome if session.outcome else None,
+        outcome=outcome,
+    )
 
 
 def get_snapped_position(pos: tuple[int, int], grid_size: int, enabled: bool) -> tuple[int, int]:
@@ -141,9 +380,26 @@ def get_snapped_position(pos: tuple[int, int], grid_size: int, enabled: bool) ->
     return snapped_x, snapped_y
 
 
+def create_bridge(level: Level) -> BridgeDesign:
+    bridge = BridgeDesign(edges=[], joints={})
+    bridge.set_fixed_points(get_anchor_positions(level))
+    return bridge
+
+
+def get_anchor_positions(level: Level) -> dict[str, tuple[float, float]]:
+    return {a.anchor_id: (a.x, a.y) for a in level.anchors}
+
+
+def ensure_fixed_points(level: Level, bridge: BridgeDesign) -> None:
+    # Designs built outside create_bridge still need the anchors in their index
+    if level.anchors and not bridge.fixed_points:
+        bridge.set_fixed_points(get_anchor_positions(level))
+
+
 def create_new_joint_and_return_id(level: Level, bridge: BridgeDesign, origin_id: str, pos: tuple[int, int]) -> str | None:
-    points = get_all_point_positions(level, bridge)
-    start_pos = points[origin_id]
+    start_pos = get_point_position(level, bridge, origin_id)
+    if start_pos is None:
+        return None
     dist = edge_length(start_pos, pos)
     
     if dist <= MAX_EDGE_LENGTH:
@@ -171,8 +427,7 @@ def build_preview_line(level: Level, bridge: BridgeDesign, selected_anchor: str
     if selected_anchor is None:
         return None
         
-    points = get_all_point_positions(level, bridge)
-    start = points.get(selected_anchor)
+    start = get_point_position(level, bridge, selected_anchor)
     if start is None:
         return None
         
@@ -180,32 +435,31 @@ def build_preview_line(level: Level, bridge: BridgeDesign, selected_anchor: str
 
 
 def get_all_point_positions(level: Level, bridge: BridgeDesign) -> dict[str, tuple[float, float]]:
-    points = {a.anchor_id: (a.x, a.y) for a in level.anchors}
+    points = get_anchor_positions(level)
     points.update(bridge.joints)
     return points
 
 
+def get_point_position(level: Level, bridge: BridgeDesign, point_id: str) -> tuple[float, float] | None:
+    ensure_fixed_points(level, bridge)
+    return bridge.point_position(point_id)
+
+
 def find_point_at(level: Level, bridge: BridgeDesign, position: tuple[int, int]) -> str | None:
-    x, y = position
-    points = get_all_point_positions(level, bridge)
-    
-    for p_id, (px, py) in points.items():
-        dx = px - x
-        dy = py - y
-        if (dx * dx + dy * dy) ** 0.5 <= ANCHOR_SNAP_RADIUS:
-            return p_id
-    return None
+    ensure_fixed_points(level, bridge)
+    return bridge.find_point_at(position, ANCHOR_SNAP_RADIUS)
 
 
 def try_add_edge(level: Level, bridge: BridgeDesign, a_id: str, b_id: str) -> None:
-    if edge_exists(bridge.edges, a_id, b_id):
+    if bridge.has_edge(a_id, b_id):
         return
     
-    points = get_all_point_positions(level, bridge)
-    if a_id not in points or b_id not in points:
+    start = get_point_position(level, bridge, a_id)
+    end = get_point_position(level, bridge, b_id)
+    if start is None or end is None:
         return
         
-    length = edge_length(points[a_id], points[b_id])
+    length = edge_length(start, end)
     if length > MAX_EDGE_LENGTH:
         return
         
@@ -218,70 +472,72 @@ def try_add_edge(level: Level, bridge: BridgeDesign, a_id: str, b_id: str) -> No
 
 def remove_element_at(level: Level, bridge: BridgeDesign, position: tuple[int, int]) -> bool:
     # Priority: Remove joint (if dynamic) -> Remove edge
-    points = get_all_point_positions(level, bridge)
-    x, y = position
-    
-    # Check joints first (only dynamic ones can be removed)
-    level_anchor_ids = {a.anchor_id for a in level.anchors}
-    
     closest_id = find_point_at(level, bridge, position)
-    if closest_id and closest_id not in level_anchor_ids:
-        # It's a bridge joint. Remove it and all connected edges.
-        edges_to_remove = [e.edge_id for e in bridge.edges if e.a == closest_id or e.b == closest_id]
-        for e_id in edges_to_remove:
-            bridge.remove_edge(e_id)
-        del bridge.joints[closest_id]
+    if closest_id and closest_id in bridge.joints:
+        # It's a bridge joint (anchors can't be removed). Remove it and all connected edges.
+        bridge.remove_joint(closest_id)
         return True
 
     # Check edges
-    for edge in list(bridge.edges):
-        start = points.get(edge.a)
-        end = points.get(edge.b)
-        if not start or not end:
-            continue
-        if point_to_segment_distance((x, y), start, end) <= 8:
-            bridge.remove_edge(edge.edge_id)
-            return True
+    edge_id = bridge.find_edge_at(position, EDGE_PICK_TOLERANCE)
+    if edge_id is not None:
+        bridge.remove_edge(edge_id)
+        return True
             
     return False
 
 
-def point_to_segment_distance(point: tuple[int, int], start: tuple[float, float], end: tuple[float, float]) -> float:
-    px, py = point
-    x1, y1 = start
-    x2, y2 = end
-    dx = x2 - x1
-    dy = y2 - y1
-    if dx == 0 and dy == 0:
-        return ((px - x1) ** 2 + (py - y1) ** 2) ** 0.5
-    t = ((px - x1) * dx + (py - y1) * dy) / (dx * dx + dy * dy)
-    t = max(0.0, min(1.0, t))
-    closest_x = x1 + t * dx
-    closest_y = y1 + t * dy
-    return ((px - closest_x) ** 2 + (py - closest_y) ** 2) ** 0.5
-
 def handle_click(level: Level, bridge: BridgeDesign, pos: tuple[int, int], selection: str | None) -> None:
     pass
 
-def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="BridgeIA prototype")
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="bridgeia play", description="BridgeIA prototype")
     parser.add_argument(
         "--screenshot",
         type=str,
         help="Render a static frame to an image file and exit.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--design",
+        type=str,
+        help="Start from a saved design JSON file (e.g. the optimizer's best design).",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        help=f"Save a trajectory of the last {RECORD_SECONDS}s of each simulation run to this file.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        help="Write a Chrome trace-event JSON of every frame phase to this file on exit.",
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        help="Replay a recorded trajectory file without running physics.",
+    )
+    parser.add_argument(
+        "--record-session",
+        type=str,
+        help="Save every input event and frame time to this file on exit (replay with `bridgeia replay`).",
+    )
+    return parser.parse_args(argv)
 
 
-def render_screenshot(output_path: Path) -> None:
+def render_screenshot(output_path: Path, design_path: Path | None = None, level_path: Path = LEVEL_PATH) -> None:
     os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
     pygame.init()
     screen = pygame.display.set_mode(WINDOW_SIZE)
     pygame.display.set_caption("BridgeIA")
 
-    level = Level.from_json(LEVEL_PATH)
+    level = Level.from_json(level_path)
     renderer = LevelRenderer(screen)
-    bridge = BridgeDesign(edges=[], joints={})
+    if design_path is not None:
+        bridge = BridgeDesign.from_json(design_path)
+        ensure_fixed_points(level, bridge)
+    else:
+        bridge = create_bridge(level)
     
     renderer.draw(level, bridge, preview_line=None, selected_anchor=None)
     pygame.display.flip()
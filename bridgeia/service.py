@@ -0,0 +1,499 @@
+"""Local evaluation service: score designs over HTTP without importing pygame.
+
+    python -m bridgeia serve --port 8765 --workers 8
+
+Endpoints (JSON over HTTP/1.1 on localhost, keep-alive supported):
+
+    POST /evaluate  {"level": "level_01", "designs": [<design dict>, ...], "settings": {...}}
+                    Streams one NDJSON line per design as soon as its batch is done
+                    ({"index", "result"}), then a summary line ({"done", "latency_ms"...}).
+                    "stream": false returns a single JSON document instead.
+    GET  /levels    Level ids available under the levels directory.
+    GET  /metrics   Request, batch and latency statistics.
+    GET  /health
+
+Designs use the BridgeDesign.to_dict() layout. Designs from all requests are
+queued, grouped into batches per (level, settings) and evaluated on a process
+pool. Requests beyond --max-pending queued designs or --max-requests concurrent
+requests are refused with 429 so agents can back off.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.client
+import json
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import Level
+from bridgeia.sim.batch import EvaluationSettings, evaluate_design
+from bridgeia.sim.simulation import PROFILES
+
+LEVELS_DIR = Path(__file__).resolve().parents[1] / "levels"
+DEFAULT_PORT = 8765
+# Request latencies kept for the /metrics percentiles
+LATENCY_WINDOW = 1024
+# Settings a client may override; the rest stay server-side
+CLIENT_SETTINGS = ("duration", "sag_limit", "stop_when_settled", "prescreen", "profile")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    host: str = "127.0.0.1"
+    port: int = DEFAULT_PORT
+    workers: int | None = None  # Process pool size (default: all cores)
+    levels_dir: Path = LEVELS_DIR
+    batch_size: int = 32  # Designs per pool task
+    batch_window: float = 0.005  # Seconds to wait for more designs before dispatching a partial batch
+    max_pending: int = 4096  # Queued + running designs before new requests get 429
+    max_requests: int = 64  # Concurrent /evaluate requests
+    max_body: int = 32 * 1024 * 1024
+    max_duration: float = 30.0  # Longest simulated run a client may ask for, in seconds
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class _Job:
+    level_id: str
+    settings: EvaluationSettings
+    design: dict[str, Any]
+    future: asyncio.Future[dict[str, Any]]
+
+
+def _json_safe(value: Any) -> Any:
+    # JSON has no Infinity/NaN: report them as null
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _client_settings(raw: Any, max_duration: float) -> dict[str, Any]:
+    """Checked EvaluationSettings overrides from a request's "settings"; RequestError(400) on bad values."""
+    if not isinstance(raw, dict):
+        raise RequestError(400, "settings must be a JSON object")
+    overrides: dict[str, Any] = {}
+    for key in CLIENT_SETTINGS:
+        if key not in raw:
+            continue
+        value = raw[key]
+        if key in ("duration", "sag_limit"):
+            limit = max_duration if key == "duration" else math.inf
+            # bool is an int subclass: true / false are not numbers here
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 < value <= limit:
+                bound = f"in (0, {limit:g}]" if math.isfinite(limit) else "a positive finite number"
+                raise RequestError(400, f"settings.{key} must be {bound}")
+            if not math.isfinite(value):
+                raise RequestError(400, f"settings.{key} must be a positive finite number")
+            value = float(value)
+        elif key == "profile":
+            if value not in PROFILES:
+                raise RequestError(400, f"settings.profile must be one of {', '.join(PROFILES)}")
+        elif not isinstance(value, bool):
+            raise RequestError(400, f"settings.{key} must be true or false")
+        overrides[key] = value
+    return overrides
+
+
+def _evaluate_batch(level: Level, designs: list[dict[str, Any]], settings: EvaluationSettings) -> list[dict[str, Any]]:
+    """Runs in a pool worker: decode and evaluate each design of one batch."""
+    anchors = {a.anchor_id: (a.x, a.y) for a in level.anchors}
+    results = []
+    for data in designs:
+        try:
+            design = BridgeDesign.from_dict(data)
+            design.set_fixed_points(anchors)
+            result = evaluate_design(level, design, settings)
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            # One malformed design must not fail the batch: it mixes jobs of several requests
+            results.append({"error": f"invalid design: {exc}"})
+            continue
+        results.append({key: _json_safe(value) for key, value in asdict(result).items()})
+    return results
+
+
+class EvaluationService:
+    def __init__(self, config: ServiceConfig = ServiceConfig()) -> None:
+        self.config = config
+        self.workers = config.workers or os.cpu_count() or 1
+        self._levels: dict[str, Level] = {}
+        self._queue: asyncio.Queue[_Job] = asyncio.Queue()
+        # Batches handed to the pool at once; more would only queue inside the executor
+        self._slots = asyncio.Semaphore(self.workers * 2)
+        self._pool: ProcessPoolExecutor | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._batcher: asyncio.Task[None] | None = None
+        self._started = time.monotonic()
+        self.pending = 0
+        self.active_requests = 0
+        self.counters = {"requests": 0, "rejected": 0, "designs": 0, "batches": 0, "errors": 0}
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._per_design: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self) -> None:
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        # The pool forks its workers on demand; forked after accept() they would inherit
+        # the client sockets and hold `Connection: close` responses open, so fork them now
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, os.getpid) for _ in range(self.workers)))
+        self._batcher = asyncio.create_task(self._run_batcher())
+        self._server = await asyncio.start_server(self._handle_connection, self.config.host, self.config.port)
+
+    @property
+    def port(self) -> int:
+        assert self._server is not None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        assert self._server is not None
+        print(f"BridgeIA evaluation service on http://{self.config.host}:{self.port} ({self.workers} workers)")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            self._batcher = None
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def level(self, level_id: str) -> Level:
+        level = self._levels.get(level_id)
+        if level is None:
+            path = self.config.levels_dir / f"{level_id}.json"
+            # Ids are plain file stems: no path components
+            if Path(level_id).name != level_id or not path.is_file():
+                raise RequestError(404, f"unknown level {level_id!r}")
+            level = self._levels[level_id] = Level.from_json(path)
+        return level
+
+    def level_ids(self) -> list[str]:
+        return sorted(path.stem for path in self.config.levels_dir.glob("*.json"))
+
+    # Batching -----------------------------------------------------------
+
+    async def _run_batcher(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self.config.batch_size - 1:
+                # Give concurrent requests a moment to fill the batch
+                await asyncio.sleep(self.config.batch_window)
+            while len(batch) < self.config.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            groups: dict[tuple[str, EvaluationSettings], list[_Job]] = {}
+            for job in batch:
+                if job.future.cancelled():  # Client went away
+                    self.pending -= 1
+                    continue
+                try:
+                    groups.setdefault((job.level_id, job.settings), []).append(job)
+                except Exception as exc:  # A job that cannot be grouped fails alone
+                    self._fail([job], exc)
+            for (level_id, settings), jobs in groups.items():
+                try:
+                    level = self.level(level_id)
+                except Exception as exc:
+                    self._fail(jobs, exc)
+                    continue
+                await self._slots.acquire()
+                asyncio.create_task(self._dispatch(level, settings, jobs))
+
+    def _fail(self, jobs: list[_Job], exc: BaseException) -> None:
+        """Fail jobs that never reached the pool; the batcher keeps serving the others."""
+        self.counters["errors"] += len(jobs)
+        self.pending -= len(jobs)
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_exception(exc)
+
+    async def _dispatch(self, level: Level, settings: EvaluationSettings, jobs: list[_Job]) -> None:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(
+                self._pool, _evaluate_batch, level, [job.design for job in jobs], settings
+            )
+        except Exception as exc:  # Worker crashed or pool shut down: fail the whole batch
+            self.counters["errors"] += len(jobs)
+            for job in jobs:
+                if not job.future.done():
+                    job.future.set_exception(exc)
+        else:
+            self._per_design.append((time.perf_counter() - started) / len(jobs))
+            for job, result in zip(jobs, results):
+                if not job.future.done():
+                    job.future.set_result(result)
+        finally:
+            self._slots.release()
+            self.pending -= len(jobs)
+            self.counters["batches"] += 1
+            self.counters["designs"] += len(jobs)
+
+    def submit(self, level_id: str, designs: Sequence[dict[str, Any]], settings: EvaluationSettings) -> list[asyncio.Future[dict[str, Any]]]:
+        """Queue designs for evaluation, or raise RequestError(429) when the service is saturated."""
+        if self.pending + len(designs) > self.config.max_pending:
+            self.counters["rejected"] += 1
+            raise RequestError(429, f"{self.pending} designs pending; retry later")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for design in designs:
+            future: asyncio.Future[dict[str, Any]] = loop.create_future()
+            self._queue.put_nowait(_Job(level_id, settings, design, future))
+            futures.append(future)
+        self.pending += len(designs)
+        return futures
+
+    # HTTP ---------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    await self._route(method, path, body, writer, keep_alive)
+                except RequestError as exc:
+                    await self._send_json(writer, exc.status, {"error": str(exc)}, keep_alive)
+                if not keep_alive:
+                    break
+        except RequestError as exc:  # Malformed request: answer and drop the connection
+            await self._send_json(writer, exc.status, {"error": str(exc)}, keep_alive=False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str], bytes] | None:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise RequestError(400, "malformed request line") from None
+        headers: dict[str, str] = {}
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise RequestError(400, "invalid Content-Length") from None
+        if length < 0:
+            raise RequestError(400, "invalid Content-Length")
+        if length > self.config.max_body:
+            raise RequestError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        if path == "/health" and method == "GET":
+            await self._send_json(writer, 200, {"status": "ok"}, keep_alive)
+        elif path == "/levels" and method == "GET":
+            await self._send_json(writer, 200, {"levels": self.level_ids()}, keep_alive)
+        elif path == "/metrics" and method == "GET":
+            await self._send_json(writer, 200, self.metrics(), keep_alive)
+        elif path == "/evaluate":
+            if method != "POST":
+                raise RequestError(405, "use POST")
+            await self._evaluate(body, writer, keep_alive)
+        else:
+            raise RequestError(404, f"no route for {method} {path}")
+
+    async def _evaluate(self, body: bytes, writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        started = time.perf_counter()
+        try:
+            payload = json.loads(body)
+            level_id = str(payload["level"])
+            designs = payload["designs"]
+            raw_settings = payload.get("settings", {})
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise RequestError(400, "expected {\"level\": id, \"designs\": [...]}") from None
+        if not isinstance(designs, list) or not designs:
+            raise RequestError(400, "designs must be a non-empty list")
+        if not all(isinstance(design, dict) for design in designs):
+            raise RequestError(400, "every design must be a JSON object")
+        overrides = _client_settings(raw_settings, self.config.max_duration)
+        self.level(level_id)
+        if self.active_requests >= self.config.max_requests:
+            self.counters["rejected"] += 1
+            raise RequestError(429, "too many concurrent requests; retry later")
+        try:
+            settings = EvaluationSettings(**overrides)
+        except (TypeError, ValueError) as exc:
+            raise RequestError(400, f"invalid settings: {exc}") from None
+
+        futures = self.submit(level_id, designs, settings)
+        self.active_requests += 1
+        self.counters["requests"] += 1
+        try:
+            if payload.get("stream", True):
+                await self._stream_results(futures, writer, started)
+            else:
+                try:
+                    results = [await future for future in futures]
+                except Exception as exc:  # Worker crash, broken pool, solver failure...
+                    await self._send_json(writer, 500, {"error": f"evaluation failed: {exc}"}, keep_alive)
+                    return
+                latency = (time.perf_counter() - started) * 1000.0
+                self._latencies.append(latency)
+                await self._send_json(writer, 200, {"results": results, "latency_ms": latency}, keep_alive)
+        finally:
+            self.active_requests -= 1
+            for future in futures:
+                future.cancel()  # No-op for finished ones; drops queued work of a vanished client
+
+    async def _stream_results(self, futures: list[asyncio.Future[dict[str, Any]]], writer: asyncio.StreamWriter, started: float) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n"
+        )
+        index_of = {future: index for index, future in enumerate(futures)}
+        remaining: set[asyncio.Future[dict[str, Any]]] = set(futures)
+        first_result_ms = None
+        while remaining:
+            done, remaining = await asyncio.wait(remaining, return_when=asyncio.FIRST_COMPLETED)
+            if first_result_ms is None:
+                first_result_ms = (time.perf_counter() - started) * 1000.0
+            lines = []
+            for future in sorted(done, key=index_of.__getitem__):
+                exc = future.exception()
+                result = {"error": f"evaluation failed: {exc}"} if exc else future.result()
+                lines.append(json.dumps({"index": index_of[future], "result": result}))
+            self._write_chunk(writer, ("\n".join(lines) + "\n").encode("utf-8"))
+            await writer.drain()
+        latency = (time.perf_counter() - started) * 1000.0
+        self._latencies.append(latency)
+        summary = {"done": True, "count": len(futures), "latency_ms": latency, "first_result_ms": first_result_ms}
+        self._write_chunk(writer, (json.dumps(summary) + "\n").encode("utf-8"))
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if status == 429:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+
+    def metrics(self) -> dict[str, Any]:
+        def percentiles(samples: deque[float]) -> dict[str, float | None]:
+            ordered = sorted(samples)
+            if not ordered:
+                return {"p50": None, "p90": None, "p99": None, "max": None}
+            pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))]  # noqa: E731
+            return {"p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": ordered[-1]}
+
+        batches = self.counters["batches"]
+        return {
+            "uptime_s": time.monotonic() - self._started,
+            "workers": self.workers,
+            "requests": {"total": self.counters["requests"], "active": self.active_requests, "rejected": self.counters["rejected"]},
+            "designs": {"evaluated": self.counters["designs"], "pending": self.pending, "errors": self.counters["errors"]},
+            "batches": {"dispatched": batches, "mean_size": self.counters["designs"] / batches if batches else 0.0},
+            "latency_ms": percentiles(self._latencies),
+            "pool_ms_per_design": {k: (v * 1000.0 if v is not None else None) for k, v in percentiles(self._per_design).items()},
+        }
+
+
+def evaluate_remote(
+    level_id: str,
+    designs: Sequence[BridgeDesign | dict[str, Any]],
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    settings: dict[str, Any] | None = None,
+    timeout: float = 300.0,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Blocking client: yields (design index, result) as the service streams them back."""
+    payload = {
+        "level": level_id,
+        "designs": [d.to_dict() if isinstance(d, BridgeDesign) else d for d in designs],
+        "settings": settings or {},
+    }
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("POST", "/evaluate", body=json.dumps(payload), headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        if response.status != 200:
+            raise RuntimeError(f"service answered {response.status}: {response.read().decode('utf-8', 'replace')}")
+        for line in response:
+            message = json.loads(line)
+            if message.get("done"):
+                break
+            yield message["index"], message["result"]
+    finally:
+        connection.close()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    defaults = ServiceConfig()
+    parser = argparse.ArgumentParser(prog="python -m bridgeia serve", description="Headless design evaluation service")
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--levels-dir", type=str, default=str(defaults.levels_dir))
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size)
+    parser.add_argument("--batch-window-ms", type=float, default=defaults.batch_window * 1000.0)
+    parser.add_argument("--max-pending", type=int, default=defaults.max_pending)
+    parser.add_argument("--max-requests", type=int, default=defaults.max_requests)
+    parser.add_argument("--max-duration", type=float, default=defaults.max_duration,
+                        help="Longest simulated run (s) a request may ask for.")
+    args = parser.parse_args(argv)
+
+    config = ServiceConfig(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        levels_dir=Path(args.levels_dir),
+        batch_size=args.batch_size,
+        batch_window=args.batch_window_ms / 1000.0,
+        max_pending=args.max_pending,
+        max_requests=args.max_requests,
+        max_duration=args.max_duration,
+    )
+    try:
+        asyncio.run(EvaluationService(config).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import Level
+from bridgeia.sim.goals import spans_gap
+from bridgeia.sim.rigidity import analyse_rigidity
+from bridgeia.sim.simulation import FIXED_DT, PhysicsSimulation, get_profile
+from bridgeia.sim.static_solver import SolverUnavailable, solve_static
+from bridgeia.sim.testrun import TestRunSettings, run_test
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from bridgeia.sim.cache import EvaluationCache
+
+
+@dataclass(frozen=True)
+class EvaluationSettings:
+    duration: float = 5.0  # Simulated seconds per design, at most
+    stop_when_settled: bool = True  # End a run once every joint stays slower than settle_speed (see sim.testrun)
+    dt: float = FIXED_DT  # Same fixed step as the interactive loop
+    profile: str = "batch"  # Physics profile (sim.simulation.PROFILES)
+    substeps: int | None = None  # Override the profile's
+    iterations: int | None = None
+    sag_limit: float = 60.0  # Max downward joint displacement (px) before failing
+    prescreen: bool = True  # Reject mechanisms (pebble game), then unstable / overstressed designs (static solver) first
+    failure_recordings: str | None = None  # Directory receiving a trajectory per failed design
+
+    def __post_init__(self) -> None:
+        get_profile(self.profile)  # Fail on an unknown name here rather than in a pool worker
+
+
+@dataclass(frozen=True)
+class EvaluationResult:
+    survived: bool
+    max_stress: float
+    max_sag: float
+    time_simulated: float
+    failure: str | None = None
+    goal_reached: bool = False
+
+
+@dataclass
+class BatchReport:
+    results: list[EvaluationResult]
+    elapsed: float
+    workers: int
+    cached: int = 0  # Results served by the evaluation cache
+
+    @property
+    def designs_per_second(self) -> float:
+        if self.elapsed <= 0.0:
+            return 0.0
+        return len(self.results) / self.elapsed
+
+    @property
+    def survivors(self) -> int:
+        return sum(1 for result in self.results if result.survived)
+
+
+def evaluate_design(
+    level: Level,
+    bridge: BridgeDesign,
+    settings: EvaluationSettings = EvaluationSettings(),
+    recording_path: Path | None = None,
+) -> EvaluationResult:
+    """
+    Simulate one design headlessly, stepping as fast as the CPU allows.
+    With recording_path set, the run is recorded and saved there if the design fails.
+    """
+    if not spans_gap(level, bridge):
+        # No path across: nothing to simulate
+        return EvaluationResult(False, 0.0, 0.0, 0.0, "goal missed")
+    if settings.prescreen:
+        rigidity = analyse_rigidity(level, bridge)
+        if not rigidity.rigid:
+            # The verdict the static solver would reach, without factorising anything
+            unconnected = any(len(group) == 1 for group in rigidity.floating)
+            return EvaluationResult(False, 0.0, math.inf, 0.0, "unconnected joint" if unconnected else "mechanism")
+        try:
+            static = solve_static(level, bridge)
+        except SolverUnavailable:
+            static = None  # Too large to screen without scipy: the simulation decides alone
+        if static is not None and not static.passed:
+            failure = static.failure or "overstressed"
+            return EvaluationResult(False, static.max_utilisation, static.max_sag, 0.0, failure)
+
+    simulation = PhysicsSimulation(
+        level, bridge, fixed_dt=settings.dt, substeps=settings.substeps, iterations=settings.iterations,
+        profile=settings.profile,
+    )
+    steps = max(1, int(round(settings.duration / settings.dt)))
+    if recording_path is not None:
+        simulation.start_recording(capacity=steps + 1)
+
+    run = run_test(
+        simulation,
+        level,
+        bridge,
+        TestRunSettings(
+            max_duration=settings.duration,
+            stop_when_settled=settings.stop_when_settled,
+            sag_limit=settings.sag_limit,
+        ),
+    )
+    result = EvaluationResult(
+        survived=run.passed,
+        max_stress=run.max_stress,
+        max_sag=run.max_sag,
+        time_simulated=run.time,
+        failure=None if run.passed else run.outcome,
+        goal_reached=run.goal_reached,
+    )
+    if recording_path is not None and not result.survived and simulation.recorder is not None:
+        simulation.recorder.trajectory().save(recording_path)
+    return result
+
+
+def _evaluate_job(job: tuple[int, Level, BridgeDesign, EvaluationSettings]) -> tuple[EvaluationResult, float]:
+    """Returns the result and the CPU seconds it took in the worker."""
+    index, level, bridge, settings = job
+    recording_path = None
+    if settings.failure_recordings is not None:
+        recording_path = Path(settings.failure_recordings) / f"design_{index:06d}.npz"
+    start = time.process_time()
+    result = evaluate_design(level, bridge, settings, recording_path)
+    return result, time.process_time() - start
+
+
+@dataclass
+class BatchEvaluator:
+    """
+    Scores many designs for one level on a process pool. Used as a context
+    manager, the pool stays up across evaluate() calls (e.g. one per optimizer
+    generation); otherwise each call starts and stops its own pool.
+
+    With a cache, designs whose canonical key was seen before (in this batch
+    or earlier) are not simulated again.
+    """
+
+    level: Level
+    settings: EvaluationSettings = field(default_factory=EvaluationSettings)
+    workers: int | None = None
+    cache: EvaluationCache | None = None
+    _executor: ProcessPoolExecutor | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.workers is None:
+            self.workers = os.cpu_count() or 1
+
+    def __enter__(self) -> "BatchEvaluator":
+        if self.workers != 1 and self._executor is None:
+            # Imported on demand: single-process callers (e.g. `bridgeia eval`) start faster without it
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def evaluate(self, designs: Sequence[BridgeDesign]) -> BatchReport:
+        start = time.perf_counter()
+        results: list[EvaluationResult | None] = [None] * len(designs)
+        keys: list[str] = []
+        first_seen: dict[str, int] = {}
+        todo = list(range(len(designs)))
+        if self.cache is not None:
+            from bridgeia.sim.cache import design_key
+
+            keys = [design_key(self.level, design, self.settings) for design in designs]
+            todo = []
+            for index, key in enumerate(keys):
+                if key in first_seen:
+                    continue  # Duplicate within the batch: filled from the cache below
+                first_seen[key] = index
+                results[index] = self.cache.get(key)
+                if results[index] is None:
+                    todo.append(index)
+
+        jobs = [(index, self.level, designs[index], self.settings) for index in todo]
+        for index, (result, seconds) in zip(todo, self._run_jobs(jobs)):
+            results[index] = result
+            if self.cache is not None:
+                self.cache.put(keys[index], result, seconds)
+        if self.cache is not None:
+            for index, result in enumerate(results):
+                if result is None:
+                    # Counted as a hit; falls back to the first copy if the LRU already dropped it
+                    results[index] = self.cache.get(keys[index]) or results[first_seen[keys[index]]]
+
+        return BatchReport(
+            results=results,  # type: ignore[arg-type]  # Every slot is filled above
+            elapsed=time.perf_counter() - start,
+            workers=self.workers or 1,
+            cached=len(designs) - len(todo),
+        )
+
+    def _run_jobs(self, jobs: list[tuple[int, Level, BridgeDesign, EvaluationSettings]]) -> list[tuple[EvaluationResult, float]]:
+        if self.workers == 1 or len(jobs) <= 1:
+            results = [_evaluate_job(job) for job in jobs]
+        else:
+            # Small chunks keep every core busy even when run lengths differ a lot
+            chunksize = max(1, len(jobs) // ((self.workers or 1) * 8))
+            if self._executor is not None:
+                results = list(self._executor.map(_evaluate_job, jobs, chunksize=chunksize))
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    results = list(executor.map(_evaluate_job, jobs, chunksize=chunksize))
+        return results
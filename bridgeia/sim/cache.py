@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from bridgeia.core.arrays import ArrayBridge
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import Level
+from bridgeia.sim.batch import EvaluationResult, EvaluationSettings
+
+# Bump when the canonical form changes so old disk entries stop matching
+KEY_VERSION = 1
+# Positions are compared on this grid (px): float noise below it hashes the same
+POSITION_QUANTUM = 1e-3
+
+
+@lru_cache(maxsize=64)
+def level_fingerprint(level: Level) -> bytes:
+    """Digest of everything about a level that affects a simulation (not its name)."""
+    data = level.to_dict()
+    data.pop("name", None)
+    return hashlib.blake2b(json.dumps(data, sort_keys=True).encode("utf-8"), digest_size=16).digest()
+
+
+@lru_cache(maxsize=64)
+def settings_fingerprint(settings: EvaluationSettings) -> bytes:
+    data = asdict(settings)
+    data.pop("failure_recordings", None)  # Where failures are saved does not change the result
+    return hashlib.blake2b(json.dumps(data, sort_keys=True).encode("utf-8"), digest_size=16).digest()
+
+
+def design_key(level: Level, design: BridgeDesign, settings: EvaluationSettings | None = None) -> str:
+    """
+    Canonical hash of (level, design, settings) as hex.
+
+    Joint IDs, edge IDs and edge order do not matter: points are identified by
+    their quantised position (anchors apart from joints) and edges by their
+    sorted endpoint ranks, material and cost. Two designs with the same
+    geometry therefore share a key whatever their editing history.
+    """
+    anchors = {a.anchor_id: (a.x, a.y) for a in level.anchors}
+    arrays = ArrayBridge.from_design(design, anchors)
+    quantised = np.round(arrays.positions / POSITION_QUANTUM).astype(np.int64).reshape(-1, 2)
+    fixed = np.arange(arrays.point_count) < arrays.fixed_count
+    # Anchors first, then by position; rank[i] is point i's canonical index
+    order = np.lexsort((quantised[:, 1], quantised[:, 0], ~fixed))
+    rank = np.empty(arrays.point_count, dtype=np.int64)
+    rank[order] = np.arange(arrays.point_count)
+
+    ends = np.sort(rank[arrays.endpoints], axis=1).reshape(-1, 2)
+    rows = np.column_stack((ends, arrays.materials.astype(np.int64), arrays.costs.astype(np.int64)))
+    rows = rows[np.lexsort(rows.T[::-1])]
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(KEY_VERSION.to_bytes(2, "little"))
+    digest.update(level_fingerprint(level))
+    digest.update(settings_fingerprint(settings or EvaluationSettings()))
+    digest.update(np.array([arrays.point_count, arrays.fixed_count, arrays.edge_count], dtype=np.int64).tobytes())
+    digest.update(quantised[order].tobytes())
+    digest.update("\0".join(arrays.material_names).encode("utf-8"))
+    digest.update(np.ascontiguousarray(rows).tobytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    saved_seconds: float = 0.0  # Evaluation CPU time the hits would have cost
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"cache: {self.hit_rate:.1%} hits ({self.memory_hits} memory, {self.disk_hits} disk, "
+            f"{self.misses} misses), {self.saved_seconds:.1f} s CPU saved, {self.evictions} evicted"
+        )
+
+
+class EvaluationCache:
+    """
+    Two-tier memo of EvaluationResults keyed by design_key(): an in-memory LRU
+    in front of an optional SQLite file. The file is kept under max_disk_bytes
+    by evicting the least recently used entries. Each entry stores the CPU
+    time its evaluation took, so hits can be reported as time saved.
+    """
+
+    def __init__(self, path: Path | None = None, memory_entries: int = 4096, max_disk_bytes: int = 64 * 1024 * 1024) -> None:
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, tuple[EvaluationResult, float]] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        self._disk_bytes = 0
+        self._clock = 0  # Recency counter for disk LRU
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, seconds REAL NOT NULL, size INTEGER NOT NULL, used INTEGER NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+            size, clock = self._db.execute("SELECT COALESCE(SUM(size), 0), COALESCE(MAX(used), 0) FROM results").fetchone()
+            self._disk_bytes, self._clock = int(size), int(clock)
+
+    def __enter__(self) -> "EvaluationCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        if self._db is not None:
+            return int(self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+        return len(self._memory)
+
+    @property
+    def disk_bytes(self) -> int:
+        return self._disk_bytes
+
+    def get(self, key: str) -> EvaluationResult | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.stats.memory_hits += 1
+            self.stats.saved_seconds += entry[1]
+            return entry[0]
+        if self._db is not None:
+            row = self._db.execute("SELECT value, seconds FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._clock += 1
+                self._db.execute("UPDATE results SET used = ? WHERE key = ?", (self._clock, key))
+                result = EvaluationResult(**json.loads(row[0]))
+                self._remember(key, result, row[1])
+                self.stats.disk_hits += 1
+                self.stats.saved_seconds += row[1]
+                return result
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, result: EvaluationResult, seconds: float) -> None:
+        self._remember(key, result, seconds)
+        self.stats.stores += 1
+        if self._db is None:
+            return
+        value = json.dumps(asdict(result))
+        size = len(key) + len(value) + 32  # Rough row size; only the budget needs to be consistent
+        self._clock += 1
+        old = self._db.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO results (key, value, seconds, size, used) VALUES (?, ?, ?, ?, ?)",
+            (key, value, seconds, size, self._clock),
+        )
+        self._disk_bytes += size - (old[0] if old else 0)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    def _remember(self, key: str, result: EvaluationResult, seconds: float) -> None:
+        self._memory[key] = (result, seconds)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        assert self._db is not None
+        # Free a tenth of the budget at once so eviction does not run on every put
+        target = self.max_disk_bytes * 0.9
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY used").fetchall():
+            if self._disk_bytes <= target:
+                break
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._disk_bytes -= size
+            self.stats.evictions += 1
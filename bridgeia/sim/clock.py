@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class FixedStepClock:
+    """
+    Accumulates variable frame time and hands out whole fixed steps, so physics
+    never sees the frame dt. Time beyond max_steps per frame is dropped rather
+    than simulated (a slow frame slows the simulation down instead of making it
+    take one huge step or fall further behind).
+    """
+
+    step: float = 1.0 / 60.0
+    max_steps: int = 5
+    accumulator: float = 0.0
+
+    def advance(self, frame_dt: float) -> int:
+        self.accumulator += max(0.0, frame_dt)
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a step left in the accumulator, for render interpolation."""
+        return min(1.0, self.accumulator / self.step)
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
@@ -0,0 +1,5 @@
+"""Physical constants shared by the dynamic simulation and the static solver."""
+
+GRAVITY = 900.0  # px/s^2, pointing down the screen (+y)
+JOINT_MASS = 1.0
+JOINT_RADIUS = 3.0
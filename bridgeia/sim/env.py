@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+import numpy as np
+
+from bridgeia.core.bridge import COST_PER_UNIT, MAX_EDGE_LENGTH, BridgeDesign, calculate_cost, edge_length
+from bridgeia.core.level import Level
+from bridgeia.sim.batch import EvaluationResult, EvaluationSettings, evaluate_design
+
+# Action opcodes; an action is an int triple (op, a, b)
+ADD_JOINT = 0  # a: grid cell, b: point slot the new member starts from
+ADD_EDGE = 1  # a, b: point slots
+REMOVE_EDGE = 2  # a, b: point slots
+REMOVE_JOINT = 3  # a: point slot (anchors cannot be removed)
+TEST = 4  # Run the design through the physics test; ends the episode
+ACTION_COUNT = 5
+
+# Columns of the "points" observation
+POINT_FEATURES = ("x", "y", "present", "fixed")
+
+
+@dataclass(frozen=True)
+class EnvConfig:
+    max_anchors: int = 8  # Point slots reserved for level anchors
+    max_joints: int = 32  # Point slots for joints placed by the agent
+    grid_shape: tuple[int, int] = (40, 20)  # Columns, rows of the joint placement grid over the level
+    max_steps: int = 200  # Actions before the episode is truncated
+    invalid_penalty: float = -0.01  # Action that could not be applied (out of reach, over budget...)
+    pass_reward: float = 1.0  # Bridge stood and reached the goal
+    savings_weight: float = 1.0  # Added on a pass, times the fraction of budget left
+    fail_reward: float = -0.5  # Reached the goal side but broke, fell or sagged
+    miss_reward: float = -1.0  # Never connected the start to the goal side
+    evaluation: EvaluationSettings = field(default_factory=EvaluationSettings)
+
+    @property
+    def max_points(self) -> int:
+        return self.max_anchors + self.max_joints
+
+    @property
+    def grid_cells(self) -> int:
+        return self.grid_shape[0] * self.grid_shape[1]
+
+
+def observation_shapes(config: EnvConfig) -> dict[str, tuple[tuple[int, ...], type]]:
+    return {
+        "points": ((config.max_points, len(POINT_FEATURES)), np.float32),
+        "adjacency": ((config.max_points, config.max_points), np.uint8),
+        "budget": ((2,), np.float32),  # Cost / budget, steps used / max_steps
+    }
+
+
+def allocate_observations(config: EnvConfig, batch: int | None = None) -> dict[str, np.ndarray]:
+    """Zeroed observation arrays, with a leading batch axis when batch is given."""
+    lead = () if batch is None else (batch,)
+    return {name: np.zeros(lead + shape, dtype=dtype) for name, (shape, dtype) in observation_shapes(config).items()}
+
+
+def level_bounds(level: Level) -> tuple[float, float, float, float]:
+    """(left, top, right, bottom) area in which joints may be placed: above the banks, up to two members high."""
+    xs = [x for bank in level.banks for x in (bank.x1, bank.x2)] or [a.x for a in level.anchors]
+    ys = [y for bank in level.banks for y in (bank.y1, bank.y2)] or [a.y for a in level.anchors]
+    return min(xs), min(ys) - 2 * MAX_EDGE_LENGTH, max(xs), max(ys)
+
+
+class BridgeEnv:
+    """
+    Gym-style bridge building environment, headless (no pygame).
+
+    Follows the gymnasium conventions without depending on it: reset() returns
+    (observation, info) and step(action) returns (observation, reward,
+    terminated, truncated, info). Points live in fixed slots, level anchors
+    first, so observations keep the same shape whatever the design:
+
+        points     float32 (max_points, 4)  x, y normalised to the level bounds, present, fixed
+        adjacency  uint8 (max_points, max_points)
+        budget     float32 (2,)  cost / budget, steps used / max_steps
+
+    Edits follow the editor rules (MAX_EDGE_LENGTH, budget); an edit that
+    cannot be applied leaves the design unchanged and costs invalid_penalty.
+    TEST scores the design with sim.batch.evaluate_design and ends the episode.
+    With several levels, reset() picks one at random.
+
+    `buffers` lets VectorBridgeEnv hand each environment rows of its batched
+    arrays; observations are then updated in place instead of rebuilt.
+    """
+
+    def __init__(
+        self,
+        levels: Level | Sequence[Level],
+        config: EnvConfig = EnvConfig(),
+        seed: int | None = None,
+        buffers: dict[str, np.ndarray] | None = None,
+    ) -> None:
+        self.levels = [levels] if isinstance(levels, Level) else list(levels)
+        if not self.levels:
+            raise ValueError("BridgeEnv needs at least one level")
+        for level in self.levels:
+            if len(level.anchors) > config.max_anchors:
+                raise ValueError(f"Level {level.name!r} has {len(level.anchors)} anchors, config allows {config.max_anchors}")
+        self.config = config
+        self.rng = random.Random(seed)
+        self._obs = buffers if buffers is not None else allocate_observations(config)
+        self.level = self.levels[0]
+        self.design = BridgeDesign(edges=[], joints={})
+        self.steps = 0
+        self._slots: list[str | None] = []
+        self._slot_of: dict[str, int] = {}
+        self._bounds = (0.0, 0.0, 1.0, 1.0)
+        self._done = True
+
+    @property
+    def observation(self) -> dict[str, np.ndarray]:
+        """Current observation arrays (live: updated by the next step)."""
+        return self._obs
+
+    def reset(self, seed: int | None = None) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+        info = self._reset(seed)
+        return self._observe(), info
+
+    def step(self, action: Sequence[int] | np.ndarray) -> tuple[dict[str, np.ndarray], float, bool, bool, dict[str, Any]]:
+        reward, terminated, truncated, info = self._step(action)
+        return self._observe(), reward, terminated, truncated, info
+
+    def _observe(self) -> dict[str, np.ndarray]:
+        return {name: obs.copy() for name, obs in self._obs.items()}
+
+    # Both return everything but the observation, which stays in the buffers
+    def _reset(self, seed: int | None = None) -> dict[str, Any]:
+        if seed is not None:
+            self.rng.seed(seed)
+        self.level = self.levels[0] if len(self.levels) == 1 else self.rng.choice(self.levels)
+        anchors = {a.anchor_id: (a.x, a.y) for a in self.level.anchors}
+        self.design = BridgeDesign(edges=[], joints={})
+        self.design.set_fixed_points(anchors)
+        self.steps = 0
+        self._done = False
+        self._bounds = level_bounds(self.level)
+
+        config = self.config
+        self._slots = [None] * config.max_points
+        self._slot_of = {}
+        for obs in self._obs.values():
+            obs.fill(0)
+        for slot, (a_id, pos) in enumerate(anchors.items()):
+            self._slots[slot] = a_id
+            self._slot_of[a_id] = slot
+            self._write_point(slot, pos, fixed=True)
+        self._write_budget()
+        return {"level": self.level.name}
+
+    def _step(self, action: Sequence[int] | np.ndarray) -> tuple[float, bool, bool, dict[str, Any]]:
+        if self._done:
+            raise RuntimeError("Episode is over: call reset() first")
+        op, a, b = (int(v) for v in action)
+        self.steps += 1
+        reward = 0.0
+        terminated = False
+        info: dict[str, Any] = {}
+
+        if op == TEST:
+            result = evaluate_design(self.level, self.design, self.config.evaluation)
+            reward = self._test_reward(result)
+            terminated = True
+            info["result"] = result
+        else:
+            applied = self._apply(op, a, b)
+            if not applied:
+                reward = self.config.invalid_penalty
+            info["applied"] = applied
+
+        truncated = not terminated and self.steps >= self.config.max_steps
+        self._done = terminated or truncated
+        self._write_budget()
+        return reward, terminated, truncated, info
+
+    def _test_reward(self, result: EvaluationResult) -> float:
+        config = self.config
+        if result.survived:
+            budget = self.level.budget
+            savings = 1.0 - self.design.total_cost() / budget if budget > 0 else 0.0
+            return config.pass_reward + config.savings_weight * savings
+        if result.failure == "goal missed":
+            return config.miss_reward
+        return config.fail_reward
+
+    # Edits --------------------------------------------------------------
+
+    def _apply(self, op: int, a: int, b: int) -> bool:
+        if op == ADD_JOINT:
+            return self._add_joint(a, b)
+        if op == ADD_EDGE:
+            return self._add_edge(self._point(a), self._point(b))
+        if op == REMOVE_EDGE:
+            return self._remove_edge(self._point(a), self._point(b))
+        if op == REMOVE_JOINT:
+            return self._remove_joint(a)
+        return False
+
+    def _point(self, slot: int) -> str | None:
+        return self._slots[slot] if 0 <= slot < len(self._slots) else None
+
+    def cell_position(self, cell: int) -> tuple[float, float]:
+        """Level coordinates of a placement grid cell (row-major, cell centres)."""
+        columns, rows = self.config.grid_shape
+        left, top, right, bottom = self._bounds
+        row, column = divmod(cell, columns)
+        return (
+            left + (column + 0.5) * (right - left) / columns,
+            top + (row + 0.5) * (bottom - top) / rows,
+        )
+
+    def _member_cost(self, a_id: str, b_id: str) -> int | None:
+        """Cost of a new member between two points, or None if the build rules forbid it."""
+        start = self.design.point_position(a_id)
+        end = self.design.point_position(b_id)
+        if start is None or end is None:
+            return None
+        length = edge_length(start, end)
+        if length > MAX_EDGE_LENGTH or length < 1.0:
+            return None
+        cost = calculate_cost(length, COST_PER_UNIT)
+        if self.design.total_cost() + cost > self.level.budget:
+            return None
+        return cost
+
+    def _add_joint(self, cell: int, origin_slot: int) -> bool:
+        origin = self._point(origin_slot)
+        if origin is None or not 0 <= cell < self.config.grid_cells:
+            return False
+        free = next((s for s in range(self.config.max_anchors, self.config.max_points) if self._slots[s] is None), None)
+        pos = self.cell_position(cell)
+        if free is None or self.design.find_point_at(pos, 1.0) is not None:
+            return False
+        origin_pos = self.design.point_position(origin)
+        assert origin_pos is not None
+        length = edge_length(origin_pos, pos)
+        cost = calculate_cost(length, COST_PER_UNIT)
+        if length > MAX_EDGE_LENGTH or self.design.total_cost() + cost > self.level.budget:
+            return False
+        j_id = self.design.add_joint(*pos)
+        self.design.add_edge(origin, j_id, material="wood", cost=cost)
+        self._slots[free] = j_id
+        self._slot_of[j_id] = free
+        self._write_point(free, pos, fixed=False)
+        self._set_adjacency(free, origin_slot, 1)
+        return True
+
+    def _add_edge(self, a_id: str | None, b_id: str | None) -> bool:
+        if a_id is None or b_id is None or a_id == b_id or self.design.has_edge(a_id, b_id):
+            return False
+        cost = self._member_cost(a_id, b_id)
+        if cost is None:
+            return False
+        self.design.add_edge(a_id, b_id, material="wood", cost=cost)
+        self._set_adjacency(self._slot_of[a_id], self._slot_of[b_id], 1)
+        return True
+
+    def _remove_edge(self, a_id: str | None, b_id: str | None) -> bool:
+        edge = self.design.find_edge(a_id, b_id) if a_id is not None and b_id is not None else None
+        if edge is None:
+            return False
+        self.design.remove_edge(edge.edge_id)
+        self._set_adjacency(self._slot_of[a_id], self._slot_of[b_id], 0)
+        return True
+
+    def _remove_joint(self, slot: int) -> bool:
+        j_id = self._point(slot)
+        if j_id is None or j_id not in self.design.joints:
+            return False  # Empty slot or anchor
+        self.design.remove_joint(j_id)
+        self._slots[slot] = None
+        del self._slot_of[j_id]
+        self._obs["points"][slot] = 0.0
+        self._obs["adjacency"][slot, :] = 0
+        self._obs["adjacency"][:, slot] = 0
+        return True
+
+    # Observation updates ------------------------------------------------
+
+    def _write_point(self, slot: int, pos: tuple[float, float], fixed: bool) -> None:
+        left, top, right, bottom = self._bounds
+        self._obs["points"][slot] = (
+            (pos[0] - left) / ((right - left) or 1.0),
+            (pos[1] - top) / ((bottom - top) or 1.0),
+            1.0,
+            1.0 if fixed else 0.0,
+        )
+
+    def _set_adjacency(self, a: int, b: int, value: int) -> None:
+        adjacency = self._obs["adjacency"]
+        adjacency[a, b] = value
+        adjacency[b, a] = value
+
+    def _write_budget(self) -> None:
+        budget = self.level.budget
+        self._obs["budget"][0] = self.design.total_cost() / budget if budget > 0 else 0.0
+        self._obs["budget"][1] = self.steps / self.config.max_steps
+
+
+class VectorBridgeEnv:
+    """
+    N BridgeEnv instances stepped together in one process.
+
+    Observations are batched arrays with a leading (num_envs,) axis; each
+    environment writes straight into its row. Finished environments reset
+    automatically: the returned row is already the new episode, and the
+    infos entry keeps "final_observation" and "final_info" of the episode
+    that ended. With copy=False the returned arrays are the internal buffers
+    and are overwritten by the next step.
+    """
+
+    def __init__(
+        self,
+        levels: Level | Sequence[Level],
+        num_envs: int,
+        config: EnvConfig = EnvConfig(),
+        seed: int | None = None,
+        copy: bool = True,
+    ) -> None:
+        self.num_envs = num_envs
+        self.config = config
+        self.copy = copy
+        self.buffers = allocate_observations(config, batch=num_envs)
+        seeds = random.Random(seed).sample(range(2**31), num_envs)
+        self.envs = [
+            BridgeEnv(levels, config, seed=seeds[i], buffers={name: obs[i] for name, obs in self.buffers.items()})
+            for i in range(num_envs)
+        ]
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._terminated = np.zeros(num_envs, dtype=bool)
+        self._truncated = np.zeros(num_envs, dtype=bool)
+
+    def _observe(self) -> dict[str, np.ndarray]:
+        if self.copy:
+            return {name: obs.copy() for name, obs in self.buffers.items()}
+        return self.buffers
+
+    def reset(self, seed: int | None = None) -> tuple[dict[str, np.ndarray], list[dict[str, Any]]]:
+        infos = []
+        for i, env in enumerate(self.envs):
+            # Keep per-environment streams distinct when reseeding
+            infos.append(env._reset(seed=None if seed is None else seed + i))
+        return self._observe(), infos
+
+    def step(
+        self, actions: np.ndarray | Sequence[Sequence[int]]
+    ) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, list[dict[str, Any]]]:
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 3).tolist()
+        infos: list[dict[str, Any]] = []
+        for i, env in enumerate(self.envs):
+            reward, terminated, truncated, info = env._step(actions[i])
+            self._rewards[i] = reward
+            self._terminated[i] = terminated
+            self._truncated[i] = truncated
+            if terminated or truncated:
+                final = {name: obs[i].copy() for name, obs in self.buffers.items()}
+                info = {**env._reset(), "final_observation": final, "final_info": info}
+            infos.append(info)
+        return self._observe(), self._rewards.copy(), self._terminated.copy(), self._truncated.copy(), infos
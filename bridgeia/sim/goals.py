@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Collection
+
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import Level
+
+
+def goal_side_x(level: Level) -> float:
+    """Left edge of the bank the goal sits on; points at or beyond it are across the gap."""
+    for bank in level.banks:
+        if min(bank.x1, bank.x2) <= level.goal.x <= max(bank.x1, bank.x2):
+            return min(bank.x1, bank.x2)
+    return level.goal.x
+
+
+def start_anchors(level: Level) -> list[str]:
+    limit = goal_side_x(level)
+    return [a.anchor_id for a in level.anchors if a.x < limit]
+
+
+def reached_x(level: Level, bridge: BridgeDesign, broken_edges: Collection[int] = ()) -> float:
+    """
+    Furthest x reachable from the start-side anchors through intact edges,
+    using design positions.
+    """
+    positions = {a.anchor_id: a.x for a in level.anchors}
+    positions.update((j_id, pos[0]) for j_id, pos in bridge.joints.items())
+    starts = start_anchors(level)
+    best = max((positions[a_id] for a_id in starts), default=0.0)
+
+    seen = set(starts)
+    queue = deque(starts)
+    while queue:
+        point_id = queue.popleft()
+        for edge in bridge.edges_of(point_id):
+            if edge.edge_id in broken_edges:
+                continue
+            other = edge.b if edge.a == point_id else edge.a
+            if other not in seen and other in positions:
+                seen.add(other)
+                best = max(best, positions[other])
+                queue.append(other)
+    return best
+
+
+def spans_gap(level: Level, bridge: BridgeDesign, broken_edges: Collection[int] = ()) -> bool:
+    return reached_x(level, bridge, broken_edges) >= goal_side_x(level)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from bridgeia.core.bridge import BridgeDesign, Edge
+
+# Bumped whenever the on-disk layout changes
+TRAJECTORY_FORMAT_VERSION = 1
+
+
+@dataclass
+class Trajectory:
+    """
+    Recorded run in struct-of-arrays form: one float32 position pair per joint
+    and one float32 stress per edge for every fixed step. Frame 0 is the first
+    kept step, which is only the rest pose if a ring recorder never wrapped.
+    Stresses of broken members are NaN.
+    """
+
+    joint_ids: list[str]
+    edge_ids: np.ndarray  # int32, (edges,)
+    edge_endpoints: list[tuple[str, str]]  # (a, b) per edge, for drawing without the design
+    edge_materials: list[str]
+    dt: float
+    positions: np.ndarray  # float32, (frames, joints, 2)
+    stresses: np.ndarray  # float32, (frames, edges)
+    rest_positions: np.ndarray  # float32, (joints, 2): the design the run started from
+    level: dict[str, Any]  # Level.to_dict() of the run
+
+    @property
+    def frame_count(self) -> int:
+        return int(self.positions.shape[0])
+
+    @property
+    def duration(self) -> float:
+        return max(0, self.frame_count - 1) * self.dt
+
+    def design(self) -> BridgeDesign:
+        """Design at the recorded rest pose, enough to draw the replay."""
+        joints = {j_id: (x, y) for j_id, (x, y) in zip(self.joint_ids, self.rest_positions.tolist())}
+        edges = [
+            Edge(edge_id=edge_id, a=a, b=b, material=material, cost=0)
+            for edge_id, (a, b), material in zip(self.edge_ids.tolist(), self.edge_endpoints, self.edge_materials)
+        ]
+        return BridgeDesign(edges=edges, joints=joints)
+
+    @staticmethod
+    def bytes_per_frame(joint_count: int, edge_count: int) -> int:
+        return (joint_count * 2 + edge_count) * np.dtype(np.float32).itemsize
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                version=np.array(TRAJECTORY_FORMAT_VERSION, dtype=np.int32),
+                joint_ids=np.array(self.joint_ids, dtype=np.str_),
+                edge_ids=self.edge_ids.astype(np.int32),
+                edge_endpoints=np.array(self.edge_endpoints, dtype=np.str_).reshape(-1, 2),
+                edge_materials=np.array(self.edge_materials, dtype=np.str_),
+                dt=np.array(self.dt, dtype=np.float64),
+                positions=self.positions.astype(np.float32),
+                stresses=self.stresses.astype(np.float32),
+                rest_positions=self.rest_positions.astype(np.float32).reshape(-1, 2),
+                level=np.array(json.dumps(self.level)),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "Trajectory":
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != TRAJECTORY_FORMAT_VERSION:
+                raise ValueError(f"Unsupported trajectory format version {version} in {path}")
+            return cls(
+                joint_ids=[str(j_id) for j_id in data["joint_ids"]],
+                edge_ids=data["edge_ids"],
+                edge_endpoints=[(str(a), str(b)) for a, b in data["edge_endpoints"]],
+                edge_materials=[str(material) for material in data["edge_materials"]],
+                dt=float(data["dt"]),
+                positions=data["positions"],
+                stresses=data["stresses"],
+                rest_positions=data["rest_positions"],
+                level=json.loads(str(data["level"])),
+            )
+
+
+class TrajectoryRecorder:
+    """
+    Writes frames into preallocated arrays. With ring=True the recorder keeps the
+    last `capacity` frames and overwrites the oldest; otherwise it stops
+    recording once full. Memory is capacity * Trajectory.bytes_per_frame.
+    The first frame is also kept apart as the rest pose, which a ring overwrites.
+    """
+
+    def __init__(
+        self,
+        joint_ids: Sequence[str],
+        edge_ids: Sequence[int],
+        edge_endpoints: Sequence[tuple[str, str]],
+        edge_materials: Sequence[str],
+        capacity: int,
+        dt: float,
+        level: dict[str, Any],
+        ring: bool = False,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1 frame")
+        self.joint_ids = list(joint_ids)
+        self.edge_ids = np.asarray(edge_ids, dtype=np.int32)
+        self.edge_endpoints = list(edge_endpoints)
+        self.edge_materials = list(edge_materials)
+        self.level = level
+        self.capacity = capacity
+        self.dt = dt
+        self.ring = ring
+        self.positions = np.zeros((capacity, len(self.joint_ids), 2), dtype=np.float32)
+        self.stresses = np.zeros((capacity, len(self.edge_ids)), dtype=np.float32)
+        self.rest_positions = np.zeros((len(self.joint_ids), 2), dtype=np.float32)
+        self.frames_written = 0
+
+    @property
+    def full(self) -> bool:
+        return not self.ring and self.frames_written >= self.capacity
+
+    def record(self, positions: Sequence[Sequence[float]] | np.ndarray, stresses: Sequence[float] | np.ndarray) -> None:
+        if self.full:
+            return
+        if self.frames_written == 0:
+            self.rest_positions[:] = positions
+        slot = self.frames_written % self.capacity
+        self.positions[slot] = positions
+        self.stresses[slot] = stresses
+        self.frames_written += 1
+
+    def trajectory(self) -> Trajectory:
+        """Recorded frames in chronological order (copies, the recorder keeps going)."""
+        count = min(self.frames_written, self.capacity)
+        if self.frames_written > self.capacity:
+            start = self.frames_written % self.capacity
+            order = np.r_[start:self.capacity, 0:start]
+        else:
+            order = np.arange(count)
+        return Trajectory(
+            joint_ids=list(self.joint_ids),
+            edge_ids=self.edge_ids.copy(),
+            edge_endpoints=list(self.edge_endpoints),
+            edge_materials=list(self.edge_materials),
+            dt=self.dt,
+            positions=self.positions[order],
+            stresses=self.stresses[order],
+            rest_positions=self.rest_positions.copy(),
+            level=self.level,
+        )
+
+
+class TrajectoryPlayer:
+    """
+    Plays a Trajectory back through the same interface LevelRenderer reads from
+    PhysicsSimulation (joint_position_array / edge_stress_array), without pymunk.
+    """
+
+    def __init__(self, trajectory: Trajectory) -> None:
+        self.trajectory = trajectory
+        self.frame = 0
+        self.playing = True
+        self._elapsed = 0.0
+        self.joint_ids = list(trajectory.joint_ids)
+        self._joint_index = {j_id: i for i, j_id in enumerate(self.joint_ids)}
+        self._edge_ids = trajectory.edge_ids.tolist()
+
+    @property
+    def frame_count(self) -> int:
+        return self.trajectory.frame_count
+
+    @property
+    def time(self) -> float:
+        return self.frame * self.trajectory.dt
+
+    def seek(self, frame: int) -> None:
+        self.frame = max(0, min(self.frame_count - 1, frame))
+        self._elapsed = 0.0
+
+    def seek_time(self, seconds: float) -> None:
+        self.seek(int(round(seconds / self.trajectory.dt)))
+
+    def scrub(self, frames: int) -> None:
+        self.seek(self.frame + frames)
+
+    def advance(self, frame_dt: float) -> None:
+        """Real-time playback: move forward by as many recorded steps as frame_dt covers."""
+        if not self.playing:
+            return
+        self._elapsed += frame_dt
+        steps = int(self._elapsed // self.trajectory.dt)
+        if steps:
+            self._elapsed -= steps * self.trajectory.dt
+            self.frame = min(self.frame_count - 1, self.frame + steps)
+
+    def get_joint_position(self, joint_id: str) -> tuple[float, float] | None:
+        index = self._joint_index.get(joint_id)
+        if index is None or self.frame_count == 0:
+            return None
+        x, y = self.trajectory.positions[self.frame, index]
+        return float(x), float(y)
+
+    def joint_position_array(self) -> np.ndarray:
+        if self.frame_count == 0:
+            return np.full((len(self.joint_ids), 2), np.nan, dtype=np.float32)
+        return self.trajectory.positions[self.frame]
+
+    def edge_stress_array(self) -> tuple[Sequence[int], np.ndarray]:
+        if self.frame_count == 0:
+            return [], np.zeros(0, dtype=np.float32)
+        return self._edge_ids, self.trajectory.stresses[self.frame]
+
+    def get_edge_stresses(self) -> dict[int, float]:
+        edge_ids, stresses = self.edge_stress_array()
+        # Members that had broken by this frame were recorded as NaN
+        return {e_id: stress for e_id, stress in zip(edge_ids, stresses.tolist()) if stress == stress}
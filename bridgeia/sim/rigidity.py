@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable
+
+from bridgeia.core.arrays import ArrayBridge
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import Level
+
+
+@dataclass(frozen=True)
+class RigidityReport:
+    """
+    Generic (combinatorial) rigidity of a design pinned to the level anchors.
+    Positions only matter through the graph: collinear members still count as
+    bracing, so a rigid report is necessary for a standing bridge, not sufficient.
+    """
+
+    rigid: bool
+    degrees_of_freedom: int  # Independent joint motions the members leave free; 0 when rigid
+    loose: tuple[str, ...]  # Joints not held rigidly by the anchors, in design order
+    floating: tuple[tuple[str, ...], ...]  # Groups of joints no member path links to an anchor
+    dangling: tuple[str, ...]  # Joints with fewer than two members
+    redundant_edges: tuple[int, ...]  # Members the structure would be exactly as rigid without
+
+
+class _PebbleGame:
+    """
+    (2, 3) pebble game (Jacobs & Hendrickson): every point holds two pebbles,
+    an edge is independent if four pebbles can be gathered on its endpoints,
+    and accepting it spends one pebble, oriented away from the point that paid.
+    Each point has at most two out-edges, so searches stay short.
+
+    A failed gather proves the points it searched rigid (they span exactly
+    2n - 3 edges); they are labelled as one region so later edges inside it
+    are rejected without searching it again. Regions sharing two points are
+    one rigid body and merge (union-find on labels), and a point joined to
+    two points of a region by independent edges joins it (Henneberg step).
+    """
+
+    def __init__(self, point_count: int) -> None:
+        self.pebbles = [2] * point_count
+        self.out: list[list[int]] = [[] for _ in range(point_count)]
+        self.accepted: list[list[int]] = [[] for _ in range(point_count)]
+        self._seen = [0] * point_count
+        self._stamp = 0
+        self._region = [0] * point_count  # Last rigid region found around each point, 0 for none
+        self._merged = [0]  # Union-find over region labels
+        # Search tree (point -> parent) of the last _find_pebble call
+        self.last_search: dict[int, int] = {}
+
+    def add_edge(self, a: int, b: int) -> bool:
+        if a == b:
+            return False
+        region = self._region_of(a)
+        if region and region == self._region_of(b):
+            return False
+        accepted = self.accepted
+        if a in accepted[b]:
+            return False  # Same pair as an accepted edge
+        if len(accepted[b]) < 2:
+            # Raising a point to degree two never creates a dependency; b still holds
+            # a free pebble (pebbles + out-edges is always 2), so no search is needed
+            a, b = b, a
+        elif len(accepted[a]) >= 2 and not self._gather(a, b, 4):
+            return False
+        # Orient the edge away from whichever endpoint pays for it
+        self.pebbles[a] -= 1
+        self.out[a].append(b)
+        self.accepted[a].append(b)
+        self.accepted[b].append(a)
+        self._extend_region(a, b)
+        self._extend_region(b, a)
+        return True
+
+    def _region_of(self, point: int) -> int:
+        label = self._region[point]
+        merged = self._merged
+        while merged[label] != label:
+            merged[label] = merged[merged[label]]
+            label = merged[label]
+        return label
+
+    def _new_region(self, points: list[int]) -> None:
+        label = len(self._merged)
+        self._merged.append(label)
+        points = list(dict.fromkeys(points))
+        seen: set[int] = set()
+        for point in points:
+            previous = self._region_of(point)
+            if previous and previous in seen:
+                self._merged[previous] = label
+            seen.add(previous)
+        for point in points:
+            self._region[point] = label
+
+    def _extend_region(self, point: int, other: int) -> None:
+        label = self._region_of(other)
+        if label and self._region_of(point) != label:
+            for neighbour in self.accepted[point]:
+                if neighbour != other and self._region_of(neighbour) == label:
+                    self._region[point] = label
+                    return
+
+    def _gather(self, a: int, b: int, target: int) -> bool:
+        pebbles = self.pebbles
+        searched = [a, b]
+        while pebbles[a] < 2:
+            if not self._find_pebble(a, (a, b)):
+                searched.extend(self.last_search)
+                break
+        while pebbles[b] < 2 and pebbles[a] + pebbles[b] < target:
+            if not self._find_pebble(b, (a, b)):
+                searched.extend(self.last_search)
+                break
+        if pebbles[a] + pebbles[b] >= target:
+            return True
+        if target == 4:
+            self._new_region(searched)
+        return False
+
+    def _find_pebble(self, root: int, held: tuple[int, int]) -> bool:
+        """Move a free pebble to root along reversed out-edges, never taking one from `held`."""
+        self._stamp += 1
+        stamp = self._stamp
+        seen = self._seen
+        for point in held:
+            seen[point] = stamp
+        seen[root] = stamp
+        parent = self.last_search = {root: -1}
+        stack = [root]
+        pebbles = self.pebbles
+        out = self.out
+        while stack:
+            point = stack.pop()
+            for head in out[point]:
+                if seen[head] == stamp:
+                    continue
+                seen[head] = stamp
+                parent[head] = point
+                if pebbles[head]:
+                    # Reverse the path root -> ... -> head: head pays, root gains
+                    pebbles[head] -= 1
+                    pebbles[root] += 1
+                    while head != root:
+                        tail = parent[head]
+                        out[tail].remove(head)
+                        out[head].append(tail)
+                        head = tail
+                    return True
+                stack.append(head)
+        return False
+
+    def rigid_with(self, a: int, b: int) -> list[bool]:
+        """Points rigidly connected to the independent edge (a, b)."""
+        self._gather(a, b, 3)
+        # With three pebbles held on a and b, a point is loose exactly when a
+        # directed path leads it to a free pebble elsewhere: flood backwards from those
+        into: list[list[int]] = [[] for _ in self.pebbles]
+        for tail, heads in enumerate(self.out):
+            for head in heads:
+                into[head].append(tail)
+        rigid = [True] * len(self.pebbles)
+        queue = deque(point for point, count in enumerate(self.pebbles) if count and point != a and point != b)
+        for point in queue:
+            rigid[point] = False
+        while queue:
+            point = queue.popleft()
+            for tail in into[point]:
+                if rigid[tail] and tail != a and tail != b:
+                    rigid[tail] = False
+                    queue.append(tail)
+        return rigid
+
+
+def analyse_rigidity(level: Level, bridge: BridgeDesign) -> RigidityReport:
+    """
+    Pebble-game rigidity of the bridge with every level anchor pinned (the
+    simulation makes all anchors static), in near-linear time.
+    """
+    anchors = {a.anchor_id: (a.x, a.y) for a in level.anchors}
+    return analyse_rigidity_arrays(ArrayBridge.from_design(bridge, anchors))
+
+
+def analyse_rigidity_arrays(arrays: ArrayBridge) -> RigidityReport:
+    """analyse_rigidity on a packed design, whose fixed points are pinned."""
+    fixed = arrays.fixed_count
+    game = _PebbleGame(arrays.point_count)
+    # The anchors are one rigid ground body: brace them with a fan of 2k - 3 edges
+    if fixed >= 2:
+        game.add_edge(0, 1)
+        for anchor in range(2, fixed):
+            game.add_edge(anchor, 0)
+            game.add_edge(anchor, 1)
+
+    edge_ids = arrays.edge_ids.tolist()
+    endpoints = arrays.endpoints.tolist()
+    redundant = []
+    independent = 0
+    neighbours: list[set[int]] = [set() for _ in range(arrays.point_count)]
+    for edge_id, (a, b) in zip(edge_ids, endpoints):
+        neighbours[a].add(b)
+        neighbours[b].add(a)
+        if a < fixed and b < fixed:
+            redundant.append(edge_id)  # Anchors are already held
+        elif game.add_edge(a, b):
+            independent += 1
+        else:
+            redundant.append(edge_id)
+
+    joints = range(fixed, arrays.point_count)
+    degrees_of_freedom = 2 * arrays.joint_count - independent
+    if degrees_of_freedom == 0:
+        loose_points: list[int] = []
+    elif fixed >= 2:
+        held = game.rigid_with(0, 1)
+        loose_points = [point for point in joints if not held[point]]
+    else:
+        # Pinned at one point or none: everything can still turn or fall
+        loose_points = list(joints)
+
+    point_ids = arrays.point_ids
+    reached = [False] * arrays.point_count
+    _flood(range(fixed), neighbours, reached)
+    floating = [
+        tuple(point_ids[point] for point in sorted(_flood([joint], neighbours, reached)))
+        for joint in joints
+        if not reached[joint]
+    ]
+
+    return RigidityReport(
+        rigid=degrees_of_freedom == 0,
+        degrees_of_freedom=degrees_of_freedom,
+        loose=tuple(point_ids[point] for point in loose_points),
+        floating=tuple(floating),
+        dangling=tuple(point_ids[point] for point in joints if len(neighbours[point]) < 2),
+        redundant_edges=tuple(redundant),
+    )
+
+
+def _flood(starts: Iterable[int], neighbours: list[set[int]], reached: list[bool]) -> list[int]:
+    """Points connected to starts that were not reached yet; marks them reached."""
+    queue = deque(point for point in starts if not reached[point])
+    for point in queue:
+        reached[point] = True
+    found = []
+    while queue:
+        point = queue.popleft()
+        found.append(point)
+        for other in neighbours[point]:
+            if not reached[other]:
+                reached[other] = True
+                queue.append(other)
+    return found
@@ -1,21 +1,155 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Sequence
+
+import numpy as np
 import pymunk
+import pymunk.batch
 
 from bridgeia.core.bridge import BridgeDesign
 from bridgeia.core.level import Level
+from bridgeia.core.materials import get_material
+from bridgeia.core.profiler import FrameProfiler
+from bridgeia.sim.clock import FixedStepClock
+from bridgeia.sim.constants import GRAVITY, JOINT_MASS, JOINT_RADIUS
+from bridgeia.sim.recording import TrajectoryRecorder
+
+FIXED_DT = 1.0 / 60.0
+SUBSTEPS = 5
+SOLVER_ITERATIONS = 10  # pymunk's default
+
+try:  # Reading impulses through pymunk's cffi binding skips the property overhead (~3x faster)
+    from pymunk._chipmunk_cffi import ffi as _ffi, lib as _chipmunk
+except ImportError:  # pragma: no cover - depends on the pymunk build
+    _ffi = _chipmunk = None
+
+
+@dataclass(frozen=True)
+class PhysicsProfile:
+    """Solver settings for one speed / accuracy trade-off; see PROFILES."""
+
+    name: str
+    substeps: int  # Space steps per fixed step
+    iterations: int  # Solver iterations per space step
+    damping: float = 0.9  # Fraction of its velocity a body keeps after one second
+    # Joints, banks and anchors share filter group 1, so joint circles never collide:
+    # without them the broadphase has no dynamic shapes to reindex. Chipmunk crashes
+    # freeing shapeless bodies that fell asleep: leave pymunk sleeping off
+    joint_shapes: bool = False
+    # Check members after every substep, or only at the end of each fixed step
+    stress_every_substep: bool = True
+
+
+# Measured with python -m bridgeia.tools.bench_profiles (see that module)
+PROFILES = {
+    # Interactive play and its replays
+    "preview": PhysicsProfile("preview", SUBSTEPS, SOLVER_ITERATIONS),
+    # Reference the others are measured against: the world as it used to be built, converged solver
+    "accurate": PhysicsProfile("accurate", 20, 30, joint_shapes=True),
+    # Optimizer, evaluation service and RL environments: checking stresses only once
+    # per fixed step is faster still but lets short spikes through and changes verdicts
+    "batch": PhysicsProfile("batch", 3, 10),
+}
+
+
+def get_profile(profile: str | PhysicsProfile) -> PhysicsProfile:
+    if isinstance(profile, PhysicsProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"unknown physics profile {profile!r} (expected one of {', '.join(PROFILES)})") from None
+
+
+def _rest_pin(pin: pymunk.PinJoint) -> pymunk.PinJoint:
+    """The pin as if just created, without the impulse it accumulated; pin must be out of the space."""
+    if _chipmunk is None:  # pragma: no cover - depends on the pymunk build
+        return pymunk.PinJoint(pin.a, pin.b)
+    # Re-initialising the struct recomputes the rest length from the bodies (back at
+    # their design positions) and zeroes the impulse; it also clears pymunk's handle
+    _chipmunk.cpPinJointInit(
+        _ffi.cast("cpPinJoint *", pin._constraint), pin.a._body, pin.b._body, (0.0, 0.0), (0.0, 0.0)
+    )
+    _chipmunk.cpConstraintSetUserData(pin._constraint, pin._data_handle)
+    return pin
+
+
+@dataclass(frozen=True)
+class MemberFailure:
+    edge_id: int
+    time: float  # Simulated seconds at the end of the substep that broke it
+    stress: float  # Normalised stress at that substep (> 1.0)
 
 
 class PhysicsSimulation:
-    def __init__(self, level: Level, bridge: BridgeDesign) -> None:
+    def __init__(
+        self,
+        level: Level,
+        bridge: BridgeDesign,
+        fixed_dt: float = FIXED_DT,
+        substeps: int | None = None,
+        iterations: int | None = None,
+        interpolate: bool = False,
+        break_members: bool = True,
+        profile: str | PhysicsProfile = "preview",
+    ) -> None:
+        # substeps / iterations, when given, override the profile's
+        self.profile = get_profile(profile)
         self.space = pymunk.Space()
-        self.space.gravity = (0, 900)  # Gravity downwards
+        self.space.gravity = (0, GRAVITY)  # Gravity downwards
+        self.space.iterations = iterations or self.profile.iterations
+        self.space.damping = self.profile.damping
         self.bodies: dict[str, pymunk.Body] = {}
         self.edge_constraints: dict[int, pymunk.PinJoint] = {}
 
+        # Fixed-timestep mode: advance() feeds frame time to the clock, which
+        # releases whole steps of fixed_dt, each split into `substeps` space steps.
+        self.substeps = substeps or self.profile.substeps
+        self.clock = FixedStepClock(step=fixed_dt)
+        self.time = 0.0
+        self.step_count = 0
+        self.interpolate = interpolate
+        self.level = level
+        # Joint positions before the last fixed step, following joint_ids
+        self._previous_positions: np.ndarray | None = None
+        self.recorder: TrajectoryRecorder | None = None
+        # Times each space step as "physics.substep" while enabled
+        self.profiler = FrameProfiler()
+        self.joint_ids: list[str] = []
+        self._joint_rows: dict[str, int] = {}
+        # Batch readback of body positions: space body ID -> row in joint_ids (-1: not a joint)
+        self._batch_buffer = pymunk.batch.Buffer()
+        self._batch_rows = np.zeros(0, dtype=np.intp)
+        # Currently loaded design, so reset() can apply only the differences
+        self._joint_positions: dict[str, tuple[float, float]] = {}
+        self._joint_shapes: dict[str, pymunk.Shape] = {}
+        self._edge_endpoints: dict[int, tuple[str, str]] = {}
+
+        # Member stresses, refreshed after every substep (or fixed step, per the profile):
+        # |force| / material max_force, NaN for broken members. Arrays follow
+        # edge_order, fixed between resets.
+        self.break_members = break_members
+        self.failures: list[MemberFailure] = []
+        self.edge_order: list[int] = []
+        self._order_endpoints: list[tuple[str, str]] = []
+        self._order_materials: list[str] = []
+        self.stresses = np.zeros(0)
+        self._broken = np.zeros(0, dtype=bool)
+        self._inv_max_force = np.zeros(0)
+        self._stress_scale = np.zeros(0)
+        self._scale_dt = 0.0
+        self._impulse_handles: list[object] = []
+        self._read_impulse = attrgetter("impulse")
+
         self._build_world(level, bridge)
 
     def _build_world(self, level: Level, bridge: BridgeDesign) -> None:
+        self._build_terrain(level)
+        self._sync_design(bridge)
+
+    def _build_terrain(self, level: Level) -> None:
         # 1. Create Static Terrain (Banks)
         for bank in level.banks:
             segment = pymunk.Segment(
@@ -40,63 +174,289 @@ class PhysicsSimulation:
             self.space.add(body, shape)
             self.bodies[anchor.anchor_id] = body
 
+    def reset(self, bridge: BridgeDesign) -> tuple[int, int]:
+        """
+        Put the world back at rest for `bridge`, reusing the terrain, anchors and
+        every joint body / edge constraint the previous design shared with it.
+        Only added, removed or moved joints and edges create pymunk objects; the
+        rest get their state reset. Returns how many joints and edges were
+        added or removed.
+
+        Runs are bit-identical to a freshly built simulation: reused constraints
+        lose their accumulated impulses and go back into the space in design
+        order, the order the solver visits them in.
+        """
+        self.clock.reset()
+        self.time = 0.0
+        self.step_count = 0
+        self._previous_positions = None
+        self.recorder = None
+        self.failures = []
+        return self._sync_design(bridge)
+
+    def _sync_design(self, bridge: BridgeDesign) -> tuple[int, int]:
+        # Joints that are gone or moved lose their body (a moved joint also
+        # invalidates the rest length of its constraints).
+        stale_joints = {
+            j_id for j_id, pos in self._joint_positions.items()
+            if bridge.joints.get(j_id) != pos
+        }
+        removed_edges = 0
+        for edge_id, (a, b) in list(self._edge_endpoints.items()):
+            edge = bridge.get_edge(edge_id)
+            if edge is None or (edge.a, edge.b) != (a, b) or a in stale_joints or b in stale_joints:
+                self.space.remove(self.edge_constraints.pop(edge_id))
+                del self._edge_endpoints[edge_id]
+                removed_edges += 1
+        for j_id in stale_joints:
+            self.space.remove(self.bodies.pop(j_id))
+            shape = self._joint_shapes.pop(j_id, None)
+            if shape is not None:
+                self.space.remove(shape)
+            del self._joint_positions[j_id]
+
+        # Reused members leave the space, to come back in design order below: the
+        # solver visits constraints in space order (bodies integrate independently)
+        self.space.remove(*self.edge_constraints.values())
+
+        # Surviving bodies go back to their design position, at rest
+        for j_id, (x, y) in self._joint_positions.items():
+            body = self.bodies[j_id]
+            body.position = (x, y)
+            body.velocity = (0, 0)
+            body.angle = 0
+            body.angular_velocity = 0
+            body.force = (0, 0)
+            body.torque = 0
+
         # 3. Create Bridge Joints (Dynamic)
-        joint_mass = 1.0
-        joint_radius = 3.0
+        joint_mass = JOINT_MASS
+        joint_radius = JOINT_RADIUS
         joint_moment = pymunk.moment_for_circle(joint_mass, 0, joint_radius)
 
+        added_joints = 0
         for j_id, (x, y) in bridge.joints.items():
+            if j_id in self._joint_positions:
+                continue
             body = pymunk.Body(joint_mass, joint_moment)
             body.position = (x, y)
-            shape = pymunk.Circle(body, joint_radius)
-            shape.elasticity = 0.0
-            shape.friction = 0.5
-            shape.filter = pymunk.ShapeFilter(group=1)
-            self.space.add(body, shape)
+            self.space.add(body)
+            if self.profile.joint_shapes:
+                shape = pymunk.Circle(body, joint_radius)
+                shape.elasticity = 0.0
+                shape.friction = 0.5
+                shape.filter = pymunk.ShapeFilter(group=1)
+                self.space.add(shape)
+                self._joint_shapes[j_id] = shape
             self.bodies[j_id] = body
-            
-        self.space.damping = 0.9
+            self._joint_positions[j_id] = (x, y)
+            added_joints += 1
 
         # 4. Create Edges (Constraints)
+        self.edge_constraints = {e_id: _rest_pin(pin) for e_id, pin in self.edge_constraints.items()}
+        added_edges = 0
+        constraints = {}
         for edge in bridge.edges:
-            body_a = self.bodies.get(edge.a)
-            body_b = self.bodies.get(edge.b)
-            
-            if body_a and body_b:
+            pin = self.edge_constraints.get(edge.edge_id)
+            if pin is None:
+                body_a = self.bodies.get(edge.a)
+                body_b = self.bodies.get(edge.b)
+                if not (body_a and body_b):
+                    continue
                 # Revert to PinJoint for stability.
                 # DampedSpring was too chaotic.
                 pin = pymunk.PinJoint(body_a, body_b)
                 # pin.collide_bodies = False
-                self.space.add(pin)
-                self.edge_constraints[edge.edge_id] = pin
+                self._edge_endpoints[edge.edge_id] = (edge.a, edge.b)
+                added_edges += 1
+            constraints[edge.edge_id] = pin
+        self.edge_constraints = constraints
+        self.space.add(*constraints.values())
+
+        self.joint_ids = list(bridge.joints)
+        self._joint_rows = {j_id: row for row, j_id in enumerate(self.joint_ids)}
+        self._index_bodies()
+        self._index_members(bridge)
+        return added_joints + len(stale_joints), added_edges + removed_edges
+
+    def _index_bodies(self) -> None:
+        ids = self._read_bodies()[0]
+        row_of_body = {body.id: self._joint_rows.get(j_id, -1) for j_id, body in self.bodies.items()}
+        self._batch_rows = np.array([row_of_body.get(body_id, -1) for body_id in ids.tolist()], dtype=np.intp)
+
+    def _read_bodies(
+        self, field: pymunk.batch.BodyFields = pymunk.batch.BodyFields.POSITION
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # (body IDs, (n, 2) values of a vector field) of every non-static body in space order, sleeping ones included
+        buffer = self._batch_buffer
+        buffer.clear()
+        pymunk.batch.get_space_bodies(self.space, pymunk.batch.BodyFields.BODY_ID | field, buffer)
+        ids = np.frombuffer(buffer.int_buf(), dtype=np.int64)
+        return ids, np.frombuffer(buffer.float_buf(), dtype=np.float64).reshape(-1, 2)
+
+    def _read_joints(self, field: pymunk.batch.BodyFields) -> np.ndarray:
+        values = np.empty((len(self.joint_ids), 2))
+        rows = self._batch_rows
+        if len(rows):
+            read = self._read_bodies(field)[1]
+            joints = rows >= 0
+            values[rows[joints]] = read[joints]
+        return values
+
+    def _read_positions(self) -> np.ndarray:
+        return self._read_joints(pymunk.batch.BodyFields.POSITION)
+
+    def joint_velocity_array(self) -> np.ndarray:
+        """(joints, 2) velocities in px/s following joint_ids."""
+        return self._read_joints(pymunk.batch.BodyFields.VELOCITY)
+
+    def _index_members(self, bridge: BridgeDesign) -> None:
+        # Members broken in the previous run were re-created above: all intact again
+        self.edge_order = list(self.edge_constraints)
+        self._order_endpoints = [self._edge_endpoints[e_id] for e_id in self.edge_order]
+        self._order_materials = [bridge.get_edge(e_id).material for e_id in self.edge_order]  # type: ignore[union-attr]
+        pins = [self.edge_constraints[e_id] for e_id in self.edge_order]
+        max_force = np.array([get_material(material).max_force for material in self._order_materials], dtype=np.float64)
+        self._inv_max_force = 1.0 / max_force
+        self._scale_dt = 0.0  # Forces the per-member scale to be recomputed
+        self.stresses = np.zeros(len(pins))
+        self._broken = np.zeros(len(pins), dtype=bool)
+        if _chipmunk is not None and all(hasattr(pin, "_constraint") for pin in pins):
+            self._impulse_handles = [pin._constraint for pin in pins]
+            self._read_impulse = _chipmunk.cpConstraintGetImpulse
+        else:
+            self._impulse_handles = list(pins)
+            self._read_impulse = attrgetter("impulse")
+
+    def _update_stresses(self, dt_step: float, time: float) -> None:
+        count = len(self._impulse_handles)
+        if not count:
+            return
+        if dt_step != self._scale_dt:
+            # Impulse over the substep gives the force; normalise by the material limit.
+            # Broken members scale to 0 so their stale impulse never trips a check.
+            self._stress_scale = np.where(self._broken, 0.0, self._inv_max_force / dt_step)
+            self._scale_dt = dt_step
+        impulses = np.fromiter(map(self._read_impulse, self._impulse_handles), dtype=np.float64, count=count)
+        np.multiply(impulses, self._stress_scale, out=self.stresses)
+        if self.break_members and self.stresses.max() > 1.0:
+            for index in np.flatnonzero(self.stresses > 1.0).tolist():
+                self._break_member(index, time)
+        if self.failures:
+            self.stresses[self._broken] = np.nan
+
+    def _break_member(self, index: int, time: float) -> None:
+        edge_id = self.edge_order[index]
+        self.space.remove(self.edge_constraints.pop(edge_id))
+        # Forgetting the endpoints makes reset() rebuild the member
+        del self._edge_endpoints[edge_id]
+        self.failures.append(MemberFailure(edge_id, time, float(self.stresses[index])))
+        self._broken[index] = True
+        self._stress_scale[index] = 0.0
 
     def step(self, dt: float) -> None:
+        # Variable step: results depend on the dt sequence. Prefer advance()/step_fixed().
         # Increase sub-steps for stability?
-        steps = 5
+        steps = self.substeps
         dt_step = dt / steps
-        for _ in range(steps):
+        every = self.profile.stress_every_substep
+        for substep in range(steps):
             self.space.step(dt_step)
+            if every or substep == steps - 1:
+                self._update_stresses(dt_step, self.time + (substep + 1) * dt_step)
+        self.time += dt
+
+    def step_fixed(self) -> None:
+        """Advance exactly one fixed step; the same step count always gives the same state."""
+        if self.interpolate:
+            self._previous_positions = self._read_positions()
+        dt_step = self.clock.step / self.substeps
+        span = self.profiler.span
+        start = self.step_count * self.clock.step
+        last = self.substeps - 1
+        every = self.profile.stress_every_substep
+        for substep in range(self.substeps):
+            with span("physics.substep"):
+                self.space.step(dt_step)
+                if every or substep == last:
+                    self._update_stresses(dt_step, start + (substep + 1) * dt_step)
+        self.step_count += 1
+        self.time = self.step_count * self.clock.step
+        if self.recorder is not None:
+            self._record_frame()
+
+    def advance(self, frame_dt: float) -> int:
+        """Feed wall-clock frame time; runs however many fixed steps are due."""
+        steps = self.clock.advance(frame_dt)
+        for _ in range(steps):
+            self.step_fixed()
+        return steps
+
+    def start_recording(self, capacity: int, ring: bool = False) -> TrajectoryRecorder:
+        """
+        Record joint positions and edge stresses after every fixed step into
+        preallocated float32 arrays (see bridgeia.sim.recording). The current
+        state is written as the first frame.
+        """
+        self.recorder = TrajectoryRecorder(
+            joint_ids=self.joint_ids,
+            edge_ids=self.edge_order,
+            edge_endpoints=self._order_endpoints,
+            edge_materials=self._order_materials,
+            capacity=capacity,
+            dt=self.clock.step,
+            ring=ring,
+            level=self.level.to_dict(),
+        )
+        self._record_frame()
+        return self.recorder
+
+    def _record_frame(self) -> None:
+        assert self.recorder is not None
+        # Broken members are recorded as NaN
+        self.recorder.record(self._read_positions(), self.stresses)
 
     def get_joint_position(self, joint_id: str) -> tuple[float, float] | None:
         body = self.bodies.get(joint_id)
         if body:
+            row = self._joint_rows.get(joint_id)
+            if self.interpolate and self._previous_positions is not None and row is not None:
+                previous = self._previous_positions[row]
+                # Blend between the last two fixed steps for smooth rendering
+                alpha = self.clock.alpha
+                return (
+                    float(previous[0] + (body.position.x - previous[0]) * alpha),
+                    float(previous[1] + (body.position.y - previous[1]) * alpha),
+                )
             return body.position.x, body.position.y # type: ignore
         return None
 
+    def joint_position_array(self) -> np.ndarray:
+        """
+        (len(joint_ids), 2) joint positions in one batch read, interpolated like
+        get_joint_position. Anchors are static and not included.
+        """
+        positions = self._read_positions()
+        if self.interpolate and self._previous_positions is not None:
+            previous = self._previous_positions
+            positions -= previous
+            positions *= self.clock.alpha
+            positions += previous
+        return positions
+
+    def edge_stress_array(self) -> tuple[Sequence[int], np.ndarray]:
+        """(edge IDs, stresses) without copying; broken members read NaN."""
+        return self.edge_order, self.stresses
+
     def get_edge_stresses(self) -> dict[int, float]:
         """
-        Returns a dictionary mapping edge_id to its current stress.
-        With PinJoint, we only get impulse magnitude (non-directional).
-        So we will return positive values (Red) for now.
-        To get Tension/Compression with PinJoint is hard without external calculation.
-        Let's just show Magnitude -> Red intensity.
+        Edge ID -> stress of the intact members, as |force| / material max_force
+        (a member breaks above 1.0). PinJoint impulses carry no sign, so tension
+        and compression look the same; signed static member forces are available
+        from bridgeia.sim.static_solver.
         """
-        MAX_IMPULSE = 2000.0
-        stresses = {}
-        for edge_id, constraint in self.edge_constraints.items():
-            if isinstance(constraint, pymunk.PinJoint):
-                impulse = constraint.impulse
-                # Normalized 0.0 to 1.0
-                stress = min(1.0, impulse / MAX_IMPULSE)
-                stresses[edge_id] = stress
-        return stresses
+        return {
+            e_id: stress
+            for e_id, stress in zip(self.edge_order, self.stresses.tolist())
+            if stress == stress
+        }
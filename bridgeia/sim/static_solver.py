@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+
+from bridgeia.core.arrays import ArrayBridge
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import Level
+from bridgeia.sim.constants import GRAVITY, JOINT_MASS
+
+try:  # SciPy is a dependency; without it only small designs can be solved, densely
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.linalg import MatrixRankWarning, spsolve
+except ImportError:  # pragma: no cover - depends on the environment
+    coo_matrix = None
+
+# Displacements beyond this (px) mean the linear model hit a near-mechanism
+MAX_DISPLACEMENT = 100.0
+# Largest system the dense fallback factorises: 4000 DOFs is a 128 MB matrix
+DENSE_MAX_DOFS = 4000
+
+
+class SolverUnavailable(RuntimeError):
+    """The design is too large for the dense fallback and scipy is not installed."""
+
+
+@dataclass
+class StaticResult:
+    stable: bool
+    displacements: dict[str, tuple[float, float]]  # Joint ID -> (dx, dy)
+    member_forces: dict[int, float]  # Edge ID -> axial force, + tension / - compression
+    utilisation: dict[int, float]  # Edge ID -> |force| / material max_force
+    max_sag: float
+    failure: str | None = None
+
+    @property
+    def max_utilisation(self) -> float:
+        return max(self.utilisation.values(), default=0.0)
+
+    @property
+    def overstressed(self) -> bool:
+        return self.max_utilisation > 1.0
+
+    @property
+    def passed(self) -> bool:
+        return self.stable and not self.overstressed
+
+
+def solve_static(level: Level, bridge: BridgeDesign) -> StaticResult:
+    """
+    Linear direct-stiffness solve of the bridge as a pin-jointed truss under gravity.
+    Level anchors are fixed supports (the simulation makes every anchor static),
+    bridge joints carry JOINT_MASS each, members are axial springs of EA / L.
+    """
+    anchors = {a.anchor_id: (a.x, a.y) for a in level.anchors}
+    return solve_static_arrays(ArrayBridge.from_design(bridge, anchors))
+
+
+def solve_static_arrays(arrays: ArrayBridge) -> StaticResult:
+    """solve_static on a packed design, whose fixed points are the supports."""
+    n_joints = arrays.joint_count
+    edge_ids = arrays.edge_ids.tolist()
+    if n_joints == 0:
+        zeros = dict.fromkeys(edge_ids, 0.0)
+        return StaticResult(True, {}, zeros, dict(zeros), 0.0)
+
+    # Node index per endpoint, -1 for fixed supports
+    node_a = arrays.endpoints[:, 0].astype(np.int64) - arrays.fixed_count
+    node_b = arrays.endpoints[:, 1].astype(np.int64) - arrays.fixed_count
+    node_a[node_a < 0] = -1
+    node_b[node_b < 0] = -1
+    stiffness = arrays.material_column("stiffness")
+    max_force = arrays.material_column("max_force")
+
+    delta = arrays.vectors()
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    valid = length > 1e-9
+    safe_length = np.where(valid, length, 1.0)
+    cos = delta[:, 0] / safe_length
+    sin = delta[:, 1] / safe_length
+    k = np.where(valid, stiffness / safe_length, 0.0)
+
+    # Element matrix k * [[C, -C], [-C, C]] with C = [[cc, cs], [cs, ss]]
+    direction = np.stack([cos, sin], axis=1)  # (m, 2)
+    block = k[:, None, None] * direction[:, :, None] * direction[:, None, :]  # (m, 2, 2)
+    element = np.empty((arrays.edge_count, 4, 4))
+    element[:, :2, :2] = block
+    element[:, 2:, 2:] = block
+    element[:, :2, 2:] = -block
+    element[:, 2:, :2] = -block
+
+    dofs = np.stack([2 * node_a, 2 * node_a + 1, 2 * node_b, 2 * node_b + 1], axis=1)
+    dofs[node_a < 0, :2] = -1
+    dofs[node_b < 0, 2:] = -1
+    rows = np.repeat(dofs, 4, axis=1).ravel()
+    cols = np.tile(dofs, (1, 4)).ravel()
+    values = element.ravel()
+    keep = (rows >= 0) & (cols >= 0)
+    rows, cols, values = rows[keep], cols[keep], values[keep]
+
+    n_dofs = 2 * n_joints
+    loads = np.zeros(n_dofs)
+    loads[1::2] = JOINT_MASS * GRAVITY
+
+    # Free bodies and joints braced along a single line need no factorisation to spot
+    if np.any(arrays.degrees()[arrays.fixed_count:] == 0):
+        return _unstable(edge_ids, "unconnected joint")
+    diagonal = np.bincount(rows[rows == cols], weights=values[rows == cols], minlength=n_dofs)
+    if np.any(diagonal <= 0.0):
+        return _unstable(edge_ids, "mechanism")
+
+    displacement = _solve(rows, cols, values, loads, n_dofs)
+    if displacement is None or not np.all(np.isfinite(displacement)):
+        return _unstable(edge_ids, "mechanism")
+    if np.max(np.abs(displacement)) > MAX_DISPLACEMENT:
+        return _unstable(edge_ids, "mechanism")
+
+    u = displacement.reshape(-1, 2)
+    u_a = np.where((node_a >= 0)[:, None], u[np.maximum(node_a, 0)], 0.0)
+    u_b = np.where((node_b >= 0)[:, None], u[np.maximum(node_b, 0)], 0.0)
+    forces = k * np.einsum("ij,ij->i", u_b - u_a, direction)
+    utilisation = np.abs(forces) / max_force
+
+    joint_ids = arrays.point_ids[arrays.fixed_count:]
+    return StaticResult(
+        stable=True,
+        displacements={j_id: (dx, dy) for j_id, (dx, dy) in zip(joint_ids, u.tolist())},
+        member_forces=dict(zip(edge_ids, forces.tolist())),
+        utilisation=dict(zip(edge_ids, utilisation.tolist())),
+        max_sag=max(0.0, float(u[:, 1].max())),
+    )
+
+
+def _solve(
+    rows: np.ndarray, cols: np.ndarray, values: np.ndarray, loads: np.ndarray, n_dofs: int
+) -> np.ndarray | None:
+    if coo_matrix is not None:
+        matrix = coo_matrix((values, (rows, cols)), shape=(n_dofs, n_dofs)).tocsc()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", MatrixRankWarning)
+            try:
+                return np.asarray(spsolve(matrix, loads))
+            except MatrixRankWarning:
+                return None
+
+    if n_dofs > DENSE_MAX_DOFS:
+        # Dense memory grows as n^2 and time as n^3: 10k joints would need ~3 GB
+        raise SolverUnavailable(
+            f"static solve of {n_dofs} DOFs needs scipy (dense fallback is limited to {DENSE_MAX_DOFS})"
+        )
+    matrix = np.zeros((n_dofs, n_dofs))
+    np.add.at(matrix, (rows, cols), values)
+    try:
+        # The stiffness matrix of a stable truss is symmetric positive definite
+        factor = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        return None
+    return np.linalg.solve(factor.T, np.linalg.solve(factor, loads))
+
+
+def _unstable(edge_ids: list[int], reason: str) -> StaticResult:
+    return StaticResult(
+        stable=False,
+        displacements={},
+        member_forces=dict.fromkeys(edge_ids, 0.0),
+        utilisation=dict.fromkeys(edge_ids, 0.0),
+        max_sag=float("inf"),
+        failure=reason,
+    )
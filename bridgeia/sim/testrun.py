@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import Level
+from bridgeia.sim.goals import spans_gap
+from bridgeia.sim.rigidity import analyse_rigidity
+from bridgeia.sim.simulation import MemberFailure, PhysicsSimulation
+
+# Outcomes after which the bridge counts as standing
+PASSING_OUTCOMES = ("settled", "timeout")
+
+
+@dataclass(frozen=True)
+class TestRunSettings:
+    max_duration: float = 10.0  # Simulated seconds before giving up on settling
+    check_every: int = 6  # Fixed steps between position checks (0.1 s at 60 Hz)
+    stop_when_settled: bool = True  # False runs the full max_duration unless something fails
+    settle_speed: float = 5.0  # px/s under which a joint counts as idle
+    settle_time: float = 0.5  # Seconds every joint must stay idle for the bridge to count as settled
+    sag_limit: float = 60.0  # Max downward joint displacement (px) before failing
+    fall_margin: float = 40.0  # A joint this far below the lowest bank has fallen
+    reject_mechanisms: bool = False  # Fail designs the anchors do not hold rigidly before stepping
+
+
+@dataclass(frozen=True)
+class TestRunResult:
+    outcome: str  # settled, timeout, goal missed, mechanism, nan, fell or sag
+    goal_reached: bool
+    time: float
+    steps: int
+    max_stress: float
+    max_sag: float
+    failures: tuple[MemberFailure, ...] = ()
+
+    @property
+    def passed(self) -> bool:
+        return self.outcome in PASSING_OUTCOMES and self.goal_reached
+
+
+def run_test(
+    simulation: PhysicsSimulation,
+    level: Level,
+    bridge: BridgeDesign,
+    settings: TestRunSettings = TestRunSettings(),
+) -> TestRunResult:
+    """
+    Step a freshly built or reset simulation until the outcome is known:
+    the design cannot reach the goal (from the start, or once broken members
+    cut the path), a joint went NaN, fell past the banks or sagged too far,
+    or every joint stayed slower than settle_speed for settle_time. Positions
+    and speeds are checked every `check_every` steps.
+    With reject_mechanisms, under-braced designs (sim.rigidity) fail without a step.
+
+    Settling is detected here rather than with pymunk sleeping: Chipmunk
+    crashes freeing sleeping bodies that have no shapes (see PhysicsProfile).
+    """
+
+    def result(outcome: str, steps: int, max_stress: float, max_sag: float) -> TestRunResult:
+        broken = {failure.edge_id for failure in simulation.failures}
+        reached = outcome != "goal missed" and spans_gap(level, bridge, broken)
+        return TestRunResult(
+            outcome, reached, simulation.time, steps, max_stress, max_sag, tuple(simulation.failures)
+        )
+
+    if not spans_gap(level, bridge):
+        return result("goal missed", 0, 0.0, 0.0)
+    if settings.reject_mechanisms and not analyse_rigidity(level, bridge).rigid:
+        return result("mechanism", 0, 0.0, 0.0)
+
+    joint_ids = [j_id for j_id in bridge.joints if j_id in simulation.bodies]
+    bodies = [simulation.bodies[j_id] for j_id in joint_ids]
+    rest_y = np.array([bridge.joints[j_id][1] for j_id in joint_ids], dtype=np.float64)
+    floor_y = max((max(bank.y1, bank.y2) for bank in level.banks), default=math.inf) + settings.fall_margin
+
+    max_stress = 0.0
+    max_sag = 0.0
+    failures_seen = 0
+    moving_at = 0.0  # Last check at which some joint was faster than settle_speed
+    total_steps = max(1, int(round(settings.max_duration / simulation.clock.step)))
+    for step in range(1, total_steps + 1):
+        simulation.step_fixed()
+
+        stresses = simulation.stresses
+        if len(simulation.failures) < stresses.size:
+            peak = float(np.nanmax(stresses)) if simulation.failures else float(stresses.max())
+            max_stress = max(max_stress, peak)
+        if len(simulation.failures) != failures_seen:
+            failures_seen = len(simulation.failures)
+            max_stress = max(max_stress, max(f.stress for f in simulation.failures))
+            broken = {failure.edge_id for failure in simulation.failures}
+            if not spans_gap(level, bridge, broken):
+                return result("goal missed", step, max_stress, max_sag)
+
+        if step % settings.check_every and step != total_steps:
+            continue
+        if not bodies:
+            return result("settled", step, max_stress, max_sag)  # Nothing can move
+        positions = np.array([body.position for body in bodies], dtype=np.float64)
+        if not np.all(np.isfinite(positions)):
+            return result("nan", step, max_stress, math.inf)
+        max_sag = max(max_sag, float((positions[:, 1] - rest_y).max()))
+        if positions[:, 1].max() > floor_y:
+            return result("fell", step, max_stress, max_sag)
+        if max_sag > settings.sag_limit:
+            return result("sag", step, max_stress, max_sag)
+        if settings.stop_when_settled:
+            velocities = simulation.joint_velocity_array()
+            if float(np.einsum("ij,ij->i", velocities, velocities).max()) >= settings.settle_speed ** 2:
+                moving_at = simulation.time
+            elif simulation.time - moving_at >= settings.settle_time:
+                return result("settled", step, max_stress, max_sag)
+
+    return result("timeout", total_steps, max_stress, max_sag)
@@ -0,0 +1,78 @@
+"""Pack levels and designs into a binary archive, list it, or export it back to JSON.
+
+    python -m bridgeia.tools.archive pack pack.bria levels/*.json --designs best_design.json
+    python -m bridgeia.tools.archive ls pack.bria
+    python -m bridgeia.tools.archive unpack pack.bria exported/
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import Level
+from bridgeia.core.storage import KIND_DESIGN, KIND_LEVEL, Archive, ArchiveWriter
+
+
+def pack(archive_path: Path, levels: list[Path], designs: list[Path], append: bool) -> int:
+    with ArchiveWriter(archive_path, append=append) as writer:
+        for path in levels:
+            writer.add_level(Level.from_json(path))
+        for path in designs:
+            writer.add_design(BridgeDesign.from_json(path), name=path.stem)
+        return len(writer)
+
+
+def unpack(archive_path: Path, out_dir: Path) -> int:
+    seen: set[tuple[int, str]] = set()
+    with Archive(archive_path) as archive:
+        for index in range(len(archive)):
+            name = archive.name(index) or f"{index:06d}"
+            if (archive.kind(index), name) in seen:
+                name = f"{name}_{index:06d}"
+            seen.add((archive.kind(index), name))
+            if archive.kind(index) == KIND_LEVEL:
+                archive.level(index).to_json(out_dir / "levels" / f"{name}.json")
+            else:
+                archive.design(index).to_json(out_dir / "designs" / f"{name}.json")
+        return len(archive)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BridgeIA level/design archives")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = commands.add_parser("pack", help="Add level and design JSON files to an archive.")
+    pack_parser.add_argument("archive", type=str)
+    pack_parser.add_argument("levels", nargs="*", type=str, help="Level JSON files.")
+    pack_parser.add_argument("--designs", nargs="*", default=[], type=str, help="Design JSON files.")
+    pack_parser.add_argument("--append", action="store_true", help="Extend an existing archive.")
+
+    ls_parser = commands.add_parser("ls", help="List the records of an archive.")
+    ls_parser.add_argument("archive", type=str)
+
+    unpack_parser = commands.add_parser("unpack", help="Export every record as JSON (levels/ and designs/).")
+    unpack_parser.add_argument("archive", type=str)
+    unpack_parser.add_argument("out", type=str)
+
+    args = parser.parse_args()
+    if args.command == "pack":
+        total = pack(Path(args.archive), [Path(p) for p in args.levels], [Path(p) for p in args.designs], args.append)
+        print(f"{args.archive}: {total} records")
+    elif args.command == "ls":
+        with Archive(Path(args.archive)) as archive:
+            for index in range(len(archive)):
+                if archive.kind(index) == KIND_DESIGN:
+                    arrays = archive.design_arrays(index)
+                    detail = f"{arrays.joint_count} joints, {arrays.edge_count} edges, cost {arrays.total_cost()}"
+                    print(f"{index:6d}  design  {archive.name(index) or '-':<24}{detail}")
+                else:
+                    level = archive.level(index)
+                    print(f"{index:6d}  level   {level.name:<24}budget {level.budget}, {len(level.anchors)} anchors")
+    elif args.command == "unpack":
+        total = unpack(Path(args.archive), Path(args.out))
+        print(f"{total} records written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Micro-benchmark of BridgeDesign editing operations on large designs.
+
+Compares the indexed BridgeDesign methods against the list scans they replaced:
+
+    python -m bridgeia.tools.bench_design --edges 10000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from bridgeia.core.bridge import BridgeDesign, Edge, edge_exists
+
+
+def build_lattice(n_edges: int, spacing: float = 40.0) -> BridgeDesign:
+    """Triangulated strip of joints with roughly n_edges members."""
+    bridge = BridgeDesign(edges=[], joints={})
+    columns = max(2, n_edges // 5 + 1)
+    bottom = [bridge.add_joint(i * spacing, 200.0) for i in range(columns)]
+    top = [bridge.add_joint(i * spacing, 160.0) for i in range(columns)]
+    for i in range(columns):
+        if len(bridge.edges) >= n_edges:
+            break
+        bridge.add_edge(bottom[i], top[i], "wood", 120)
+        if i + 1 < columns:
+            bridge.add_edge(bottom[i], bottom[i + 1], "wood", 120)
+            bridge.add_edge(top[i], top[i + 1], "wood", 120)
+            bridge.add_edge(bottom[i], top[i + 1], "wood", 170)
+            bridge.add_edge(top[i], bottom[i + 1], "wood", 170)
+    return bridge
+
+
+# Reference implementations of the pre-index code paths
+def _legacy_remove_edge(bridge: BridgeDesign, edge_id: int) -> None:
+    bridge.edges = [edge for edge in bridge.edges if edge.edge_id != edge_id]
+
+
+def _legacy_remove_joint(bridge: BridgeDesign, joint_id: str) -> None:
+    edges_to_remove = [e.edge_id for e in bridge.edges if e.a == joint_id or e.b == joint_id]
+    for e_id in edges_to_remove:
+        _legacy_remove_edge(bridge, e_id)
+    del bridge.joints[joint_id]
+
+
+def _legacy_total_cost(edges: list[Edge]) -> int:
+    return sum(edge.cost for edge in edges)
+
+
+def _time(repeat: int, fn: Callable[[int], object]) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - start) / repeat
+
+
+def run(n_edges: int, repeat: int, seed: int = 0) -> list[tuple[str, float, float]]:
+    rng = random.Random(seed)
+    bridge = build_lattice(n_edges)
+    joint_ids = list(bridge.joints)
+    pairs = [(rng.choice(joint_ids), rng.choice(joint_ids)) for _ in range(repeat)]
+    rows: list[tuple[str, float, float]] = []
+
+    legacy = _time(repeat, lambda i: edge_exists(bridge.edges, *pairs[i]))
+    indexed = _time(repeat, lambda i: bridge.has_edge(*pairs[i]))
+    rows.append(("edge lookup", legacy, indexed))
+
+    legacy = _time(repeat, lambda i: _legacy_total_cost(bridge.edges))
+    indexed = _time(repeat, lambda i: bridge.total_cost())
+    rows.append(("total cost", legacy, indexed))
+
+    victims = rng.sample([edge.edge_id for edge in bridge.edges], repeat)
+    legacy_bridge = build_lattice(n_edges)
+    legacy = _time(repeat, lambda i: _legacy_remove_edge(legacy_bridge, victims[i]))
+    indexed = _time(repeat, lambda i: bridge.remove_edge(victims[i]))
+    rows.append(("edge deletion", legacy, indexed))
+
+    victims_j = rng.sample(joint_ids, repeat)
+    legacy_bridge = build_lattice(n_edges)
+    legacy = _time(repeat, lambda i: _legacy_remove_joint(legacy_bridge, victims_j[i]))
+    indexed = _time(repeat, lambda i: bridge.remove_joint(victims_j[i]))
+    rows.append(("joint deletion", legacy, indexed))
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BridgeDesign editing micro-benchmark")
+    parser.add_argument("--edges", type=int, default=10000, help="Approximate edge count of the design.")
+    parser.add_argument("--repeat", type=int, default=200, help="Operations timed per measurement.")
+    args = parser.parse_args()
+
+    print(f"{'operation':<16}{'legacy (us)':>14}{'indexed (us)':>14}{'speed-up':>10}")
+    for name, legacy, indexed in run(args.edges, args.repeat):
+        speedup = legacy / indexed if indexed > 0 else float("inf")
+        print(f"{name:<16}{legacy * 1e6:>14.2f}{indexed * 1e6:>14.2f}{speedup:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
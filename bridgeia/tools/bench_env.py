@@ -0,0 +1,88 @@
+"""Step throughput of the RL environments (sim.env), headless.
+
+A random policy that only picks occupied point slots drives VectorBridgeEnv
+for each batch size; edit steps and physics tests are reported separately:
+
+    python -m bridgeia.tools.bench_env levels/level_01.json --envs 1,8,64
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from bridgeia.core.level import Level
+from bridgeia.sim.env import ACTION_COUNT, ADD_EDGE, ADD_JOINT, TEST, EnvConfig, VectorBridgeEnv
+
+
+def random_actions(rng: np.random.Generator, observation: dict[str, np.ndarray], config: EnvConfig, test_rate: float) -> np.ndarray:
+    """(num_envs, 3) actions; point arguments are drawn among present slots, mostly additions."""
+    present = observation["points"][:, :, 2] > 0.0
+    num_envs = present.shape[0]
+    # Random scores masked to present slots: argmax picks a random occupied slot per row
+    scores = np.where(present, rng.random(present.shape), -1.0)
+    a = scores.argmax(axis=1)
+    scores[np.arange(num_envs), a] = -1.0
+    b = scores.argmax(axis=1)
+
+    ops = rng.choice([ADD_JOINT, ADD_EDGE, *range(ACTION_COUNT - 1)], size=num_envs)
+    ops = np.where(rng.random(num_envs) < test_rate, TEST, ops)
+    cells = rng.integers(0, config.grid_cells, size=num_envs)
+    first = np.where(ops == ADD_JOINT, cells, a)
+    second = np.where(ops == ADD_JOINT, a, b)
+    return np.stack([ops, first, second], axis=1)
+
+
+def run(level: Level, num_envs: int, steps: int, test_rate: float, seed: int = 0) -> dict[str, float]:
+    config = EnvConfig(max_steps=100)
+    envs = VectorBridgeEnv(level, num_envs, config, seed=seed, copy=False)
+    rng = np.random.default_rng(seed)
+    observation, _ = envs.reset(seed=seed)
+    tests = 0
+    test_time = 0.0
+    start = time.perf_counter()
+    for _ in range(steps):
+        actions = random_actions(rng, observation, config, test_rate)
+        step_start = time.perf_counter()
+        observation, _, terminated, _, _ = envs.step(actions)
+        if (actions[:, 0] == TEST).any():
+            # Tests dominate a step; keep their time apart from editing
+            test_time += time.perf_counter() - step_start
+            tests += int((actions[:, 0] == TEST).sum())
+    elapsed = time.perf_counter() - start
+    env_steps = steps * num_envs
+    return {
+        "envs": num_envs,
+        "env_steps": env_steps,
+        "steps_per_second": env_steps / elapsed,
+        "tests": tests,
+        "ms_per_test": test_time / tests * 1000.0 if tests else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark BridgeEnv / VectorBridgeEnv step throughput")
+    parser.add_argument("level", type=str, help="Level JSON file.")
+    parser.add_argument("--envs", type=str, default="1,8,64", help="Comma-separated batch sizes.")
+    parser.add_argument("--steps", type=int, default=500, help="Vector steps per batch size.")
+    parser.add_argument("--test-rate", type=float, default=0.02, help="Probability that an action is TEST.")
+    args = parser.parse_args()
+
+    level = Level.from_json(Path(args.level))
+    print(f"{'envs':>6}{'env steps':>11}{'steps/s':>11}{'tests':>7}{'ms/test':>9}  (edit only)")
+    for num_envs in (int(n) for n in args.envs.split(",") if n):
+        edit = run(level, num_envs, args.steps, 0.0)
+        print(f"{num_envs:>6}{edit['env_steps']:>11}{edit['steps_per_second']:>11.0f}{'-':>7}{'-':>9}")
+    print(f"{'envs':>6}{'env steps':>11}{'steps/s':>11}{'tests':>7}{'ms/test':>9}  (test rate {args.test_rate:g})")
+    for num_envs in (int(n) for n in args.envs.split(",") if n):
+        full = run(level, num_envs, args.steps, args.test_rate)
+        print(
+            f"{num_envs:>6}{full['env_steps']:>11}{full['steps_per_second']:>11.0f}"
+            f"{full['tests']:>7}{full['ms_per_test']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
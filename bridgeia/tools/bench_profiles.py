@@ -0,0 +1,125 @@
+"""Speed and accuracy of the physics profiles (sim.simulation.PROFILES).
+
+Speed is fixed steps per second on the benchmark's synthetic lattices.
+Accuracy compares full evaluations (no prescreen) of a family of trusses,
+from sturdy to overloaded, against the "accurate" profile: verdict
+agreement and max stress / max sag deltas.
+
+    python -m bridgeia.tools.bench_profiles --sizes 100,1000,10000
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from dataclasses import dataclass
+
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import Level
+from bridgeia.sim.batch import EvaluationResult, EvaluationSettings, evaluate_design
+from bridgeia.sim.simulation import PROFILES, PhysicsSimulation
+from bridgeia.tools.benchmark import DECK_Y, GAP_LEFT, GAP_RIGHT, synthetic_bridge, synthetic_level
+
+REFERENCE = "accurate"
+
+
+@dataclass(frozen=True)
+class Accuracy:
+    profile: str
+    designs: int
+    agreement: float  # Share of designs with the reference's verdict (survived / failure)
+    stress_delta: tuple[float, float]  # Median, max |max_stress - reference|
+    sag_delta: tuple[float, float]  # Median, max |max_sag - reference| in px, over designs that stand in both
+    seconds: float  # Mean wall time per evaluation
+
+
+def truss(level: Level, panels: int, height: float) -> BridgeDesign:
+    """Warren truss between the two anchors: shallow ones with many panels overload their chords."""
+    left, right = (a.anchor_id for a in level.anchors)
+    bridge = BridgeDesign(edges=[], joints={})
+    bridge.set_fixed_points({a.anchor_id: (a.x, a.y) for a in level.anchors})
+    width = (GAP_RIGHT - GAP_LEFT) / panels
+    deck = [left] + [bridge.add_joint(GAP_LEFT + i * width, DECK_Y) for i in range(1, panels)] + [right]
+    top = [bridge.add_joint(GAP_LEFT + (i + 0.5) * width, DECK_Y - height) for i in range(panels)]
+    for i in range(panels):
+        bridge.add_edge(deck[i], deck[i + 1], "wood", 100)
+        bridge.add_edge(deck[i], top[i], "wood", 100)
+        bridge.add_edge(top[i], deck[i + 1], "wood", 100)
+        if i:
+            bridge.add_edge(top[i - 1], top[i], "wood", 100)
+    return bridge
+
+
+def truss_family(level: Level) -> list[BridgeDesign]:
+    return [truss(level, panels, height) for panels in (2, 3, 4, 6, 8, 12, 16) for height in (15.0, 30.0, 60.0, 120.0)]
+
+
+def steps_per_second(level: Level, bridge: BridgeDesign, profile: str, min_time: float) -> float:
+    simulation = PhysicsSimulation(level, bridge, profile=profile)
+    steps = 0
+    start = time.perf_counter()
+    while steps < 5 or time.perf_counter() - start < min_time:
+        simulation.step_fixed()
+        steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+def evaluate_all(level: Level, designs: list[BridgeDesign], profile: str, duration: float) -> tuple[list[EvaluationResult], float]:
+    settings = EvaluationSettings(duration=duration, prescreen=False, profile=profile)
+    start = time.perf_counter()
+    results = [evaluate_design(level, design, settings) for design in designs]
+    return results, (time.perf_counter() - start) / len(designs)
+
+
+def accuracy(
+    profile: str, results: list[EvaluationResult], reference: list[EvaluationResult], seconds: float
+) -> Accuracy:
+    agree = [
+        (r.survived, r.failure) == (ref.survived, ref.failure) for r, ref in zip(results, reference)
+    ]
+    stress = [abs(r.max_stress - ref.max_stress) for r, ref in zip(results, reference)]
+    # Sag of a collapsing design depends on when the run was cut: compare standing ones
+    sag = [abs(r.max_sag - ref.max_sag) for r, ref in zip(results, reference) if r.survived and ref.survived]
+    return Accuracy(
+        profile=profile,
+        designs=len(results),
+        agreement=sum(agree) / len(agree),
+        stress_delta=(statistics.median(stress), max(stress)),
+        sag_delta=(statistics.median(sag), max(sag)) if sag else (0.0, 0.0),
+        seconds=seconds,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the physics profiles: steps/s and accuracy against 'accurate'")
+    parser.add_argument("--sizes", type=str, default="100,1000,10000", help="Lattice edge counts for the speed runs.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds of stepping per speed measurement.")
+    parser.add_argument("--duration", type=float, default=3.0, help="Simulated seconds per accuracy evaluation.")
+    args = parser.parse_args()
+
+    level = synthetic_level()
+    names = list(PROFILES)
+    print(f"{'edges':>7}" + "".join(f"{name + ' steps/s':>22}" for name in names))
+    for size in (int(s) for s in args.sizes.split(",") if s):
+        bridge = synthetic_bridge(level, size)
+        rates = {name: steps_per_second(level, bridge, name, args.min_time) for name in names}
+        base = rates[REFERENCE]
+        print(f"{len(bridge.edges):>7}" + "".join(f"{rates[n]:>13.0f} ({rates[n] / base:4.1f}x)" for n in names))
+
+    designs = truss_family(level)
+    runs = {name: evaluate_all(level, designs, name, args.duration) for name in names}
+    reference = runs[REFERENCE][0]
+    survivors = sum(1 for r in reference if r.survived)
+    print(f"\n{len(designs)} trusses, {survivors} survive under '{REFERENCE}' ({args.duration:g} s runs)")
+    print(f"{'profile':<10}{'agree':>7}{'stress d (med/max)':>21}{'sag d px (med/max)':>21}{'ms/eval':>9}{'speedup':>9}")
+    for name in names:
+        results, seconds = runs[name]
+        a = accuracy(name, results, reference, seconds)
+        print(
+            f"{name:<10}{a.agreement:>7.0%}{a.stress_delta[0]:>10.3f} /{a.stress_delta[1]:>7.3f}"
+            f"{a.sag_delta[0]:>12.2f} /{a.sag_delta[1]:>7.2f}{seconds * 1e3:>9.1f}{runs[REFERENCE][1] / seconds:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
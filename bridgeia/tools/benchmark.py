@@ -0,0 +1,329 @@
+"""Benchmark suite for the simulation, rendering and design-editing hot paths.
+
+Generates synthetic levels and lattice bridges of increasing size, times each
+hot path and writes machine-readable JSON. The startup group times fresh
+`python -m bridgeia` processes, i.e. what a script calling the CLI pays per
+call. Pass --compare with a saved run to print ratios against it (exit
+status 1 when something regressed):
+
+    python -m bridgeia.tools.benchmark --out bench.json
+    python -m bridgeia.tools.benchmark --compare bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Sequence
+
+from bridgeia.core.bridge import BridgeDesign
+from bridgeia.core.level import AnchorPoint, BankSegment, Goal, Level
+
+BENCHMARK_FORMAT_VERSION = 1
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+# Lattice spans the gap between the banks of the synthetic level
+GAP_LEFT = 200.0
+GAP_RIGHT = 800.0
+DECK_Y = 480.0
+# Process start-up is noisy: time at least this long per startup command
+STARTUP_MIN_TIME = 2.0
+
+
+@dataclass(frozen=True)
+class Measurement:
+    name: str
+    edges: int
+    joints: int
+    calls: int
+    mean_s: float
+    median_s: float
+    min_s: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.edges}"
+
+
+def synthetic_level() -> Level:
+    return Level(
+        name="benchmark",
+        budget=10**12,  # Editing benchmarks must never hit the budget
+        anchors=(
+            AnchorPoint("left_anchor", GAP_LEFT, DECK_Y, True),
+            AnchorPoint("right_anchor", GAP_RIGHT, DECK_Y, True),
+        ),
+        banks=(
+            BankSegment(0.0, DECK_Y + 40.0, GAP_LEFT, DECK_Y + 40.0),
+            BankSegment(GAP_RIGHT, DECK_Y + 40.0, 1000.0, DECK_Y + 40.0),
+        ),
+        goal=Goal("reach_x", 900.0),
+    )
+
+
+def synthetic_bridge(level: Level, n_edges: int) -> BridgeDesign:
+    """
+    Triangulated grid about three times wider than tall, hung between the two
+    anchors, with at most n_edges members (each grid cell adds about three).
+    """
+    rows = max(2, math.ceil(math.sqrt(n_edges / 9.0)))
+    columns = max(2, 3 * rows)
+    spacing = (GAP_RIGHT - GAP_LEFT) / (columns + 1)
+    bridge = BridgeDesign(edges=[], joints={})
+    grid = [
+        [bridge.add_joint(GAP_LEFT + (c + 1) * spacing, DECK_Y - r * spacing) for c in range(columns)]
+        for r in range(rows)
+    ]
+    left, right = (a.anchor_id for a in level.anchors)
+    candidates = [(left, grid[0][0]), (right, grid[0][-1])]
+    for r in range(rows):
+        for c in range(columns):
+            if c + 1 < columns:
+                candidates.append((grid[r][c], grid[r][c + 1]))
+            if r + 1 < rows:
+                candidates.append((grid[r][c], grid[r + 1][c]))
+                if c + 1 < columns:
+                    candidates.append((grid[r][c], grid[r + 1][c + 1]))
+    for a, b in candidates[:n_edges]:
+        bridge.add_edge(a, b, "wood", 100)
+    # Drop grid joints past the edge cut-off so every joint is connected
+    for j_id in [j_id for j_id in bridge.joints if bridge.degree(j_id) == 0]:
+        bridge.remove_joint(j_id)
+    return bridge
+
+
+def measure(name: str, bridge: BridgeDesign, fn: Callable[[int], object], min_time: float, max_calls: int) -> Measurement:
+    """Call fn(i) until min_time has elapsed (at least once, at most max_calls times)."""
+    samples: list[float] = []
+    total = 0.0
+    while len(samples) < max_calls and (total < min_time or not samples):
+        start = time.perf_counter()
+        fn(len(samples))
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        total += elapsed
+    return Measurement(
+        name=name,
+        edges=len(bridge.edges),
+        joints=len(bridge.joints),
+        calls=len(samples),
+        mean_s=total / len(samples),
+        median_s=statistics.median(samples),
+        min_s=min(samples),
+    )
+
+
+def bench_simulation(level: Level, bridge: BridgeDesign, min_time: float, max_calls: int) -> list[Measurement]:
+    from bridgeia.sim.simulation import PhysicsSimulation
+
+    results = [
+        # The constructor is _build_world plus a few empty containers
+        measure("sim.build_world", bridge, lambda i: PhysicsSimulation(level, bridge), min_time, max_calls),
+    ]
+    simulation = PhysicsSimulation(level, bridge)
+    results.append(measure("sim.step", bridge, lambda i: simulation.step_fixed(), min_time, max_calls))
+    results.append(measure("sim.get_edge_stresses", bridge, lambda i: simulation.get_edge_stresses(), min_time, max_calls))
+    return results
+
+
+def bench_rendering(level: Level, bridge: BridgeDesign, min_time: float, max_calls: int) -> list[Measurement]:
+    import pygame
+
+    from bridgeia.main import WINDOW_SIZE
+    from bridgeia.sim.simulation import PhysicsSimulation
+    from bridgeia.ui.renderer import LevelRenderer
+
+    screen = pygame.display.set_mode(WINDOW_SIZE)
+    renderer = LevelRenderer(screen)
+    simulation = PhysicsSimulation(level, bridge)
+
+    def draw_design(i: int) -> None:
+        renderer.invalidate()
+        renderer.draw(level, bridge, preview_line=None, selected_anchor=None)
+
+    def draw_simulation(i: int) -> None:
+        renderer.draw(level, bridge, preview_line=None, selected_anchor=None, simulation=simulation)
+
+    return [
+        measure("render.draw_design", bridge, draw_design, min_time, max_calls),
+        measure("render.draw_simulation", bridge, draw_simulation, min_time, max_calls),
+    ]
+
+
+def bench_editing(level: Level, bridge: BridgeDesign, min_time: float, max_calls: int, seed: int) -> list[Measurement]:
+    from bridgeia.main import ensure_fixed_points, find_point_at, remove_element_at, try_add_edge
+
+    rng = random.Random(seed)
+    ensure_fixed_points(level, bridge)
+    positions = list(bridge.joints.values())
+    # Clicks land near existing joints, like a player picking points
+    clicks = [
+        (int(x + rng.uniform(-10, 10)), int(y + rng.uniform(-10, 10)))
+        for x, y in (rng.choice(positions) for _ in range(max_calls))
+    ]
+    joint_ids = list(bridge.joints)
+    pairs = [(rng.choice(joint_ids), rng.choice(joint_ids)) for _ in range(max_calls)]
+
+    results = [measure("edit.find_point_at", bridge, lambda i: find_point_at(level, bridge, clicks[i]), min_time, max_calls)]
+    edited = bridge.copy()
+    ensure_fixed_points(level, edited)
+    results.append(
+        measure("edit.try_add_edge", bridge, lambda i: try_add_edge(level, edited, *pairs[i]), min_time, max_calls)
+    )
+    results.append(
+        measure("edit.remove_element_at", bridge, lambda i: remove_element_at(level, edited, clicks[i]), min_time, max_calls)
+    )
+    return results
+
+
+def bench_startup(level: Level, min_time: float, max_calls: int) -> list[Measurement]:
+    """Wall time of CLI commands in fresh interpreters, imports included."""
+    root = Path(__file__).resolve().parents[2]
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (str(root), env.get("PYTHONPATH"))))
+    bridge = synthetic_bridge(level, 10)
+    empty = BridgeDesign(edges=[], joints={})
+    with tempfile.TemporaryDirectory() as tmp:
+        level_path, design_path = Path(tmp) / "level.json", Path(tmp) / "design.json"
+        level.to_json(level_path)
+        bridge.to_json(design_path)
+        commands = {
+            "startup.help": ["--help"],
+            "startup.eval": ["eval", str(level_path), str(design_path)],
+            "startup.screenshot": ["screenshot", str(Path(tmp) / "frame.png"), "--level", str(level_path)],
+        }
+
+        def launch(args: list[str]) -> Callable[[int], object]:
+            # eval exits 1 for a failed design: only the time matters here
+            return lambda i: subprocess.run(
+                [sys.executable, "-m", "bridgeia", *args], env=env, stdout=subprocess.DEVNULL, check=False
+            )
+
+        return [
+            measure(name, empty, launch(args), max(min_time, STARTUP_MIN_TIME), max_calls)
+            for name, args in commands.items()
+        ]
+
+
+def run(sizes: list[int], min_time: float, max_calls: int, groups: set[str], seed: int = 0) -> list[Measurement]:
+    level = synthetic_level()
+    results: list[Measurement] = []
+    if "startup" in groups:
+        results.extend(bench_startup(level, min_time, max_calls))
+    if "render" in groups:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+
+        pygame.init()
+    try:
+        for size in sizes:
+            bridge = synthetic_bridge(level, size)
+            if "sim" in groups:
+                results.extend(bench_simulation(level, bridge, min_time, max_calls))
+            if "render" in groups:
+                results.extend(bench_rendering(level, bridge, min_time, max_calls))
+            if "edit" in groups:
+                results.extend(bench_editing(level, bridge, min_time, max_calls, seed))
+    finally:
+        if "render" in groups:
+            pygame.quit()
+    return results
+
+
+def environment() -> dict[str, str]:
+    import numpy
+    import pygame
+    import pymunk
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy.__version__,
+        "pygame": pygame.version.ver,
+        "pymunk": pymunk.version,
+    }
+
+
+def to_json(results: list[Measurement]) -> dict:
+    return {
+        "version": BENCHMARK_FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "results": [asdict(result) for result in results],
+    }
+
+
+def load_results(path: Path) -> list[Measurement]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != BENCHMARK_FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark format version in {path}")
+    return [Measurement(**row) for row in data["results"]]
+
+
+def compare(
+    baseline: list[Measurement], current: list[Measurement]
+) -> list[tuple[Measurement, Measurement | None, float | None]]:
+    """Pairs each current measurement with its baseline; ratio > 1 means slower now."""
+    by_key = {m.key: m for m in baseline}
+    rows = []
+    for m in current:
+        base = by_key.get(m.key)
+        # Medians are less sensitive to a stray GC pause than means
+        ratio = m.median_s / base.median_s if base is not None and base.median_s > 0 else None
+        rows.append((m, base, ratio))
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark BridgeIA hot paths on synthetic bridges")
+    parser.add_argument("--sizes", type=str, default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated edge counts.")
+    parser.add_argument("--groups", type=str, default="sim,render,edit,startup", help="Subset of sim,render,edit,startup.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds spent per measurement.")
+    parser.add_argument("--max-calls", type=int, default=500, help="Upper bound on calls per measurement.")
+    parser.add_argument("--out", type=str, help="Write results as JSON.")
+    parser.add_argument("--compare", type=str, help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression.")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    groups = {group.strip() for group in args.groups.split(",") if group.strip()}
+    results = run(sizes, args.min_time, args.max_calls, groups)
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(to_json(results), indent=2), encoding="utf-8")
+
+    if not args.compare:
+        print(f"{'benchmark':<26}{'edges':>7}{'calls':>7}{'median (ms)':>13}{'min (ms)':>11}")
+        for m in results:
+            print(f"{m.name:<26}{m.edges:>7}{m.calls:>7}{m.median_s * 1e3:>13.3f}{m.min_s * 1e3:>11.3f}")
+        return
+
+    regressions = 0
+    print(f"{'benchmark':<26}{'edges':>7}{'base (ms)':>11}{'now (ms)':>11}{'ratio':>8}")
+    for m, base, ratio in compare(load_results(Path(args.compare)), results):
+        if base is None or ratio is None:
+            print(f"{m.name:<26}{m.edges:>7}{'-':>11}{m.median_s * 1e3:>11.3f}{'new':>8}")
+            continue
+        flag = ""
+        if ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{m.name:<26}{m.edges:>7}{base.median_s * 1e3:>11.3f}{m.median_s * 1e3:>11.3f}{ratio:>7.2f}x{flag}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Procedural level generator for scale and stress testing.
+
+Levels are drawn from parameter ranges (gap width, bank heights, anchor count
+and layout, budget, goal position). Level i of a corpus only depends on
+(seed, i), so corpora are reproducible and chunks generate in parallel:
+
+    python -m bridgeia.tools.levelgen corpus/ --count 5000 --seed 7
+    python -m bridgeia.tools.levelgen corpus/ --count 5000 --archive corpus.bria --measure
+    python -m bridgeia.tools.optimizer corpus/gen_7_000042.json
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from bridgeia.core.level import AnchorPoint, BankSegment, Goal, Level
+from bridgeia.core.storage import Archive, ArchiveWriter
+
+LAYOUTS = ("flat", "stepped", "tower")
+
+
+@dataclass(frozen=True)
+class LevelSpec:
+    """Ranges levels are drawn from; defaults bracket level_01 in a 1000x600 window."""
+
+    width: float = 1000.0
+    height: float = 600.0
+    margin: float = 20.0  # Anchors and the goal stay this far inside the window
+    gap: tuple[float, float] = (250.0, 650.0)  # Distance between the bank edges
+    gap_jitter: float = 80.0  # Max horizontal shift of the gap from the centre
+    bank_y: tuple[float, float] = (420.0, 560.0)  # Bank top, drawn per bank (larger y is lower)
+    # Two at least: the optimizer's first members need two points to form a triangle from
+    anchors_per_bank: tuple[int, int] = (2, 4)
+    anchor_spacing: tuple[float, float] = (60.0, 140.0)
+    anchor_height: float = 40.0  # Anchors sit this far above their bank
+    edge_inset: float = 60.0  # Innermost anchor distance from the bank edge
+    budget_per_px: tuple[float, float] = (35.0, 70.0)  # Budget per pixel of gap (level_01: 50)
+    layouts: tuple[str, ...] = LAYOUTS
+
+
+def _bank_anchors(
+    rng: random.Random, spec: LevelSpec, side: str, edge_x: float, bank_y: float, layout: str
+) -> list[AnchorPoint]:
+    """Anchors of one bank, innermost first; side is "left" or "right"."""
+    direction = -1.0 if side == "left" else 1.0  # Away from the gap
+    count = rng.randint(*spec.anchors_per_bank)
+    spacing = rng.uniform(*spec.anchor_spacing)
+    y = bank_y - spec.anchor_height
+    # Stacked anchors share a rise that keeps the top one inside the window
+    rise = min(spacing, (y - spec.margin) / max(1, count - 1))
+    positions = []
+    for k in range(count):
+        x = edge_x + direction * (spec.edge_inset + k * spacing)
+        fits = spec.margin <= x <= spec.width - spec.margin
+        if k > 0 and (layout == "tower" or not fits):
+            # Extra anchors stack above the innermost one: cable-stayed designs, or no room left on the bank
+            positions.append((positions[0][0], y - k * rise))
+        elif not fits:
+            break
+        elif layout == "stepped":
+            # Anchors climb away from the gap, like a cut embankment
+            positions.append((x, y - k * spacing * 0.4))
+        else:
+            positions.append((x, y))
+    # IDs count from the left like levels/level_01.json
+    positions.sort()
+    return [AnchorPoint(f"{side}_anchor_{i}", round(x, 1), round(py, 1), True) for i, (x, py) in enumerate(positions, start=1)]
+
+
+def generate_level(seed: int, index: int, spec: LevelSpec = LevelSpec()) -> Level:
+    rng = random.Random(f"{seed}:{index}")
+    gap = rng.uniform(*spec.gap)
+    centre = spec.width / 2.0 + rng.uniform(-spec.gap_jitter, spec.gap_jitter)
+    gap_left = max(spec.edge_inset + spec.margin, centre - gap / 2.0)
+    gap_right = min(spec.width - spec.edge_inset - spec.margin, gap_left + gap)
+    left_y = rng.uniform(*spec.bank_y)
+    right_y = rng.uniform(*spec.bank_y)
+    layout = rng.choice(spec.layouts)
+
+    anchors = (
+        _bank_anchors(rng, spec, "left", gap_left, left_y, layout)
+        + _bank_anchors(rng, spec, "right", gap_right, right_y, layout)
+    )
+    level = Level(
+        name=f"gen_{seed}_{index:06d}",
+        budget=int(round((gap_right - gap_left) * rng.uniform(*spec.budget_per_px), -2)),
+        anchors=tuple(anchors),
+        banks=(
+            BankSegment(0.0, round(left_y, 1), round(gap_left, 1), round(left_y, 1)),
+            BankSegment(round(gap_right, 1), round(right_y, 1), spec.width, round(right_y, 1)),
+        ),
+        # Somewhere on the far bank, past its edge anchors
+        goal=Goal("reach_x", round(rng.uniform(gap_right + spec.edge_inset, spec.width - spec.margin), 1)),
+    )
+    check_bounds(level, spec)
+    return level
+
+
+def check_bounds(level: Level, spec: LevelSpec = LevelSpec()) -> None:
+    """Raise ValueError if an anchor or the goal lies outside the window the editor shows."""
+    for anchor in level.anchors:
+        if not (0.0 <= anchor.x <= spec.width and 0.0 <= anchor.y <= spec.height):
+            raise ValueError(
+                f"{level.name}: anchor {anchor.anchor_id} at ({anchor.x}, {anchor.y}) is outside the "
+                f"{spec.width:g}x{spec.height:g} window"
+            )
+    if not 0.0 <= level.goal.x <= spec.width:
+        raise ValueError(f"{level.name}: goal x {level.goal.x} is outside the {spec.width:g} px wide window")
+
+
+def _write_chunk(job: tuple[Path, int, range, LevelSpec]) -> int:
+    out_dir, seed, indices, spec = job
+    for index in indices:
+        level = generate_level(seed, index, spec)
+        level.to_json(out_dir / f"{level.name}.json")
+    return len(indices)
+
+
+def generate_corpus(
+    out_dir: Path, count: int, seed: int = 0, spec: LevelSpec = LevelSpec(), workers: int | None = None
+) -> list[Path]:
+    """Write `count` level JSON files to out_dir on a process pool; returns their paths in index order."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, min(500, count // (workers * 4) or 1))
+    jobs = [(out_dir, seed, range(start, min(count, start + chunk)), spec) for start in range(0, count, chunk)]
+    if workers == 1 or len(jobs) == 1:
+        for job in jobs:
+            _write_chunk(job)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_write_chunk, jobs))
+    return [out_dir / f"gen_{seed}_{index:06d}.json" for index in range(count)]
+
+
+def pack_corpus(archive_path: Path, count: int, seed: int = 0, spec: LevelSpec = LevelSpec()) -> None:
+    # Regenerating is cheaper than reading the JSON back
+    with ArchiveWriter(archive_path) as writer:
+        for index in range(count):
+            writer.add_level(generate_level(seed, index, spec))
+
+
+def measure_loading(paths: list[Path], archive_path: Path | None) -> list[tuple[str, int, float]]:
+    """(source, levels, seconds) for loading the whole corpus back."""
+    timings = []
+    start = time.perf_counter()
+    for path in paths:
+        Level.from_json(path)
+    timings.append(("json", len(paths), time.perf_counter() - start))
+    if archive_path is not None:
+        start = time.perf_counter()
+        with Archive(archive_path) as archive:
+            loaded = sum(1 for _ in archive.levels())
+        timings.append(("archive", loaded, time.perf_counter() - start))
+    return timings
+
+
+def main() -> None:
+    defaults = LevelSpec()
+    parser = argparse.ArgumentParser(description="Generate seeded corpora of BridgeIA levels")
+    parser.add_argument("out", type=str, help="Directory receiving the level JSON files.")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--gap", type=float, nargs=2, default=defaults.gap, metavar=("MIN", "MAX"))
+    parser.add_argument("--bank-y", type=float, nargs=2, default=defaults.bank_y, metavar=("MIN", "MAX"))
+    parser.add_argument("--anchors", type=int, nargs=2, default=defaults.anchors_per_bank, metavar=("MIN", "MAX"),
+                        help="Anchors per bank.")
+    parser.add_argument("--budget-per-px", type=float, nargs=2, default=defaults.budget_per_px, metavar=("MIN", "MAX"))
+    parser.add_argument("--layouts", type=str, default=",".join(LAYOUTS), help=f"Subset of {','.join(LAYOUTS)}.")
+    parser.add_argument("--archive", type=str, help="Also pack the corpus into this archive.")
+    parser.add_argument("--measure", action="store_true", help="Time loading the corpus back.")
+    args = parser.parse_args()
+
+    layouts = tuple(layout for layout in args.layouts.split(",") if layout)
+    unknown = set(layouts) - set(LAYOUTS)
+    if unknown or not layouts:
+        parser.error(f"unknown layouts: {', '.join(sorted(unknown)) or '(none given)'}")
+    spec = LevelSpec(
+        gap=tuple(args.gap),
+        bank_y=tuple(args.bank_y),
+        anchors_per_bank=tuple(args.anchors),
+        budget_per_px=tuple(args.budget_per_px),
+        layouts=layouts,
+    )
+    out_dir = Path(args.out)
+    start = time.perf_counter()
+    paths = generate_corpus(out_dir, args.count, args.seed, spec, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} levels written to {out_dir} in {elapsed:.2f} s ({len(paths) / elapsed:.0f} levels/s)")
+
+    archive_path = Path(args.archive) if args.archive else None
+    if archive_path is not None:
+        start = time.perf_counter()
+        pack_corpus(archive_path, args.count, args.seed, spec)
+        print(f"Archive {archive_path} written in {time.perf_counter() - start:.2f} s")
+    if args.measure:
+        for source, loaded, seconds in measure_loading(paths, archive_path):
+            print(f"load {source:<8}{loaded:>8} levels  {seconds:7.3f} s  {loaded / seconds:10.0f} levels/s")
+
+
+if __name__ == "__main__":
+    main()
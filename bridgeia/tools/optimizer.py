@@ -0,0 +1,385 @@
+"""Evolutionary bridge designer.
+
+Evolves BridgeDesign graphs for a level, scoring every generation through the
+headless batch evaluator on all cores. Progress is checkpointed after each
+generation so a long search can be stopped and resumed:
+
+    python -m bridgeia.tools.optimizer levels/level_01.json --generations 200 \\
+        --checkpoint search.ckpt --out best_design.json --cache eval_cache.sqlite
+    python -m bridgeia --design best_design.json
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import pickle
+import random
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable
+
+from bridgeia.core.bridge import COST_PER_UNIT, MAX_EDGE_LENGTH, BridgeDesign, calculate_cost, edge_length
+from bridgeia.core.level import Level
+from bridgeia.sim.batch import BatchEvaluator, EvaluationResult, EvaluationSettings
+from bridgeia.sim.cache import EvaluationCache
+from bridgeia.sim.goals import goal_side_x, reached_x, spans_gap
+
+CHECKPOINT_VERSION = 1
+# New joints land on this grid, like the editor's snapping
+JOINT_GRID = 10.0
+MIN_EDGE_LENGTH = 30.0
+
+
+@dataclass(frozen=True)
+class OptimizerConfig:
+    population: int = 48
+    elite: int = 4
+    tournament: int = 3
+    max_mutations: int = 3  # Each child gets 1..max_mutations mutations
+    seed: int = 0
+    settings: EvaluationSettings = field(default_factory=lambda: EvaluationSettings(duration=3.0))
+
+
+@dataclass
+class Candidate:
+    design: BridgeDesign
+    fitness: float = -math.inf
+    result: EvaluationResult | None = None
+
+
+@dataclass(frozen=True)
+class GenerationStats:
+    generation: int
+    best_fitness: float
+    mean_fitness: float
+    survivors: int
+    best_cost: int
+    evaluations: int
+    elapsed: float
+    cached: int = 0  # Evaluations answered by the cache instead of a simulation
+
+    @property
+    def designs_per_second(self) -> float:
+        return self.evaluations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def score(level: Level, design: BridgeDesign, result: EvaluationResult, settings: EvaluationSettings) -> float:
+    """
+    Higher is better, in tiers: first reach across the gap (-1..0 by progress),
+    then stay up (1..1.5 by how little it sagged), then survive (2+), where stress
+    margin and unspent budget break ties.
+    """
+    starts = [a.x for a in level.anchors if a.x < goal_side_x(level)]
+    start_x = max(starts, default=0.0)
+    span = max(1.0, goal_side_x(level) - start_x)
+    if not spans_gap(level, design):
+        progress = (reached_x(level, design) - start_x) / span
+        return min(1.0, max(0.0, progress)) - 1.0
+    if not result.survived:
+        return 1.0 + 0.5 * (1.0 - min(1.0, result.max_sag / settings.sag_limit))
+    margin = 1.0 - min(1.0, result.max_stress)
+    savings = 1.0 - design.total_cost() / level.budget if level.budget > 0 else 0.0
+    return 2.0 + 0.5 * margin + savings
+
+
+class Mutator:
+    """Random edits that keep a design within MAX_EDGE_LENGTH and the level budget."""
+
+    def __init__(self, level: Level, rng: random.Random) -> None:
+        self.level = level
+        self.rng = rng
+        self.anchors = {a.anchor_id: (a.x, a.y) for a in level.anchors}
+        xs = [x for bank in level.banks for x in (bank.x1, bank.x2)] or [a.x for a in level.anchors]
+        ys = [y for bank in level.banks for y in (bank.y1, bank.y2)] or [a.y for a in level.anchors]
+        # Keep joints above the banks and within the level's horizontal extent
+        self.bounds = (min(xs), min(ys) - 2 * MAX_EDGE_LENGTH, max(xs), max(ys))
+
+    def points(self, design: BridgeDesign) -> dict[str, tuple[float, float]]:
+        points = dict(self.anchors)
+        points.update(design.joints)
+        return points
+
+    def mutate(self, design: BridgeDesign, count: int) -> BridgeDesign:
+        child = design.copy()
+        operators = [
+            (self.add_joint, 3),
+            (self.add_edge, 3),
+            (self.move_joint, 2),
+            (self.remove_edge, 1),
+            (self.remove_joint, 1),
+        ]
+        ops, weights = zip(*operators)
+        for op in self.rng.choices(ops, weights=weights, k=count):
+            op(child)
+        self.prune(child)
+        return child
+
+    def try_edge(self, design: BridgeDesign, a: str, b: str) -> bool:
+        points = self.points(design)
+        if a == b or a not in points or b not in points or design.has_edge(a, b):
+            return False
+        length = edge_length(points[a], points[b])
+        if length > MAX_EDGE_LENGTH or length < 1.0:
+            return False
+        cost = calculate_cost(length, COST_PER_UNIT)
+        if design.total_cost() + cost > self.level.budget:
+            return False
+        design.add_edge(a, b, material="wood", cost=cost)
+        return True
+
+    def neighbours(self, design: BridgeDesign, pos: tuple[float, float], exclude: str | None = None) -> list[str]:
+        """Points within reach of pos, nearest first."""
+        in_reach = [
+            (edge_length(pos, p), p_id) for p_id, p in self.points(design).items()
+            if p_id != exclude and MIN_EDGE_LENGTH <= edge_length(pos, p) <= MAX_EDGE_LENGTH
+        ]
+        return [p_id for _, p_id in sorted(in_reach)]
+
+    def add_joint(self, design: BridgeDesign) -> None:
+        points = self.points(design)
+        ox, oy = points[self.rng.choice(list(points))]
+        angle = self.rng.uniform(0.0, 2.0 * math.pi)
+        reach = self.rng.uniform(MIN_EDGE_LENGTH * 1.5, MAX_EDGE_LENGTH * 0.9)
+        x = round((ox + reach * math.cos(angle)) / JOINT_GRID) * JOINT_GRID
+        y = round((oy + reach * math.sin(angle)) / JOINT_GRID) * JOINT_GRID
+        left, top, right, bottom = self.bounds
+        if not (left <= x <= right and top <= y <= bottom):
+            return
+        nearby = self.neighbours(design, (x, y))
+        if len(nearby) < 2:
+            return
+        j_id = design.add_joint(float(x), float(y))
+        # Two members make a triangle with whatever the neighbours already share
+        connected = sum(self.try_edge(design, j_id, other) for other in nearby[:2])
+        if connected == 0:
+            design.remove_joint(j_id)
+
+    def add_edge(self, design: BridgeDesign) -> None:
+        points = self.points(design)
+        if not design.joints:
+            return
+        a = self.rng.choice(list(design.joints))
+        candidates = [p_id for p_id in self.neighbours(design, points[a], exclude=a) if not design.has_edge(a, p_id)]
+        if candidates:
+            self.try_edge(design, a, self.rng.choice(candidates[:4]))
+
+    def move_joint(self, design: BridgeDesign) -> None:
+        if not design.joints:
+            return
+        j_id = self.rng.choice(list(design.joints))
+        x, y = design.joints[j_id]
+        nx = round((x + self.rng.uniform(-30.0, 30.0)) / JOINT_GRID) * JOINT_GRID
+        ny = round((y + self.rng.uniform(-30.0, 30.0)) / JOINT_GRID) * JOINT_GRID
+        others = [(e.b if e.a == j_id else e.a) for e in design.edges_of(j_id)]
+        # Member costs depend on length: rebuild the joint and its members
+        design.remove_joint(j_id)
+        new_id = design.add_joint(float(nx), float(ny))
+        for other in others:
+            self.try_edge(design, new_id, other)
+
+    def remove_edge(self, design: BridgeDesign) -> None:
+        if design.edges:
+            design.remove_edge(self.rng.choice(design.edges).edge_id)
+
+    def remove_joint(self, design: BridgeDesign) -> None:
+        if design.joints:
+            design.remove_joint(self.rng.choice(list(design.joints)))
+
+    @staticmethod
+    def prune(design: BridgeDesign) -> None:
+        # Joints held by fewer than two members can only flap around
+        loose = [j_id for j_id in design.joints if design.degree(j_id) < 2]
+        while loose:
+            for j_id in loose:
+                design.remove_joint(j_id)
+            loose = [j_id for j_id in design.joints if design.degree(j_id) < 2]
+
+
+class EvolutionaryOptimizer:
+    def __init__(
+        self,
+        level: Level,
+        config: OptimizerConfig = OptimizerConfig(),
+        workers: int | None = None,
+        cache: EvaluationCache | None = None,
+    ) -> None:
+        self.level = level
+        self.config = config
+        self.workers = workers
+        self.cache = cache
+        self.rng = random.Random(config.seed)
+        self.generation = 0
+        self.population: list[Candidate] = []
+        self.history: list[GenerationStats] = []
+        self.best: Candidate | None = None
+
+    def run(
+        self,
+        generations: int,
+        checkpoint: Path | None = None,
+        on_generation: Callable[[GenerationStats], None] | None = None,
+    ) -> Candidate | None:
+        with BatchEvaluator(self.level, self.config.settings, self.workers, self.cache) as evaluator:
+            if not self.population:
+                self.population = self._initial_population()
+            for _ in range(generations):
+                stats = self.step(evaluator)
+                if checkpoint is not None:
+                    self.save_checkpoint(checkpoint)
+                if on_generation is not None:
+                    on_generation(stats)
+        return self.best
+
+    def step(self, evaluator: BatchEvaluator) -> GenerationStats:
+        """Score the pending candidates, record stats, then breed the next generation."""
+        pending = [c for c in self.population if c.result is None]
+        report = evaluator.evaluate([c.design for c in pending])
+        for candidate, result in zip(pending, report.results):
+            candidate.result = result
+            candidate.fitness = score(self.level, candidate.design, result, self.config.settings)
+
+        self.population.sort(key=lambda c: c.fitness, reverse=True)
+        leader = self.population[0]
+        if self.best is None or leader.fitness > self.best.fitness:
+            self.best = Candidate(leader.design.copy(), leader.fitness, leader.result)
+
+        stats = GenerationStats(
+            generation=self.generation,
+            best_fitness=leader.fitness,
+            mean_fitness=sum(c.fitness for c in self.population) / len(self.population),
+            survivors=sum(1 for c in self.population if c.result is not None and c.result.survived),
+            best_cost=leader.design.total_cost(),
+            evaluations=len(pending),
+            elapsed=report.elapsed,
+            cached=report.cached,
+        )
+        self.history.append(stats)
+        self.generation += 1
+        self.population = self._breed()
+        return stats
+
+    def _initial_population(self) -> list[Candidate]:
+        mutator = Mutator(self.level, self.rng)
+        seed = BridgeDesign(edges=[], joints={})
+        population = []
+        for _ in range(self.config.population):
+            design = seed.copy()
+            for _ in range(self.rng.randint(4, 12)):
+                mutator.add_joint(design)
+            mutator.prune(design)
+            population.append(Candidate(design))
+        return population
+
+    def _tournament(self) -> Candidate:
+        entrants = self.rng.sample(self.population, min(self.config.tournament, len(self.population)))
+        return max(entrants, key=lambda c: c.fitness)
+
+    def _breed(self) -> list[Candidate]:
+        mutator = Mutator(self.level, self.rng)
+        # Elites carry over with their score; everyone else is a mutated tournament winner
+        next_population = [replace(c) for c in self.population[: self.config.elite]]
+        while len(next_population) < self.config.population:
+            parent = self._tournament()
+            count = self.rng.randint(1, self.config.max_mutations)
+            next_population.append(Candidate(mutator.mutate(parent.design, count)))
+        return next_population
+
+    def save_checkpoint(self, path: Path) -> None:
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "level": self.level,
+            "config": self.config,
+            "generation": self.generation,
+            "population": self.population,
+            "history": self.history,
+            "best": self.best,
+            "rng": self.rng.getstate(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interrupted save never corrupts the last checkpoint
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            pickle.dump(state, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def resume(cls, path: Path, workers: int | None = None, cache: EvaluationCache | None = None) -> "EvolutionaryOptimizer":
+        with path.open("rb") as handle:
+            state = pickle.load(handle)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {path}")
+        optimizer = cls(state["level"], state["config"], workers, cache)
+        optimizer.generation = state["generation"]
+        optimizer.population = state["population"]
+        optimizer.history = state["history"]
+        optimizer.best = state["best"]
+        optimizer.rng.setstate(state["rng"])
+        return optimizer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evolve bridge designs for a level")
+    parser.add_argument("level", type=str, help="Level JSON file.")
+    parser.add_argument("--generations", type=int, default=50)
+    # No defaults here: with --resume, only values given explicitly are checked against the checkpoint
+    parser.add_argument("--population", type=int, help=f"Designs per generation (default {OptimizerConfig.population}).")
+    parser.add_argument("--seed", type=int, help="Random seed (default 0).")
+    parser.add_argument("--duration", type=float, help="Simulated seconds per evaluation (default 3).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--checkpoint", type=str, help="Save progress here after every generation.")
+    parser.add_argument("--resume", action="store_true", help="Continue from --checkpoint.")
+    parser.add_argument("--out", type=str, default="best_design.json", help="Where to write the best design.")
+    parser.add_argument("--cache", type=str, help="SQLite file memoising evaluations across runs.")
+    parser.add_argument("--cache-mb", type=float, default=64.0, help="Size bound of the --cache file.")
+    args = parser.parse_args()
+
+    # Results are memoised in memory even without --cache: children often repeat a parent
+    cache = EvaluationCache(Path(args.cache) if args.cache else None, max_disk_bytes=int(args.cache_mb * 1024 * 1024))
+
+    checkpoint = Path(args.checkpoint) if args.checkpoint else None
+    if args.resume:
+        if checkpoint is None or not checkpoint.exists():
+            parser.error("--resume needs an existing --checkpoint file")
+        optimizer = EvolutionaryOptimizer.resume(checkpoint, args.workers, cache)
+        # The checkpoint carries the level and config: refuse options that say otherwise
+        saved = optimizer.config
+        conflicts = [
+            f"--{name} {given} (checkpoint: {kept})"
+            for name, given, kept in (
+                ("population", args.population, saved.population),
+                ("seed", args.seed, saved.seed),
+                ("duration", args.duration, saved.settings.duration),
+            )
+            if given is not None and given != kept
+        ]
+        if Level.from_json(Path(args.level)) != optimizer.level:
+            conflicts.append(f"level {args.level} (checkpoint: {optimizer.level.name})")
+        if conflicts:
+            parser.error("--resume continues the checkpointed search; conflicting " + ", ".join(conflicts))
+    else:
+        config = OptimizerConfig(
+            population=OptimizerConfig.population if args.population is None else args.population,
+            seed=0 if args.seed is None else args.seed,
+            settings=EvaluationSettings(duration=3.0 if args.duration is None else args.duration),
+        )
+        optimizer = EvolutionaryOptimizer(Level.from_json(Path(args.level)), config, args.workers, cache)
+
+    def report(stats: GenerationStats) -> None:
+        print(
+            f"gen {stats.generation:4d}  best {stats.best_fitness:6.3f}  mean {stats.mean_fitness:6.3f}  "
+            f"survivors {stats.survivors:3d}/{optimizer.config.population}  cost {stats.best_cost:6d}  "
+            f"{stats.designs_per_second:7.1f} designs/s  cached {stats.cached:3d}",
+            flush=True,
+        )
+
+    with cache:
+        best = optimizer.run(args.generations, checkpoint, report)
+    print(cache.stats.summary())
+    if best is not None:
+        best.design.to_json(Path(args.out))
+        print(f"Best design (fitness {best.fitness:.3f}, cost {best.design.total_cost()}) written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,143 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+
+import numpy as np
 import pygame
-from typing import Any
+from typing import Any, Sequence
 
+from bridgeia.core.arrays import ArrayBridge
 from bridgeia.core.bridge import BridgeDesign
 from bridgeia.core.level import Level
+from bridgeia.sim.recording import TrajectoryPlayer
+from bridgeia.sim.rigidity import RigidityReport
+
+
+# Text surfaces cached by (text, colour); cleared wholesale when it grows past this
+TEXT_CACHE_LIMIT = 256
+# Edge colour per stress level: 0.0 -> green / safe, 1.0 -> red / about to break
+STRESS_LUT_SIZE = 256
+_STRESS_T = np.linspace(0.0, 1.0, STRESS_LUT_SIZE)[:, None]
+STRESS_COLORS = (np.array([100, 255, 100]) * (1.0 - _STRESS_T) + np.array([255, 50, 50]) * _STRESS_T).astype(np.uint8)
+# Members are drawn grouped by colour: stresses are rounded to this many LUT entries
+STRESS_BUCKETS = 16
+BUCKET_COLORS = [
+    tuple(color) for color in STRESS_COLORS[np.linspace(0, STRESS_LUT_SIZE - 1, STRESS_BUCKETS).round().astype(np.intp)].tolist()
+]
+EDGE_WIDTH = 4
+EDGE_COLOR = (200, 170, 80)  # Wood-ish
+JOINT_RADIUS = 4
+JOINT_COLOR = (200, 200, 200)
+LOOSE_RADIUS = 8  # Ring around joints the members leave free to move (build mode)
+LOOSE_COLOR = (255, 90, 70)
+# Level of detail: members shorter than this on screen (px) are not drawn, and
+# joint markers are dropped once the joints on screen average less area than one marker
+LOD_MIN_EDGE_PX = 1.0
+LOD_JOINT_AREA = (2 * JOINT_RADIUS + 1) ** 2
+# Bodies flung further than this (px) are not drawn: pygame coordinates overflow
+COORD_LIMIT = 1e6
+# Frame profiler overlay sits under the controls help in the top-right corner
+PROFILE_TOP = 190
+
+
+@dataclass
+class _Geometry:
+    """Array form of a design for drawing: level anchors first, then joints in design order."""
+
+    bridge: BridgeDesign  # Held so the id() in the cache key cannot be reused
+    rows: dict[str, int]  # Point ID -> row in positions
+    anchor_count: int
+    positions: np.ndarray  # float64, (points, 2) design positions
+    edge_ids: np.ndarray  # int64, (edges,)
+    ends: np.ndarray  # intp, (edges, 2) rows of each member's endpoints
+    edge_rows: dict[int, int]  # Edge ID -> row in edge_ids
+    # Members chained into trails (each one starts where the previous one ended) so
+    # runs of them draw as one polyline: edge rows in trail order, the point each
+    # is walked from / to, and whether it starts a new trail
+    trail_edges: np.ndarray
+    trail_from: np.ndarray
+    trail_to: np.ndarray
+    trail_start: np.ndarray
+
+    @classmethod
+    def build(cls, level: Level, bridge: BridgeDesign) -> "_Geometry":
+        # Same packing as the solvers: anchors first, then joints; dangling members dropped
+        arrays = ArrayBridge.from_design(bridge, {a.anchor_id: (a.x, a.y) for a in level.anchors})
+        edge_ids = arrays.edge_ids.astype(np.int64)
+        ends = arrays.endpoints.astype(np.intp)
+        return cls(
+            bridge=bridge,
+            rows={point_id: row for row, point_id in enumerate(arrays.point_ids)},
+            anchor_count=arrays.fixed_count,
+            positions=arrays.positions,
+            edge_ids=edge_ids,
+            ends=ends,
+            edge_rows={edge_id: row for row, edge_id in enumerate(edge_ids.tolist())},
+            **_trails(arrays.point_count, ends.tolist()),
+        )
+
+
+def _trails(point_count: int, ends: list[list[int]]) -> dict[str, np.ndarray]:
+    """Greedy trail cover of the member graph, walking from odd-degree points first (they end trails anyway)."""
+    incident: list[list[int]] = [[] for _ in range(point_count)]
+    for edge, (a, b) in enumerate(ends):
+        incident[a].append(edge)
+        incident[b].append(edge)
+    used = bytearray(len(ends))
+    order: list[int] = []
+    froms: list[int] = []
+    tos: list[int] = []
+    starts: list[bool] = []
+    for origin in sorted(range(point_count), key=lambda point: len(incident[point]) % 2 == 0):
+        while incident[origin]:
+            point = origin
+            first = True
+            while True:
+                pending = incident[point]
+                while pending and used[pending[-1]]:
+                    pending.pop()
+                if not pending:
+                    break
+                edge = pending.pop()
+                used[edge] = 1
+                a, b = ends[edge]
+                following = b if a == point else a
+                order.append(edge)
+                froms.append(point)
+                tos.append(following)
+                starts.append(first)
+                first = False
+                point = following
+    return {
+        "trail_edges": np.array(order, dtype=np.intp),
+        "trail_from": np.array(froms, dtype=np.intp),
+        "trail_to": np.array(tos, dtype=np.intp),
+        "trail_start": np.array(starts, dtype=bool),
+    }
 
 
 class LevelRenderer:
     def __init__(self, screen: pygame.Surface) -> None:
         self.screen = screen
         self.font = pygame.font.Font(None, 24)
+        # Static layer: background colour, grid and banks
+        self._background: pygame.Surface | None = None
+        self._background_key: tuple[Any, ...] | None = None
+        self._text_cache: dict[tuple[str, tuple[int, int, int]], pygame.Surface] = {}
+        # Per dynamic layer: (content key, screen rect it covered) from the last frame
+        self._layers: dict[str, tuple[Any, pygame.Rect | None]] = {}
+        self._full_redraw = True
+        self._geometry: _Geometry | None = None
+        self._geometry_key: tuple[Any, ...] | None = None
+        # Simulation joint / edge order -> geometry rows, keyed on the identity of the
+        # simulation's ID list (it is replaced, not mutated, when the design changes)
+        self._joint_map: tuple[Sequence[str], _Geometry, np.ndarray, np.ndarray] | None = None
+        self._edge_map: tuple[Sequence[int], _Geometry, np.ndarray, np.ndarray] | None = None
+        self._sprites: dict[str, pygame.Surface] = {}
+
+    def invalidate(self) -> None:
+        """Force a full redraw on the next frame (window exposed, display reset...)."""
+        self._full_redraw = True
 
     def draw(
         self,
@@ -21,55 +148,191 @@ class LevelRenderer:
         simulation: Any | None = None,
         grid_enabled: bool = False,
         grid_size: int = 40,
-    ) -> None:
-        self.screen.fill((28, 28, 36))  # Slightly better background color
-        
-        if grid_enabled:
-            self._draw_grid(grid_size)
+        profile: list[tuple[str, float, float]] | None = None,
+        rigidity: RigidityReport | None = None,
+    ) -> list[pygame.Rect]:
+        """
+        Redraws only what changed since the previous call and returns the dirty
+        rectangles, suitable for pygame.display.update. Returns an empty list when
+        nothing changed, so idle build-mode frames cost next to nothing.
+        `profile` rows (phase, p50 ms, p99 ms) are shown as an overlay when given;
+        a `rigidity` report rings the loose joints and is summarised in the HUD.
+        """
+        background = self._get_background(level, grid_enabled, grid_size)
+        geometry = self._get_geometry(level, bridge)
 
-        # Build a lookup for all point positions
-        # Start with level anchors
-        points: dict[str, tuple[float, float]] = {
-            a.anchor_id: (a.x, a.y) for a in level.anchors
-        }
-        
-        # Add bridge joints (design or simulation)
+        # Point positions as one array (anchors, then joints), from the simulation when running
         if simulation:
-            # Update points from simulation bodies
-            for j_id in bridge.joints:
-                pos = simulation.get_joint_position(j_id)
-                if pos:
-                    points[j_id] = pos
-            # Also update level anchors if they moved (unlikely but consistent)
-            for a in level.anchors:
-                pos = simulation.get_joint_position(a.anchor_id)
-                if pos:
-                    points[a.anchor_id] = pos
-            stresses = simulation.get_edge_stresses()
+            positions = self._simulated_positions(geometry, simulation)
+            stresses: np.ndarray | None = self._member_stresses(geometry, simulation)
+            # Bodies move every step: the bridge layer is always dirty
+            bridge_key: Any = object()
         else:
-            # Use design positions
-            points.update(bridge.joints)
+            positions = geometry.positions
             stresses = None
+            bridge_key = (id(bridge), bridge.revision, selected_anchor, rigidity.loose if rigidity else None)
 
-        self._draw_banks(level)
-        self._draw_edges(bridge, points, stresses)
+        replay = simulation if isinstance(simulation, TrajectoryPlayer) else None
+        hud_key = (
+            level.budget, bridge.total_cost(), len(bridge.edges),
+            simulation is not None, grid_enabled, grid_size,
+            (replay.frame, replay.playing) if replay else None,
+            (rigidity.degrees_of_freedom, len(rigidity.loose)) if rigidity else None,
+        )
+        layers = {
+            "bridge": (bridge_key, lambda: self._points_rect(positions)),
+            "preview": (preview_line, lambda: self._preview_rect(preview_line)),
+            "hud": (hud_key, lambda: self._hud_rect()),
+            "profile": (tuple(profile) if profile else None, lambda: self._profile_rect(profile)),
+        }
+
+        dirty: list[pygame.Rect] = []
+        for name, (key, rect_of) in layers.items():
+            previous = self._layers.get(name)
+            if previous is not None and previous[0] == key and not self._full_redraw:
+                continue
+            rect = rect_of()
+            if previous is not None and previous[1] is not None:
+                dirty.append(previous[1])
+            if rect is not None:
+                dirty.append(rect)
+            self._layers[name] = (key, rect)
+
+        screen_rect = self.screen.get_rect()
+        if self._full_redraw:
+            dirty = [screen_rect]
+            self._full_redraw = False
+        if not dirty:
+            return []
+
+        clip = dirty[0].unionall(dirty[1:]).clip(screen_rect)
+        self.screen.set_clip(clip)
+        self.screen.blit(background, clip, clip)
+        self._draw_edges(geometry, positions, stresses)
         self._draw_preview(preview_line)
-        self._draw_anchors(level, bridge, points, selected_anchor)
+        self._draw_anchors(level, geometry, positions, selected_anchor)
+        if rigidity is not None:
+            self._draw_loose_joints(geometry, positions, rigidity)
         self._draw_hud(level, bridge, simulation_active=simulation is not None, grid_enabled=grid_enabled, grid_size=grid_size)
+        if replay is not None:
+            self._draw_replay_status(replay)
+        elif rigidity is not None and bridge.joints:
+            self._draw_rigidity_status(rigidity)
+        if profile:
+            self._draw_profile(profile)
+        self.screen.set_clip(None)
+        return [rect.clip(screen_rect) for rect in dirty]
+
+    def _get_background(self, level: Level, grid_enabled: bool, grid_size: int) -> pygame.Surface:
+        key = (self.screen.get_size(), level, grid_enabled, grid_size)
+        if self._background is None or key != self._background_key:
+            self._background = pygame.Surface(self.screen.get_size()).convert(self.screen)
+            self._background.fill((28, 28, 36))  # Slightly better background color
+            if grid_enabled:
+                self._draw_grid(self._background, grid_size)
+            self._draw_banks(self._background, level)
+            self._background_key = key
+            self._full_redraw = True
+        return self._background
+
+    def _render_text(self, text: str, color: tuple[int, int, int]) -> pygame.Surface:
+        key = (text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_LIMIT:
+                self._text_cache.clear()
+            surface = self.font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
+
+    def _get_geometry(self, level: Level, bridge: BridgeDesign) -> _Geometry:
+        key = (level, id(bridge), bridge.revision)
+        if self._geometry is None or key != self._geometry_key:
+            self._geometry = _Geometry.build(level, bridge)
+            self._geometry_key = key
+        return self._geometry
 
-    def _draw_grid(self, grid_size: int) -> None:
+    def _simulated_positions(self, geometry: _Geometry, simulation: Any) -> np.ndarray:
+        joint_ids = simulation.joint_ids
+        cached = self._joint_map
+        if cached is None or cached[0] is not joint_ids or cached[1] is not geometry:
+            rows = np.array([geometry.rows.get(j_id, -1) for j_id in joint_ids], dtype=np.intp).reshape(-1)
+            known = np.flatnonzero(rows >= 0)
+            cached = self._joint_map = (joint_ids, geometry, rows[known], known)
+        # Points the simulation does not know keep their design position
+        positions = geometry.positions.copy()
+        positions[cached[2]] = simulation.joint_position_array()[cached[3]]
+        return positions
+
+    def _member_stresses(self, geometry: _Geometry, simulation: Any) -> np.ndarray:
+        """Stress per geometry edge; NaN for broken members and members the simulation does not have."""
+        edge_ids, values = simulation.edge_stress_array()
+        cached = self._edge_map
+        if cached is None or cached[0] is not edge_ids or cached[1] is not geometry:
+            rows = np.array([geometry.edge_rows.get(e_id, -1) for e_id in edge_ids], dtype=np.intp).reshape(-1)
+            known = np.flatnonzero(rows >= 0)
+            cached = self._edge_map = (edge_ids, geometry, rows[known], known)
+        stresses = np.full(len(geometry.edge_ids), np.nan)
+        stresses[cached[2]] = values[cached[3]]
+        return stresses
+
+    def _points_rect(self, positions: np.ndarray) -> pygame.Rect | None:
+        finite = positions[np.isfinite(positions).all(axis=1)]
+        if not len(finite):
+            return None
+        # Margin covers the selection ring (radius 10 + 2px outline), loose rings and edge width
+        margin = 12
         width, height = self.screen.get_size()
+        low = finite.min(axis=0) - margin
+        high = finite.max(axis=0) + margin
+        # Clamp to just beyond the screen so far-flung bodies don't overflow Rect
+        left = int(max(-margin, low[0]))
+        top = int(max(-margin, low[1]))
+        right = int(min(width + margin, high[0]))
+        bottom = int(min(height + margin, high[1]))
+        return pygame.Rect(left, top, max(0, right - left), max(0, bottom - top))
+
+    def _visible(self, low: np.ndarray, high: np.ndarray, margin: float) -> np.ndarray:
+        """Rows whose box [low, high] meets the clip area grown by margin; NaN rows are never visible."""
+        clip = self.screen.get_clip()
+        near = np.array([clip.left - margin, clip.top - margin])
+        far = np.array([clip.right + margin, clip.bottom + margin])
+        return (
+            (high >= near).all(axis=1) & (low <= far).all(axis=1)
+            & (low > -COORD_LIMIT).all(axis=1) & (high < COORD_LIMIT).all(axis=1)
+        )
+
+    @staticmethod
+    def _preview_rect(preview_line: tuple[tuple[int, int], tuple[int, int]] | None) -> pygame.Rect | None:
+        if preview_line is None:
+            return None
+        (x1, y1), (x2, y2) = preview_line
+        return pygame.Rect(min(x1, x2) - 2, min(y1, y2) - 2, abs(x2 - x1) + 5, abs(y2 - y1) + 5)
+
+    def _hud_rect(self) -> pygame.Rect:
+        # Left column of stats (see _draw_hud); the controls text never changes
+        line_height = self.font.get_linesize()
+        return pygame.Rect(20, 20, 380, 168 + line_height - 20)
+
+    def _profile_rect(self, profile: list[tuple[str, float, float]] | None) -> pygame.Rect | None:
+        if not profile:
+            return None
+        width, _ = self.screen.get_size()
+        return pygame.Rect(width - 330, PROFILE_TOP - 6, 320, (len(profile) + 1) * 20 + 12)
+
+    def _draw_grid(self, surface: pygame.Surface, grid_size: int) -> None:
+        width, height = surface.get_size()
         color = (40, 40, 50)
         
         for x in range(0, width, grid_size):
-            pygame.draw.line(self.screen, color, (x, 0), (x, height), 1)
+            pygame.draw.line(surface, color, (x, 0), (x, height), 1)
         for y in range(0, height, grid_size):
-            pygame.draw.line(self.screen, color, (0, y), (width, y), 1)
+            pygame.draw.line(surface, color, (0, y), (width, y), 1)
 
-    def _draw_banks(self, level: Level) -> None:
+    def _draw_banks(self, surface: pygame.Surface, level: Level) -> None:
         for bank in level.banks:
             pygame.draw.line(
-                self.screen,
+                surface,
                 (120, 120, 120),
                 (bank.x1, bank.y1),
                 (bank.x2, bank.y2),
@@ -77,71 +340,110 @@ class LevelRenderer:
             )
 
     def _draw_anchors(
-        self, 
-        level: Level, 
-        bridge: BridgeDesign, 
-        points: dict[str, tuple[float, float]], 
+        self,
+        level: Level,
+        geometry: _Geometry,
+        positions: np.ndarray,
         selected_anchor: str | None
     ) -> None:
         # Draw level anchors (fixed vs non-fixed)
-        for anchor in level.anchors:
-            pos = points.get(anchor.anchor_id)
-            if not pos or (pos[0] != pos[0]) or (pos[1] != pos[1]): # Check for NaN
-                continue
+        for anchor, pos in zip(level.anchors, positions[:geometry.anchor_count].tolist()):
             color = (80, 200, 120) if anchor.fixed else (200, 200, 80)
-            try:
-                draw_pos = (int(pos[0]), int(pos[1]))
-                pygame.draw.circle(self.screen, color, draw_pos, 6)
-            except ValueError:
-                continue
-            
-            if anchor.anchor_id == selected_anchor:
-                pygame.draw.circle(self.screen, (240, 240, 240), (int(pos[0]), int(pos[1])), 10, 2)
-
-        # Draw bridge joints
-        for j_id in bridge.joints:
-            pos = points.get(j_id)
-            if not pos or (pos[0] != pos[0]) or (pos[1] != pos[1]):
-                continue
-            color = (200, 200, 200)
-            try:
-                draw_pos = (int(pos[0]), int(pos[1]))
-                pygame.draw.circle(self.screen, color, draw_pos, 4)
-             
-                if j_id == selected_anchor:
-                    pygame.draw.circle(self.screen, (240, 240, 240), draw_pos, 8, 2)
-            except ValueError:
-                continue
+            pygame.draw.circle(self.screen, color, pos, 6)
+
+        # Draw bridge joints: one sprite blit each, culled to the clip area
+        joints = positions[geometry.anchor_count:]
+        visible = joints[self._visible(joints, joints, JOINT_RADIUS + 1)]
+        if len(visible) > 1:
+            extent = visible.max(axis=0) - visible.min(axis=0) + 2 * JOINT_RADIUS + 1
+            dense = extent[0] * extent[1] < len(visible) * LOD_JOINT_AREA
+        else:
+            dense = False
+        if len(visible) and not dense:
+            sprite = self._get_sprite("joint", JOINT_COLOR, JOINT_RADIUS, 0)
+            corners = (visible - JOINT_RADIUS).astype(np.int32).tolist()
+            self.screen.fblits([(sprite, corner) for corner in corners])
+
+        row = geometry.rows.get(selected_anchor) if selected_anchor is not None else None
+        if row is None or not self._visible(positions[row:row + 1], positions[row:row + 1], 12)[0]:
+            return
+        pos = positions[row].tolist()
+        if row < geometry.anchor_count:
+            pygame.draw.circle(self.screen, (240, 240, 240), pos, 10, 2)
+        else:
+            pygame.draw.circle(self.screen, JOINT_COLOR, pos, JOINT_RADIUS)
+            pygame.draw.circle(self.screen, (240, 240, 240), pos, 8, 2)
+
+    def _draw_loose_joints(self, geometry: _Geometry, positions: np.ndarray, rigidity: RigidityReport) -> None:
+        rows = [geometry.rows[j_id] for j_id in rigidity.loose if j_id in geometry.rows]
+        if not rows:
+            return
+        loose = positions[rows]
+        visible = loose[self._visible(loose, loose, LOOSE_RADIUS + 1)]
+        sprite = self._get_sprite("loose", LOOSE_COLOR, LOOSE_RADIUS, 2)
+        corners = (visible - LOOSE_RADIUS).astype(np.int32).tolist()
+        self.screen.fblits([(sprite, corner) for corner in corners])
 
+    def _get_sprite(self, name: str, color: tuple[int, int, int], radius: int, width: int) -> pygame.Surface:
+        """Colour-keyed circle (a ring when width > 0) centred in a (2 * radius + 1) square."""
+        sprite = self._sprites.get(name)
+        if sprite is None:
+            size = 2 * radius + 1
+            sprite = pygame.Surface((size, size)).convert(self.screen)
+            sprite.fill((0, 0, 0))
+            sprite.set_colorkey((0, 0, 0))
+            pygame.draw.circle(sprite, color, (radius, radius), radius, width)
+            self._sprites[name] = sprite
+        return sprite
 
     def _draw_edges(
-        self, 
-        bridge: BridgeDesign, 
-        points: dict[str, tuple[float, float]], 
-        stresses: dict[int, float] | None = None
+        self,
+        geometry: _Geometry,
+        positions: np.ndarray,
+        stresses: np.ndarray | None = None
     ) -> None:
-        for edge in bridge.edges:
-            start = points.get(edge.a)
-            end = points.get(edge.b)
-            if start and end:
-                # Default color (wood-ish)
-                color = (200, 170, 80)
-                
-                # If simulation provides stress, interpolate color
-                if stresses is not None:
-                    stress = stresses.get(edge.edge_id, 0.0)
-                    # Stress 0.0 -> Green/Safe, 1.0 -> Red/Danger
-                    # Let's map 0.0 -> (100, 255, 100) and 1.0 -> (255, 50, 50)
-                    t = min(1.0, max(0.0, stress))
-                    
-                    # Simple lerp
-                    r = int(100 * (1 - t) + 255 * t)
-                    g = int(255 * (1 - t) + 50 * t)
-                    b = int(100 * (1 - t) + 50 * t)
-                    
-                    color = (r, g, b)
-                    
-                pygame.draw.line(self.screen, color, start, end, 4)
+        if not len(geometry.ends):
+            return
+        starts = positions[geometry.ends[:, 0]]
+        ends = positions[geometry.ends[:, 1]]
+        # Cull in bulk: off-clip, non-finite, broken (NaN stress) and sub-pixel members
+        span = ends - starts
+        keep = self._visible(np.minimum(starts, ends), np.maximum(starts, ends), EDGE_WIDTH)
+        keep &= np.einsum("ij,ij->i", span, span) >= LOD_MIN_EDGE_PX * LOD_MIN_EDGE_PX
+        if stresses is None:
+            colors = [EDGE_COLOR]
+            groups = np.where(keep, 0, -1)
+        else:
+            # Broken members (NaN) are gone; the rest fall into a few colour buckets
+            keep &= ~np.isnan(stresses)
+            colors = BUCKET_COLORS
+            buckets = (np.clip(np.nan_to_num(stresses), 0.0, 1.0) * (STRESS_BUCKETS - 1) + 0.5).astype(np.intp)
+            groups = np.where(keep, buckets, -1)
+
+        # Split the trails into runs of one colour: each run is a single draw call
+        groups = groups[geometry.trail_edges]
+        breaks = geometry.trail_start.copy()
+        breaks[1:] |= groups[1:] != groups[:-1]
+        run_starts = np.flatnonzero(breaks)
+        run_groups = groups[run_starts]
+        drawn = run_groups >= 0
+        run_ends = np.append(run_starts[1:], len(groups))[drawn].tolist()
+        run_starts = run_starts[drawn].tolist()
+        run_groups = run_groups[drawn].tolist()
+        # Column lists are several times cheaper to build than one list per point
+        xs, ys = positions[geometry.trail_from].T.tolist()
+        last_xs, last_ys = positions[geometry.trail_to].T.tolist()
+        line = pygame.draw.line
+        lines = pygame.draw.lines
+        screen = self.screen
+        for first, stop, group in zip(run_starts, run_ends, run_groups):
+            color = colors[group]
+            if stop - first == 1:
+                line(screen, color, (xs[first], ys[first]), (last_xs[first], last_ys[first]), EDGE_WIDTH)
+            else:
+                points = list(zip(xs[first:stop], ys[first:stop]))
+                points.append((last_xs[stop - 1], last_ys[stop - 1]))
+                lines(screen, color, False, points, EDGE_WIDTH)
 
     def _draw_preview(self, preview_line: tuple[tuple[int, int], tuple[int, int]] | None) -> None:
         if preview_line is None:
@@ -156,18 +458,18 @@ class LevelRenderer:
         grid_enabled: bool,
         grid_size: int
     ) -> None:
-        budget_text = self.font.render(f"Budget: {level.budget}", True, (220, 220, 220))
-        cost_text = self.font.render(f"Cost: {bridge.total_cost()}", True, (220, 220, 220))
+        budget_text = self._render_text(f"Budget: {level.budget}", (220, 220, 220))
+        cost_text = self._render_text(f"Cost: {bridge.total_cost()}", (220, 220, 220))
         remaining = level.budget - bridge.total_cost()
-        remaining_text = self.font.render(f"Remaining: {remaining}", True, (220, 220, 220))
-        edges_text = self.font.render(f"Edges: {len(bridge.edges)}", True, (220, 220, 220))
+        remaining_text = self._render_text(f"Remaining: {remaining}", (220, 220, 220))
+        edges_text = self._render_text(f"Edges: {len(bridge.edges)}", (220, 220, 220))
         
         mode_str = "SIMULATION" if simulation_active else "BUILD"
         mode_color = (255, 100, 100) if simulation_active else (100, 255, 100)
-        mode_text = self.font.render(f"Mode: {mode_str}", True, mode_color)
+        mode_text = self._render_text(f"Mode: {mode_str}", mode_color)
 
         grid_str = f"On ({grid_size}px)" if grid_enabled else "Off"
-        grid_text = self.font.render(f"Grid: {grid_str}", True, (150, 150, 180))
+        grid_text = self._render_text(f"Grid: {grid_str}", (150, 150, 180))
 
         self.screen.blit(budget_text, (20, 20))
         self.screen.blit(cost_text, (20, 44))
@@ -182,12 +484,48 @@ class LevelRenderer:
             "Esc: cancel selection",
             "Space: toggle simulation",
             "G: toggle grid",
-            "[ / ]: change grid size"
+            "[ / ]: change grid size",
+            "Ctrl+Z / Ctrl+Y: undo / redo",
+            "F3: frame profiler",
         ]
         
         # Get width safely
         width, height = self.screen.get_size()
         for index, line in enumerate(controls):
-            text = self.font.render(line, True, (180, 180, 180))
+            text = self._render_text(line, (180, 180, 180))
             # Align right
             self.screen.blit(text, (width - 320, 20 + index * 20))
+
+    def _draw_replay_status(self, player: TrajectoryPlayer) -> None:
+        state = "" if player.playing else " (paused)"
+        text = self._render_text(
+            f"Replay: {player.time:.2f}s  frame {player.frame + 1}/{player.frame_count}{state}",
+            (220, 200, 120),
+        )
+        self.screen.blit(text, (20, 168))
+
+    def _draw_rigidity_status(self, rigidity: RigidityReport) -> None:
+        if rigidity.rigid:
+            text = self._render_text("Structure: rigid", (150, 220, 150))
+        else:
+            text = self._render_text(
+                f"Mechanism: {rigidity.degrees_of_freedom} DOF, {len(rigidity.loose)} loose joints",
+                LOOSE_COLOR,
+            )
+        self.screen.blit(text, (20, 168))
+
+    def _draw_profile(self, profile: list[tuple[str, float, float]]) -> None:
+        rect = self._profile_rect(profile)
+        assert rect is not None
+        pygame.draw.rect(self.screen, (16, 16, 22), rect)
+        pygame.draw.rect(self.screen, (70, 70, 90), rect, 1)
+        x, y = rect.x + 10, PROFILE_TOP
+        # Figures change every refresh: render directly rather than through the text cache
+        self.screen.blit(self.font.render("phase", True, (150, 150, 180)), (x, y))
+        header = self.font.render("p50 / p99 ms", True, (150, 150, 180))
+        self.screen.blit(header, (rect.right - 10 - header.get_width(), y))
+        for index, (name, p50, p99) in enumerate(profile, start=1):
+            color = (255, 120, 120) if name == "frame" and p99 > 1000.0 / 60.0 else (200, 200, 200)
+            self.screen.blit(self.font.render(name, True, color), (x, y + index * 20))
+            figures = self.font.render(f"{p50:.2f} / {p99:.2f}", True, color)
+            self.screen.blit(figures, (rect.right - 10 - figures.get_width(), y + index * 20))
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+import numpy as np
+import pygame
+
+# Bumped whenever the on-disk layout changes
+SESSION_FORMAT_VERSION = 1
+
+# Events the editor reacts to; the rest (focus, key-up, window moves...) are not kept
+RECORDED_EVENTS = (
+    pygame.QUIT,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEMOTION,
+)
+
+
+@dataclass
+class InputSession:
+    """
+    Recorded editor session: the frame times the live loop measured and every
+    input event, stamped with the frame that consumed it. Feeding both back
+    through the editor repeats the session exactly, physics included, since
+    simulation steps only depend on the frame times.
+
+    `outcome` is what the session produced when it was recorded (final design
+    and one summary per simulation run); a replay checks itself against it.
+    """
+
+    level: dict[str, Any]
+    design: dict[str, Any]  # Design the session started from
+    mouse: tuple[int, int]  # Pointer position before the first event
+    frame_ms: np.ndarray  # uint16, (frames,): clock.tick() of every frame
+    event_frames: np.ndarray  # uint32, (events,), non-decreasing
+    event_types: np.ndarray  # int32
+    event_keys: np.ndarray  # int32, 0 when not a key event
+    event_mods: np.ndarray  # uint16
+    event_buttons: np.ndarray  # uint8, 0 when not a mouse button event
+    event_pos: np.ndarray  # int16, (events, 2), (0, 0) when not a mouse event
+    outcome: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def frame_count(self) -> int:
+        return int(self.frame_ms.shape[0])
+
+    @property
+    def event_count(self) -> int:
+        return int(self.event_frames.shape[0])
+
+    @property
+    def duration(self) -> float:
+        """Wall-clock seconds the recorded session lasted."""
+        return float(self.frame_ms.sum(dtype=np.int64)) / 1000.0
+
+    def frames(self) -> Iterator[tuple[float, list[pygame.event.Event]]]:
+        """(dt in seconds, events) of every frame, in order."""
+        bounds = np.searchsorted(self.event_frames, np.arange(self.frame_count + 1)).tolist()
+        types = self.event_types.tolist()
+        keys = self.event_keys.tolist()
+        mods = self.event_mods.tolist()
+        buttons = self.event_buttons.tolist()
+        positions = [tuple(pos) for pos in self.event_pos.tolist()]
+        for frame, ms in enumerate(self.frame_ms.tolist()):
+            events = [
+                _make_event(types[i], keys[i], mods[i], buttons[i], positions[i])
+                for i in range(bounds[frame], bounds[frame + 1])
+            ]
+            yield ms / 1000.0, events
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                version=np.array(SESSION_FORMAT_VERSION, dtype=np.int32),
+                level=np.array(json.dumps(self.level)),
+                design=np.array(json.dumps(self.design)),
+                mouse=np.array(self.mouse, dtype=np.int16),
+                frame_ms=self.frame_ms.astype(np.uint16),
+                event_frames=self.event_frames.astype(np.uint32),
+                event_types=self.event_types.astype(np.int32),
+                event_keys=self.event_keys.astype(np.int32),
+                event_mods=self.event_mods.astype(np.uint16),
+                event_buttons=self.event_buttons.astype(np.uint8),
+                event_pos=self.event_pos.astype(np.int16).reshape(-1, 2),
+                outcome=np.array(json.dumps(self.outcome)),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "InputSession":
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != SESSION_FORMAT_VERSION:
+                raise ValueError(f"Unsupported session format version {version} in {path}")
+            mouse_x, mouse_y = data["mouse"].tolist()
+            return cls(
+                level=json.loads(str(data["level"])),
+                design=json.loads(str(data["design"])),
+                mouse=(mouse_x, mouse_y),
+                frame_ms=data["frame_ms"],
+                event_frames=data["event_frames"],
+                event_types=data["event_types"],
+                event_keys=data["event_keys"],
+                event_mods=data["event_mods"],
+                event_buttons=data["event_buttons"],
+                event_pos=data["event_pos"],
+                outcome=json.loads(str(data["outcome"])),
+            )
+
+
+def _make_event(
+    event_type: int, key: int, mod: int, button: int, pos: tuple[int, int]
+) -> pygame.event.Event:
+    if event_type == pygame.KEYDOWN:
+        return pygame.event.Event(event_type, key=key, mod=mod)
+    if event_type == pygame.MOUSEBUTTONDOWN:
+        return pygame.event.Event(event_type, button=button, pos=pos)
+    if event_type == pygame.MOUSEMOTION:
+        return pygame.event.Event(event_type, pos=pos)
+    return pygame.event.Event(event_type)
+
+
+class SessionRecorder:
+    """
+    Appends frames to growable lists; a session costs 2 bytes per frame plus
+    17 per kept event before compression, so hours of editing stay small.
+    """
+
+    def __init__(self, level: dict[str, Any], design: dict[str, Any], mouse: tuple[int, int]) -> None:
+        self.level = level
+        self.design = design
+        self.mouse = mouse
+        self.frame_ms: list[int] = []
+        self.events: list[tuple[int, int, int, int, int, int, int]] = []
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.frame_ms)
+
+    def record(self, frame_ms: int, events: Sequence[pygame.event.Event]) -> None:
+        frame = len(self.frame_ms)
+        self.frame_ms.append(min(frame_ms, 0xFFFF))
+        for event in events:
+            if event.type not in RECORDED_EVENTS:
+                continue
+            x, y = getattr(event, "pos", (0, 0))
+            self.events.append(
+                (
+                    frame,
+                    event.type,
+                    getattr(event, "key", 0),
+                    getattr(event, "mod", 0),
+                    getattr(event, "button", 0),
+                    x,
+                    y,
+                )
+            )
+
+    def session(self, outcome: dict[str, Any] | None = None) -> InputSession:
+        events = np.array(self.events, dtype=np.int64).reshape(-1, 7)
+        return InputSession(
+            level=self.level,
+            design=self.design,
+            mouse=self.mouse,
+            frame_ms=np.array(self.frame_ms, dtype=np.uint16),
+            event_frames=events[:, 0].astype(np.uint32),
+            event_types=events[:, 1].astype(np.int32),
+            event_keys=events[:, 2].astype(np.int32),
+            event_mods=events[:, 3].astype(np.uint16),
+            event_buttons=events[:, 4].astype(np.uint8),
+            event_pos=events[:, 5:7].astype(np.int16),
+            outcome=dict(outcome or {}),
+        )